@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo del scraping y la publicación
+Genera fixtures deterministas (un listado de CursosDev, las fichas de Udemy y
+las respuestas de su API de precios) en el formato de page_fixtures, las sirve
+con el servidor de reproducción y mide cada etapa con 10, 100 y 10.000 cursos:
+recolección de enlaces, verify_course_is_free, procesado de capturas,
+create_html_page y salida JSON.
+Cada ejecución se añade al historial (BENCHMARK_CONFIG['history_file']) y el
+script termina con código 1 si alguna etapa empeora más allá del umbral.
+
+Uso:
+    python benchmark_bot.py [tamaño ...]      # por defecto BENCHMARK_CONFIG['sizes']
+    python benchmark_bot.py --sin-historial   # medir sin guardar ni comparar
+"""
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+
+from PIL import Image
+
+from config_bot_mejorado import get_config, update_config
+
+ETAPAS = ("enlaces", "verificacion", "capturas", "html", "json")
+
+# Uno de cada PERIODO_DE_PAGO cursos sintéticos tiene precio
+PERIODO_DE_PAGO = 4
+
+
+def url_listado(tamano):
+    return f"https://cursosdev.com/benchmark/{tamano}/"
+
+
+def url_curso(tamano, i):
+    return f"https://www.udemy.com/course/benchmark-{tamano}-curso-{i}/?couponCode=BENCH{i}"
+
+
+def id_numerico(tamano, i):
+    return str(tamano * 100000 + i)
+
+
+def respuesta_precios(i):
+    """JSON de la API de precios de Udemy para el curso sintético i"""
+    importe = 19.99 if i % PERIODO_DE_PAGO == 0 else 0
+    return {
+        "price_text": {"data": {"pricing_result": {"price": {
+            "amount": importe,
+            "price_string": f"${importe}" if importe else "Gratis",
+        }}}},
+        "redeem_coupon": {"discount_attempts": [{"code": f"BENCH{i}", "status": "applied"}]},
+    }
+
+
+def generar_fixtures(almacen, tamano):
+    """Grabar en el almacén el listado y las fichas de una ronda de tamano cursos"""
+    from udemy_http import RUTA_API_PRECIOS
+
+    tarjetas = "".join(
+        f'<article class="course-card"><h3><a href="{url_curso(tamano, i)}">Curso de prueba {i}</a></h3></article>'
+        for i in range(tamano)
+    )
+    listado = f"<html><head><title>Cupones Udemy</title></head><body>{tarjetas}</body></html>"
+    almacen.grabar(url_listado(tamano), listado.encode('utf-8'), guardar_indice=False)
+
+    for i in range(tamano):
+        ficha = (f'<html><head><title>Curso de prueba {i}</title></head>'
+                 f'<body data-clp-course-id="{id_numerico(tamano, i)}"><h1>Curso de prueba {i}</h1></body></html>')
+        almacen.grabar(url_curso(tamano, i).split("?")[0], ficha.encode('utf-8'), guardar_indice=False)
+        # Sin la consulta: el servidor responde igual para cualquier cupón y componentes
+        almacen.grabar(
+            "https://www.udemy.com" + RUTA_API_PRECIOS.format(id=id_numerico(tamano, i)),
+            json.dumps(respuesta_precios(i)).encode('utf-8'),
+            tipo="application/json; charset=utf-8",
+            guardar_indice=False,
+        )
+    almacen.guardar_indice()
+
+
+def captura_sintetica(ancho=1920, alto=1080):
+    """PNG del tamaño de una captura de pantalla, con algo de contenido para comprimir"""
+    img = Image.new("RGB", (ancho, alto), (245, 245, 245))
+    for y in range(0, alto, 40):
+        img.paste((30 + y % 200, 90, 160), (0, y, ancho, y + 12))
+    salida = io.BytesIO()
+    img.save(salida, format='PNG')
+    return salida.getvalue()
+
+
+@contextmanager
+def silencio():
+    """Descartar los print de las etapas para medir el código y no la terminal"""
+    with open(os.devnull, 'w', encoding='utf-8') as nulo, redirect_stdout(nulo):
+        yield
+
+
+def cronometrar(funcion, *args):
+    """(segundos, resultado) de una llamada"""
+    inicio = time.perf_counter()
+    with silencio():
+        resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def medir_ronda(tamano, captura, muestra_capturas):
+    """Medir todas las etapas con tamano cursos; devuelve {etapa: segundos}"""
+    from bot_mejorado_simple import (create_html_page, guardar_captura_optimizada, guardar_json_cursos,
+                                     recortar_captura, verify_course_is_free)
+    from listing_fetcher import obtener_enlaces_listado
+
+    tiempos = {}
+    tiempos['enlaces'], urls = cronometrar(obtener_enlaces_listado, url_listado(tamano))
+    if not urls or len(urls) != tamano:
+        raise RuntimeError(f"El listado de {tamano} cursos devolvió {len(urls or [])} enlaces")
+
+    tiempos['verificacion'], gratis = cronometrar(
+        lambda: [url for url in urls if verify_course_is_free(None, url)])
+
+    # Las capturas son la etapa más cara: se procesa una muestra y se extrapola
+    muestra = min(tamano, muestra_capturas)
+    elemento = ({'x': 700, 'y': 300}, {'width': 400, 'height': 60})
+    segundos, rutas = cronometrar(lambda: [
+        guardar_captura_optimizada(recortar_captura(captura, *elemento), f"benchmark_{i}")
+        for i in range(muestra)
+    ])
+    tiempos['capturas'] = segundos * tamano / muestra
+
+    cursos = [{
+        'title': f"Curso de prueba {i}",
+        'url': url,
+        'course_id': f"benchmark-{tamano}-curso-{i}",
+        'coupon_code': f"BENCH{i}",
+        'screenshot_path': rutas[i % len(rutas)],
+        'extracted_at': datetime.now().isoformat(),
+        'source_page': "Benchmark",
+        'source_url': url_listado(tamano),
+    } for i, url in enumerate(gratis)]
+    tiempos['html'], _ = cronometrar(create_html_page, cursos)
+    tiempos['json'], _ = cronometrar(guardar_json_cursos, cursos)
+    return tiempos
+
+
+def preparar_entorno(directorio):
+    """Configurar el proceso para medir sin red ni estado de ejecuciones anteriores"""
+    update_config('fixtures', 'mode', 'replay')
+    update_config('fixtures', 'directory', os.path.join(directorio, 'fixtures'))
+    update_config('cache', 'enable_cache', False)
+    update_config('dedup', 'id_map_file', os.path.join(directorio, 'course_ids.json'))
+    update_config('dedup', 'resolve_numeric_ids', False)
+    update_config('udemy', 'base_url', 'https://www.udemy.com')
+    update_config('udemy', 'http_verification', True)
+
+
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def ejecutar_benchmark(tamanos):
+    """Medir cada tamaño; devuelve la entrada de historial de esta ejecución"""
+    from page_fixtures import obtener_almacen
+
+    config = get_config('benchmark')
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="benchmark_bot_") as directorio:
+        preparar_entorno(directorio)
+        os.chdir(directorio)
+        try:
+            almacen = obtener_almacen()
+            print("📼 Generando fixtures...")
+            for tamano in tamanos:
+                generar_fixtures(almacen, tamano)
+            captura = captura_sintetica()
+
+            resultados = {}
+            for tamano in tamanos:
+                print(f"⏱️ Ronda de {tamano} cursos...")
+                resultados[str(tamano)] = medir_ronda(tamano, captura, config.get('screenshot_sample', 50))
+                print("   " + ", ".join(f"{etapa}: {segundos:.3f}s" for etapa, segundos in resultados[str(tamano)].items()))
+        finally:
+            os.chdir(directorio_original)
+
+    return {
+        'fecha': datetime.now().isoformat(),
+        'commit': commit_actual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+
+
+def cargar_historial(ruta):
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f).get('ejecuciones', [])
+    except (OSError, ValueError):
+        return []
+
+
+def guardar_historial(ruta, ejecuciones):
+    temporal = ruta + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'ejecuciones': ejecuciones}, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def buscar_regresiones(ejecucion, historial, umbral=0.25, ejecuciones_base=5, minimo_segundos=0.05):
+    """Etapas más lentas que la mediana de las últimas ejecuciones_base por encima del umbral"""
+    regresiones = []
+    for tamano, tiempos in ejecucion['resultados'].items():
+        for etapa, segundos in tiempos.items():
+            previos = [anterior['resultados'][tamano][etapa] for anterior in historial
+                       if etapa in anterior.get('resultados', {}).get(tamano, {})]
+            if not previos:
+                continue
+            referencia = statistics.median(previos[-ejecuciones_base:])
+            if segundos > referencia * (1 + umbral) and segundos - referencia > minimo_segundos:
+                regresiones.append({
+                    'tamano': int(tamano),
+                    'etapa': etapa,
+                    'segundos': segundos,
+                    'referencia': referencia,
+                })
+    return regresiones
+
+
+def main():
+    argumentos = [argumento for argumento in sys.argv[1:] if not argumento.startswith("--")]
+    sin_historial = "--sin-historial" in sys.argv[1:]
+    config = get_config('benchmark')
+    tamanos = [int(argumento) for argumento in argumentos] or config.get('sizes', [10, 100, 10000])
+
+    print("🏁 BENCHMARK DEL BOT")
+    print("=" * 50)
+    ejecucion = ejecutar_benchmark(tamanos)
+    if sin_historial:
+        return 0
+
+    ruta = config.get('history_file', 'benchmark_history.json')
+    historial = cargar_historial(ruta)
+    regresiones = buscar_regresiones(
+        ejecucion,
+        historial,
+        umbral=config.get('regression_threshold', 0.25),
+        ejecuciones_base=config.get('baseline_runs', 5),
+        minimo_segundos=config.get('min_regression_seconds', 0.05),
+    )
+    ejecucion['regresiones'] = regresiones
+    historial.append(ejecucion)
+    guardar_historial(ruta, historial)
+    print(f"💾 Resultados añadidos a {ruta}")
+
+    if regresiones:
+        for regresion in regresiones:
+            print(f"❌ Regresión en '{regresion['etapa']}' con {regresion['tamano']} cursos: "
+                  f"{regresion['segundos']:.3f}s (referencia {regresion['referencia']:.3f}s)")
+        return 1
+    print("✅ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,26 +7,29 @@ Bot mejorado para extraer 10 cursos y publicarlos en GitHub Pages
 - Publica en GitHub Pages
 """
 import os
-import time
 import re
-import json
 import base64
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from PIL import Image
 import io
+from course_identity import identidad_curso
+from link_harvester import recolectar_enlaces, urls_de_cursos
+from listing_fetcher import obtener_enlaces_listado
+from page_probe import ficha_abierta
+from page_waits import clic_y_esperar, esperar_pagina_lista, hacer_scroll, navegar, volver
+from price_scanner import escaner_precios_sin_carrito
+from redirect_resolver import resolver_redireccion
+from resource_blocking import renderizado_completo
+from dev_profiling import perfilado
+from run_metrics import contar, ejecucion_medida, medido
+from session_manager import liberar_driver, obtener_driver
+from verification_cascade import obtener_cascada, verificar_en_cascada
 
 def extract_course_id(url):
-    """Extraer el ID único del curso de Udemy"""
+    """Extraer el ID único del curso de Udemy (su slug, aunque la URL traiga el ID numérico)"""
     try:
-        match = re.search(r'/course/([^/?]+)', url)
-        if match:
-            return match.group(1)
-        return url
+        return identidad_curso(url) or url
     except:
         return url
 
@@ -72,251 +75,106 @@ def extract_coupon_code_from_url(url):
     except:
         return None
 
-def take_focused_screenshot(driver, course_name):
-    """Tomar captura de pantalla enfocada y más pequeña"""
+@medido("captura", contador="screenshots_taken")
+def take_focused_screenshot(driver, udemy_url, course_name):
+    """Tomar captura de pantalla enfocada y más pequeña de la ficha del curso"""
     try:
-        # Esperar a que la página cargue completamente
-        time.sleep(3)
-        
-        # Buscar elementos específicos que indiquen que el curso es gratis
-        free_indicators = [
-            "//span[contains(text(), '100% gratis')]",
-            "//span[contains(text(), '100% free')]",
-            "//button[contains(text(), 'Inscribirse gratis')]",
-            "//button[contains(text(), 'Enroll for free')]",
-            "//span[contains(text(), '$0')]",
-            "//div[contains(text(), 'Gratis')]",
-            "//div[contains(text(), 'Free')]"
-        ]
-        
-        # Buscar el primer indicador de gratis
-        target_element = None
-        for selector in free_indicators:
-            try:
-                elements = driver.find_elements(By.XPATH, selector)
-                if elements:
-                    target_element = elements[0]
-                    print(f"✅ Encontrado indicador de gratis: {selector}")
-                    break
-            except:
-                continue
-        
-        if target_element:
-            # Tomar captura enfocada en el elemento que indica que es gratis
-            screenshot = target_element.screenshot_as_png
-            
-            # Redimensionar la imagen para que sea más pequeña
-            img = Image.open(io.BytesIO(screenshot))
-            
-            # Calcular nuevas dimensiones (máximo 400px de ancho)
-            max_width = 400
-            width, height = img.size
-            if width > max_width:
-                ratio = max_width / width
-                new_width = max_width
-                new_height = int(height * ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Convertir a base64
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG', optimize=True, quality=85)
-            img_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            print(f"📸 Captura enfocada tomada para: {course_name}")
-            return img_base64
-        else:
-            # Si no encuentra indicadores específicos, tomar captura general pero más pequeña
-            screenshot = driver.get_screenshot_as_png()
-            img = Image.open(io.BytesIO(screenshot))
-            
-            # Redimensionar a un tamaño más pequeño
-            max_width = 600
-            width, height = img.size
-            if width > max_width:
-                ratio = max_width / width
-                new_width = max_width
-                new_height = int(height * ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Convertir a base64
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG', optimize=True, quality=85)
-            img_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            print(f"📸 Captura general tomada para: {course_name}")
-            return img_base64
-            
-    except Exception as e:
-        print(f"⚠️ Error tomando captura: {e}")
-        return None
+        # La cascada puede haber decidido sin abrir la ficha (caché, URL o API de precios)
+        if not ficha_abierta(driver, udemy_url):
+            navegar(driver, udemy_url)
 
-def verify_course_is_free(driver, udemy_url):
-    """Verificar si el curso es 100% gratis con verificación mejorada"""
-    try:
-        print(f"🔍 Verificando si el curso es gratis: {udemy_url}")
-        
-        driver.get(udemy_url)
-        time.sleep(3)
-        
-        page_text = driver.page_source.lower()
-        
-        # Buscar indicadores específicos de precio
-        price_patterns = [
-            r'\$\d+\.?\d*',
-            r'€\d+\.?\d*',
-            r'£\d+\.?\d*',
-            r'\d+\.?\d*\s*\$',
-            r'\d+\.?\d*\s*€',
-            r'\d+\.?\d*\s*£'
-        ]
-        
-        # Verificar si hay precios específicos (no $0)
-        has_price = False
-        for pattern in price_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            for match in matches:
-                price_number = re.search(r'\d+\.?\d*', match)
-                if price_number:
-                    price_value = float(price_number.group())
-                    if price_value > 0:
-                        has_price = True
-                        print(f"❌ Precio detectado: {match} (valor: {price_value})")
-                        break
-            if has_price:
-                break
-        
-        # Buscar indicadores específicos de gratis
-        free_indicators = [
-            "100% gratis",
-            "100% free", 
-            "gratis",
-            "free",
-            "$0",
-            "0.00",
-            "0,00",
-            "gratuito",
-            "sin costo",
-            "no cost",
-            "completamente gratis",
-            "completely free",
-            "inscribirse gratis",
-            "enroll for free",
-            "inscribirse sin costo",
-            "enroll at no cost",
-            "inscribirse ahora",
-            "enroll now",
-            "free enrollment",
-            "inscripción gratuita",
-            "curso gratuito",
-            "free course",
-            "sin pagar",
-            "no payment",
-            "gratis para siempre",
-            "free forever"
-        ]
-        
-        # Verificar si hay indicadores de gratis
-        is_free = False
-        for indicator in free_indicators:
-            if indicator.lower() in page_text:
-                is_free = True
-                print(f"✅ Indicador de gratis encontrado: {indicator}")
-                break
-        
-        # Buscar botones específicos de inscripción gratuita
-        free_button_selectors = [
-            "//button[contains(text(), 'Inscribirse gratis')]",
-            "//button[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Inscribirse sin costo')]",
-            "//button[contains(text(), 'Enroll at no cost')]",
-            "//button[contains(text(), 'Inscribirse ahora')]",
-            "//button[contains(text(), 'Enroll now')]",
-            "//a[contains(text(), 'Inscribirse gratis')]",
-            "//a[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Free')]",
-            "//button[contains(text(), 'Gratis')]",
-            "//a[contains(text(), 'Free')]",
-            "//a[contains(text(), 'Gratis')]",
-            "//span[contains(text(), 'Free')]",
-            "//span[contains(text(), 'Gratis')]"
-        ]
-        
-        for selector in free_button_selectors:
-            try:
-                buttons = driver.find_elements(By.XPATH, selector)
-                if buttons:
-                    print(f"✅ Botón de inscripción gratuita encontrado: {selector}")
-                    is_free = True
-                    break
-            except:
-                continue
-        
-        # Buscar elementos con precio $0
-        zero_price_selectors = [
-            "//span[contains(text(), '$0')]",
-            "//span[contains(text(), '0€')]",
-            "//span[contains(text(), '0.00')]",
-            "//div[contains(text(), '$0')]",
-            "//div[contains(text(), '0€')]",
-            "//div[contains(text(), '0.00')]"
-        ]
-        
-        for selector in zero_price_selectors:
-            try:
-                elements = driver.find_elements(By.XPATH, selector)
-                if elements:
-                    print(f"✅ Precio $0 encontrado: {selector}")
-                    is_free = True
-                    break
-            except:
-                continue
-        
-        # Lógica de decisión
-        if has_price and not is_free:
-            print("❌ El curso tiene precio, no es gratis")
-            return False
-        elif is_free:
-            print("✅ El curso es 100% gratis")
-            return True
-        else:
-            # Verificación adicional
-            buy_button_selectors = [
-                "//button[contains(text(), 'Buy')]",
-                "//button[contains(text(), 'Comprar')]",
-                "//button[contains(text(), 'Purchase')]",
-                "//button[contains(text(), 'Add to cart')]",
-                "//button[contains(text(), 'Agregar al carrito')]",
-                "//button[contains(text(), 'Buy now')]",
-                "//button[contains(text(), 'Comprar ahora')]"
+        # Capturar con la página completa: se levanta el bloqueo de imágenes y fuentes
+        with renderizado_completo(driver):
+            # Esperar a que la página cargue completamente
+            esperar_pagina_lista(driver)
+
+            # Buscar elementos específicos que indiquen que el curso es gratis
+            free_indicators = [
+                "//span[contains(text(), '100% gratis')]",
+                "//span[contains(text(), '100% free')]",
+                "//button[contains(text(), 'Inscribirse gratis')]",
+                "//button[contains(text(), 'Enroll for free')]",
+                "//span[contains(text(), '$0')]",
+                "//div[contains(text(), 'Gratis')]",
+                "//div[contains(text(), 'Free')]"
             ]
-            
-            has_buy_button = False
-            for selector in buy_button_selectors:
+
+            # Buscar el primer indicador de gratis
+            target_element = None
+            for selector in free_indicators:
                 try:
-                    buttons = driver.find_elements(By.XPATH, selector)
-                    if buttons:
-                        print(f"❌ Botón de compra encontrado: {selector}")
-                        has_buy_button = True
+                    elements = driver.find_elements(By.XPATH, selector)
+                    if elements:
+                        target_element = elements[0]
+                        print(f"✅ Encontrado indicador de gratis: {selector}")
                         break
                 except:
                     continue
-            
-            if has_buy_button:
-                return False
-            
-            print("⚠️ No se encontraron indicadores claros, verificando cupón...")
-            
-            if 'couponcode=' in udemy_url.lower():
-                print("✅ Cupón detectado en URL, asumiendo que puede hacer el curso gratis")
-                return True
-            
-            print("❌ No se encontraron indicadores claros de que sea gratis")
-            return False
-        
+
+            if target_element:
+                # Tomar captura enfocada en el elemento que indica que es gratis
+                screenshot = target_element.screenshot_as_png
+
+                # Redimensionar la imagen para que sea más pequeña
+                img = Image.open(io.BytesIO(screenshot))
+
+                # Calcular nuevas dimensiones (máximo 400px de ancho)
+                max_width = 400
+                width, height = img.size
+                if width > max_width:
+                    ratio = max_width / width
+                    new_width = max_width
+                    new_height = int(height * ratio)
+                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+                # Convertir a base64
+                buffer = io.BytesIO()
+                img.save(buffer, format='PNG', optimize=True, quality=85)
+                img_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+                print(f"📸 Captura enfocada tomada para: {course_name}")
+                return img_base64
+            else:
+                # Si no encuentra indicadores específicos, tomar captura general pero más pequeña
+                screenshot = driver.get_screenshot_as_png()
+                img = Image.open(io.BytesIO(screenshot))
+
+                # Redimensionar a un tamaño más pequeño
+                max_width = 600
+                width, height = img.size
+                if width > max_width:
+                    ratio = max_width / width
+                    new_width = max_width
+                    new_height = int(height * ratio)
+                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+                # Convertir a base64
+                buffer = io.BytesIO()
+                img.save(buffer, format='PNG', optimize=True, quality=85)
+                img_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+                print(f"📸 Captura general tomada para: {course_name}")
+                return img_base64
+
     except Exception as e:
-        print(f"⚠️ Error verificando si el curso es gratis: {e}")
-        return False
+        print(f"⚠️ Error tomando captura: {e}")
+        return None
+
+def verify_course_is_free(driver, udemy_url):
+    """Verificar si el curso es 100% gratis con la cascada de verificación
 
+    Caché, URL, API de precios por HTTP, elemento de precio y escaneo completo de
+    la página, en ese orden: el primer nivel con un resultado definitivo decide.
+    """
+    return verificar_en_cascada(
+        driver,
+        udemy_url,
+        extract_course_id(udemy_url),
+        extract_coupon_code_from_url(udemy_url),
+        escaner_precios_sin_carrito,
+    )
+
+@medido("extraccion")
 def extraer_cursos_de_cursosdev(driver, max_cursos=10):
     """Extraer exactamente 10 cursos de CursosDev"""
     print(f"🔍 Extrayendo {max_cursos} cursos de CursosDev...")
@@ -325,80 +183,46 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
     processed_courses = set()
     
     try:
-        # Navegar a la página principal de CursosDev
-        print("🌐 Navegando a la página principal de CursosDev...")
-        driver.set_page_load_timeout(30)
-        driver.get("https://cursosdev.com/")
-        time.sleep(3)
-        
-        if "cursosdev.com" not in driver.current_url.lower():
-            print("❌ Error: No se pudo cargar la página principal de CursosDev")
-            return udemy_links
+        # Intentar primero sin navegador; Selenium solo si la página necesita JavaScript
+        course_urls = obtener_enlaces_listado("https://cursosdev.com/")
+        if course_urls is None:
+            # Navegar a la página principal de CursosDev
+            print("🌐 Navegando a la página principal de CursosDev...")
+            driver.set_page_load_timeout(30)
+            navegar(driver, "https://cursosdev.com/")
+        
+            if "cursosdev.com" not in driver.current_url.lower():
+                print("❌ Error: No se pudo cargar la página principal de CursosDev")
+                return udemy_links
+        
+            print("✅ Página principal de CursosDev cargada correctamente")
+        
+            # Hacer scroll para cargar más cursos
+            print("📜 Haciendo scroll para cargar cursos...")
+            for scroll in range(3):
+                try:
+                    if not hacer_scroll(driver):
+                        print("📜 No se cargó más contenido")
+                        break
+                    print(f"Scroll {scroll+1}/3 completado")
+                except Exception as e:
+                    print(f"⚠️ Error en scroll {scroll+1}: {e}")
+                    break
         
-        print("✅ Página principal de CursosDev cargada correctamente")
+            # Buscar enlaces de cursos
+            print("🔍 Buscando enlaces de cursos en CursosDev...")
         
-        # Hacer scroll para cargar más cursos
-        print("📜 Haciendo scroll para cargar cursos...")
-        for scroll in range(3):
             try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                print(f"Scroll {scroll+1}/3 completado")
-            except Exception as e:
-                print(f"⚠️ Error en scroll {scroll+1}: {e}")
-                break
-        
-        # Buscar enlaces de cursos
-        print("🔍 Buscando enlaces de cursos en CursosDev...")
-        
-        try:
-            # Buscar enlaces específicos de cursos
-            course_links = []
-            
-            # Buscar enlaces que contengan "udemy"
-            udemy_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'udemy.com')]")
-            course_links.extend(udemy_links)
-            print(f"🔍 Enlaces de Udemy encontrados: {len(udemy_links)}")
-            
-            # Buscar enlaces que contengan "coupons-udemy"
-            coupons_udemy_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'coupons-udemy')]")
-            course_links.extend(coupons_udemy_links)
-            print(f"🔍 Enlaces con 'coupons-udemy' encontrados: {len(coupons_udemy_links)}")
-            
-            # Buscar enlaces en títulos
-            title_links = driver.find_elements(By.XPATH, "//h1//a | //h2//a | //h3//a | //h4//a | //h5//a")
-            course_links.extend(title_links)
-            print(f"🔍 Enlaces en títulos encontrados: {len(title_links)}")
-            
-            # Buscar enlaces en artículos
-            article_links = driver.find_elements(By.XPATH, "//article//a | //div[contains(@class, 'card')]//a | //div[contains(@class, 'post')]//a")
-            course_links.extend(article_links)
-            print(f"🔍 Enlaces en artículos/cards encontrados: {len(article_links)}")
-            
-            # Procesar los enlaces encontrados
-            all_course_urls = []
-            seen_urls = set()
-            for link in course_links:
-                try:
-                    href = link.get_attribute("href")
-                    if href and href not in seen_urls and href.startswith('http'):
-                        if (('cursosdev.com' in href and ('coupons-udemy' in href or 'udemy.com' in href)) or
-                            'udemy.com' in href or
-                            (href.startswith('https://cursosdev.com/') and 
-                             not href.startswith('https://cursosdev.com/courses/') and
-                             not href.startswith('https://cursosdev.com/blog') and
-                             not href.startswith('https://cursosdev.com/submit'))):
-                            seen_urls.add(href)
-                            all_course_urls.append(href)
-                except:
-                    continue
+                # Recolectar todos los enlaces en una sola llamada y clasificarlos en Python
+                enlaces = recolectar_enlaces(driver)
+                all_course_urls = urls_de_cursos(enlaces, ["udemy", "coupons-udemy", "titulo", "articulo"])
             
-            course_urls = all_course_urls
-            print(f"🔍 Encontrados {len(course_urls)} enlaces únicos de cursos...")
+                course_urls = all_course_urls
+                print(f"🔍 Encontrados {len(course_urls)} enlaces únicos de cursos...")
             
-        except Exception as e:
-            print(f"❌ Error buscando enlaces: {e}")
-            return udemy_links
+            except Exception as e:
+                print(f"❌ Error buscando enlaces: {e}")
+                return udemy_links
         
         # Procesar enlaces hasta encontrar exactamente max_cursos válidos
         valid_courses_found = 0
@@ -410,6 +234,7 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
                 
             try:
                 print(f"🔍 Procesando enlace {i+1}/{len(course_urls)}...")
+                contar("courses_processed")
                 
                 if i >= len(course_urls):
                     print("⚠️ No hay más enlaces disponibles")
@@ -425,8 +250,7 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
                 
                 # Navegar a la página del curso
                 try:
-                    driver.get(link_url)
-                    time.sleep(3)
+                    navegar(driver, link_url)
                 except Exception as e:
                     print(f"⚠️ Error navegando a la página: {e}")
                     continue
@@ -470,7 +294,7 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
                                 
                                 # Tomar captura de pantalla enfocada
                                 course_name = extract_course_name(udemy_url)
-                                screenshot = take_focused_screenshot(driver, course_name)
+                                screenshot = take_focused_screenshot(driver, udemy_url, course_name)
                                 
                                 # Construir URL completa con cupón
                                 if "couponCode=" in udemy_url:
@@ -530,91 +354,77 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
                         button_href = coupon_button.get_attribute("href")
                         print(f"🔗 Href del botón: {button_href}")
                         
-                        # Si el botón tiene un enlace de linksynergy, extraer la URL final directamente
-                        if button_href and "linksynergy.com" in button_href:
-                            print("🔍 Encontrado enlace de linksynergy, extrayendo URL final...")
+                        # Resolver el enlace del botón sin navegador (linksynergy, proxies y redirecciones HTTP)
+                        final_url = resolver_redireccion(button_href)
+                        if final_url:
+                            print(f"🔗 URL final resuelta: {final_url}")
                             try:
-                                # Extraer la URL final del parámetro murl
-                                murl_match = re.search(r'murl=([^&]+)', button_href)
-                                if murl_match:
-                                    final_url = murl_match.group(1)
-                                    # Decodificar URL
-                                    import urllib.parse
-                                    final_url = urllib.parse.unquote(final_url)
-                                    print(f"🔗 URL final extraída: {final_url}")
+                                print("✅ ¡Enlace de Udemy obtenido sin abrir la página!")
+                                udemy_url = final_url
+                                original_url = final_url
+                                
+                                # Verificar si es un enlace de checkout y convertirlo
+                                if "/payment/checkout/" in udemy_url:
+                                    print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
+                                    original_url = udemy_url
+                                    udemy_url = convert_checkout_to_course_url(udemy_url)
+                                    print(f"🔗 Enlace original: {original_url}")
+                                    print(f"🔗 Enlace convertido: {udemy_url}")
+                                
+                                # Extraer código de cupón
+                                coupon_code = extract_coupon_code_from_url(original_url)
+                                if not coupon_code:
+                                    coupon_code = extract_coupon_code_from_url(udemy_url)
+                                
+                                # Procesar el curso si tenemos cupón y URL de Udemy
+                                if coupon_code and udemy_url:
+                                    print(f"🎫 Código de cupón encontrado: {coupon_code}")
                                     
-                                    if "udemy.com/course/" in final_url:
-                                        print("✅ ¡Enlace de Udemy extraído de linksynergy!")
-                                        udemy_url = final_url
-                                        original_url = final_url
-                                        
-                                        # Verificar si es un enlace de checkout y convertirlo
-                                        if "/payment/checkout/" in udemy_url:
-                                            print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                            original_url = udemy_url
-                                            udemy_url = convert_checkout_to_course_url(udemy_url)
-                                            print(f"🔗 Enlace original: {original_url}")
-                                            print(f"🔗 Enlace convertido: {udemy_url}")
-                                        
-                                        # Extraer código de cupón
-                                        coupon_code = extract_coupon_code_from_url(original_url)
-                                        if not coupon_code:
-                                            coupon_code = extract_coupon_code_from_url(udemy_url)
+                                    # Extraer ID del curso para evitar duplicados
+                                    course_id = extract_course_id(udemy_url)
+                                    
+                                    if course_id not in processed_courses:
+                                        # Verificar si el curso es realmente gratis
+                                        print("🔍 Verificando si el curso es 100% gratis...")
+                                        is_free = verify_course_is_free(driver, udemy_url)
                                         
-                                        # Procesar el curso si tenemos cupón y URL de Udemy
-                                        if coupon_code and udemy_url:
-                                            print(f"🎫 Código de cupón encontrado: {coupon_code}")
+                                        if is_free:
+                                            processed_courses.add(course_id)
                                             
-                                            # Extraer ID del curso para evitar duplicados
-                                            course_id = extract_course_id(udemy_url)
+                                            # Tomar captura de pantalla enfocada
+                                            course_name = extract_course_name(udemy_url)
+                                            screenshot = take_focused_screenshot(driver, udemy_url, course_name)
                                             
-                                            if course_id not in processed_courses:
-                                                # Verificar si el curso es realmente gratis
-                                                print("🔍 Verificando si el curso es 100% gratis...")
-                                                is_free = verify_course_is_free(driver, udemy_url)
-                                                
-                                                if is_free:
-                                                    processed_courses.add(course_id)
-                                                    
-                                                    # Tomar captura de pantalla enfocada
-                                                    course_name = extract_course_name(udemy_url)
-                                                    screenshot = take_focused_screenshot(driver, course_name)
-                                                    
-                                                    # Construir URL completa con cupón
-                                                    if "couponCode=" in udemy_url:
-                                                        full_url = udemy_url
-                                                    else:
-                                                        full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                                    
-                                                    udemy_links.append({
-                                                        'text': f"Curso de CursosDev: {course_name}",
-                                                        'urls': [full_url],
-                                                        'index': len(udemy_links),
-                                                        'screenshot': screenshot
-                                                    })
-                                                    valid_courses_found += 1
-                                                    print(f"✅ Curso GRATIS agregado: {course_name}")
-                                                    print(f"🎫 Código del cupón: {coupon_code}")
-                                                    print(f"🔗 URL completa: {full_url}")
-                                                    print(f"📊 Cursos válidos encontrados: {valid_courses_found}/{max_cursos}")
-                                                else:
-                                                    print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
+                                            # Construir URL completa con cupón
+                                            if "couponCode=" in udemy_url:
+                                                full_url = udemy_url
                                             else:
-                                                print(f"⚠️ Curso duplicado ignorado: {course_id}")
+                                                full_url = f"{udemy_url}?couponCode={coupon_code}"
+                                            
+                                            udemy_links.append({
+                                                'text': f"Curso de CursosDev: {course_name}",
+                                                'urls': [full_url],
+                                                'index': len(udemy_links),
+                                                'screenshot': screenshot
+                                            })
+                                            valid_courses_found += 1
+                                            print(f"✅ Curso GRATIS agregado: {course_name}")
+                                            print(f"🎫 Código del cupón: {coupon_code}")
+                                            print(f"🔗 URL completa: {full_url}")
+                                            print(f"📊 Cursos válidos encontrados: {valid_courses_found}/{max_cursos}")
                                         else:
-                                            print("❌ No se encontró código de cupón o URL de Udemy válida")
+                                            print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
                                     else:
-                                        print("⚠️ La URL extraída no es de Udemy")
+                                        print(f"⚠️ Curso duplicado ignorado: {course_id}")
                                 else:
-                                    print("⚠️ No se pudo extraer la URL final del enlace linksynergy")
+                                    print("❌ No se encontró código de cupón o URL de Udemy válida")
                             except Exception as e:
-                                print(f"⚠️ Error extrayendo URL de linksynergy: {e}")
+                                print(f"⚠️ Error procesando la URL resuelta: {e}")
                         else:
                             # Hacer clic en el botón normalmente
                             print("🖱️ Haciendo clic en botón de cupón...")
                             try:
-                                coupon_button.click()
-                                time.sleep(3)
+                                clic_y_esperar(driver, coupon_button)
                                 
                                 # Verificar si se redirigió a Udemy
                                 current_url = driver.current_url
@@ -655,7 +465,7 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
                                                 
                                                 # Tomar captura de pantalla enfocada
                                                 course_name = extract_course_name(udemy_url)
-                                                screenshot = take_focused_screenshot(driver, course_name)
+                                                screenshot = take_focused_screenshot(driver, udemy_url, course_name)
                                                 
                                                 # Construir URL completa con cupón
                                                 if "couponCode=" in udemy_url:
@@ -689,21 +499,17 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
                 
                 # Volver a la página principal de CursosDev
                 try:
-                    driver.back()
-                    time.sleep(2)
+                    volver(driver)
                 except Exception as e:
                     print(f"⚠️ Error volviendo atrás: {e}")
-                    driver.get("https://cursosdev.com/")
-                    time.sleep(3)
+                    navegar(driver, "https://cursosdev.com/")
                 
             except Exception as e:
                 print(f"⚠️ Error procesando curso {i+1}: {e}")
                 try:
-                    driver.back()
-                    time.sleep(2)
+                    volver(driver)
                 except:
-                    driver.get("https://cursosdev.com/")
-                    time.sleep(3)
+                    navegar(driver, "https://cursosdev.com/")
                 continue
     
     except Exception as e:
@@ -712,6 +518,7 @@ def extraer_cursos_de_cursosdev(driver, max_cursos=10):
     print(f"📊 Cursos extraídos de CursosDev: {len(udemy_links)}")
     return udemy_links
 
+@medido("html")
 def create_html_page(courses):
     """Crear página HTML con los cursos encontrados"""
     print("🌐 Creando página HTML...")
@@ -923,6 +730,7 @@ def create_html_page(courses):
     print("✅ Página HTML creada en docs/index.html")
     return True
 
+@medido("git")
 def commit_and_push_to_github():
     """Hacer commit y push a GitHub"""
     print("📤 Subiendo cambios a GitHub...")
@@ -957,6 +765,8 @@ def commit_and_push_to_github():
         print(f"❌ Error en commit y push: {e}")
         return False
 
+@perfilado("bot_mejorado_10_cursos")
+@ejecucion_medida("bot_mejorado_10_cursos")
 def main():
     """Función principal del bot mejorado"""
     print("🚀 Bot Mejorado - 10 Cursos Gratuitos")
@@ -971,15 +781,7 @@ def main():
     try:
         # 1. INICIALIZAR DRIVER DE CHROME
         print("\nPASO 1: Inicializando navegador...")
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver = obtener_driver("scraping")
         
         # 2. EXTRAER EXACTAMENTE 10 CURSOS
         print("\nPASO 2: Extrayendo 10 cursos gratuitos de CursosDev...")
@@ -989,6 +791,7 @@ def main():
             print("❌ No se encontraron cursos gratuitos")
             return False
         
+        contar("courses_found", len(courses))
         print(f"\n📊 RESUMEN:")
         print(f"✅ Cursos gratuitos encontrados: {len(courses)}")
         
@@ -1017,13 +820,9 @@ def main():
         return False
     
     finally:
-        # Cerrar el navegador
-        if driver:
-            try:
-                driver.quit()
-                print("🌐 Navegador cerrado")
-            except:
-                pass
+        obtener_cascada().imprimir_resumen()
+        # Devolver el navegador al gestor de sesiones (queda abierto para la próxima ejecución)
+        liberar_driver(driver, "scraping")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -5,24 +5,34 @@ Versión que no requiere descarga automática de ChromeDriver
 """
 
 import os
-import time
 import re
 import json
 import base64
+import time
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from PIL import Image
 import io
 
+from config_bot_mejorado import get_config
+from course_identity import identidad_curso, url_canonica
+from incremental_state import obtener_estado_incremental
+from link_harvester import recolectar_enlaces
+from page_probe import abrir_y_sondear, aprender_de_sonda, ficha_abierta, sondear
+from page_waits import esperar_sin_desafio, navegar
+from pipeline import Pipeline
+from price_scanner import escaner_precios
+from resource_blocking import renderizado_completo
+from dev_profiling import perfilado
+from run_metrics import contar, ejecucion_medida, medido
+from session_manager import liberar_driver, obtener_driver
+from verification_cache import obtener_cache
+from verification_cascade import obtener_cascada, verificar_en_cascada
+
 def extract_course_id(url):
-    """Extraer el ID único del curso de Udemy"""
+    """Extraer el ID único del curso de Udemy (su slug, aunque la URL traiga el ID numérico)"""
     try:
-        match = re.search(r'/course/([^/?]+)', url)
-        return match.group(1) if match else None
+        return identidad_curso(url)
     except:
         return None
 
@@ -30,17 +40,9 @@ def setup_chrome_driver():
     """Configurar Chrome Driver sin descarga automática"""
     print("🌐 Configurando Chrome Driver...")
     
-    chrome_options = Options()
-    # chrome_options.add_argument("--headless")  # Comentado para mostrar el navegador
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    
     try:
-        # Intentar usar ChromeDriver local
-        driver = webdriver.Chrome(options=chrome_options)
+        # Navegador del perfil de scraping (reutiliza el de la ejecución anterior si sigue abierto)
+        driver = obtener_driver("scraping")
         print("✅ Chrome Driver configurado correctamente")
         return driver
     except Exception as e:
@@ -49,121 +51,6 @@ def setup_chrome_driver():
         print("💡 Descarga ChromeDriver desde: https://chromedriver.chromium.org/")
         return None
 
-def take_focused_screenshot(driver, url, course_id):
-    """Tomar captura enfocada en elementos que indican '100% gratis'"""
-    try:
-        print(f"📸 Tomando captura de {url}")
-        
-        # Navegar a la página
-        driver.get(url)
-        time.sleep(5)  # Más tiempo para cargar
-        
-        # Verificar si estamos en una página de Cloudflare
-        page_source = driver.page_source.lower()
-        if "cloudflare" in page_source or "verifique que usted es un ser humano" in page_source:
-            print("⚠️ Detectada página de verificación Cloudflare")
-            print("📸 Tomando captura de la página de verificación")
-            screenshot = driver.get_screenshot_as_png()
-        else:
-            # Buscar elementos que indiquen que el curso es gratis
-            free_indicators = [
-                "100% gratis",
-                "100% free", 
-                "100 % de descuento",
-                "100% discount",
-                "Inscribirse gratis",
-                "Get for free",
-                "Gratis",
-                "Free",
-                "$0",
-                "0€"
-            ]
-            
-            # Buscar elementos con estos textos
-            focused_element = None
-            for indicator in free_indicators:
-                try:
-                    elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{indicator}')]")
-                    if elements:
-                        focused_element = elements[0]
-                        print(f"✅ Encontrado indicador: {indicator}")
-                        break
-                except:
-                    continue
-            
-            # Si no se encuentra ningún indicador, buscar elementos de precio
-            if not focused_element:
-                try:
-                    price_elements = driver.find_elements(By.CSS_SELECTOR, "[data-purpose='price-text'], .price-text, .course-price")
-                    for element in price_elements:
-                        if any(price in element.text.lower() for price in ['gratis', 'free', '$0', '0€']):
-                            focused_element = element
-                            print(f"✅ Encontrado precio gratis: {element.text}")
-                            break
-                except:
-                    pass
-            
-            # Si no se encuentra ningún indicador, tomar captura completa
-            if not focused_element:
-                print("⚠️ No se encontraron indicadores de curso gratis, tomando captura completa")
-                screenshot = driver.get_screenshot_as_png()
-            else:
-                # Tomar captura enfocada en el elemento
-                location = focused_element.location
-                size = focused_element.size
-                
-                # Tomar captura completa
-                screenshot = driver.get_screenshot_as_png()
-                
-                # Recortar la imagen para enfocarse en el elemento
-                img = Image.open(io.BytesIO(screenshot))
-                
-                # Calcular coordenadas del elemento
-                left = location['x']
-                top = location['y']
-                right = location['x'] + size['width']
-                bottom = location['y'] + size['height']
-                
-                # Agregar margen más amplio para incluir título del curso
-                margin_x = 200  # Margen horizontal más amplio
-                margin_y = 100  # Margen vertical
-                
-                left = max(0, left - margin_x)
-                top = max(0, top - margin_y)
-                right = min(img.width, right + margin_x)
-                bottom = min(img.height, bottom + margin_y)
-                
-                # Recortar la imagen
-                img = img.crop((left, top, right, bottom))
-                screenshot = io.BytesIO()
-                img.save(screenshot, format='PNG')
-                screenshot = screenshot.getvalue()
-        
-        # Redimensionar la imagen para que sea más pequeña
-        img = Image.open(io.BytesIO(screenshot))
-        
-        # Calcular nuevas dimensiones (máximo 500px de ancho para mejor calidad)
-        max_width = 500
-        if img.width > max_width:
-            ratio = max_width / img.width
-            new_width = max_width
-            new_height = int(img.height * ratio)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Guardar la imagen optimizada
-        screenshot_path = f"screenshots/{course_id}_focused.png"
-        os.makedirs("screenshots", exist_ok=True)
-        
-        # Guardar con compresión
-        img.save(screenshot_path, "PNG", optimize=True, quality=90)
-        
-        print(f"✅ Captura guardada: {screenshot_path}")
-        return screenshot_path
-        
-    except Exception as e:
-        print(f"❌ Error al tomar captura: {str(e)}")
-        return None
-
 def extract_coupon_from_url(url):
     """Extraer código de cupón de la URL"""
     try:
@@ -186,420 +73,65 @@ def extract_coupon_from_url(url):
         return "GRATIS"
 
 def verify_course_is_free(driver, udemy_url):
-    """Verificar si el curso es 100% gratis navegando a la página de Udemy"""
-    try:
-        print(f"🔍 Verificando si el curso es gratis: {udemy_url}")
-        
-        # Navegar a la página del curso
-        driver.get(udemy_url)
-        time.sleep(5)  # Más tiempo para cargar
-        
-        # Verificar si estamos en una página de Cloudflare
-        page_source = driver.page_source.lower()
-        if "cloudflare" in page_source or "verifique que usted es un ser humano" in page_source:
-            print("⚠️ Detectada página de verificación Cloudflare")
-            print("💡 Intentando esperar a que se complete la verificación...")
-            time.sleep(10)  # Esperar más tiempo para que se complete la verificación
-            page_source = driver.page_source.lower()
-        
-        # Obtener el texto de la página
-        page_text = page_source
-        
-        # Buscar indicadores específicos de precio (más precisos)
-        price_patterns = [
-            r'\$\d+\.?\d*',  # $19.99, $20, etc.
-            r'€\d+\.?\d*',   # €19.99, €20, etc.
-            r'£\d+\.?\d*',   # £19.99, £20, etc.
-            r'\d+\.?\d*\s*\$',  # 19.99 $, 20 $, etc.
-            r'\d+\.?\d*\s*€',   # 19.99 €, 20 €, etc.
-            r'\d+\.?\d*\s*£',   # 19.99 £, 20 £, etc.
-            r'precio.*?\$\d+',  # precio $19
-            r'price.*?\$\d+',   # price $19
-            r'costo.*?\$\d+',   # costo $19
-            r'cost.*?\$\d+'     # cost $19
-        ]
-        
-        # Verificar si hay precios específicos (no $0)
-        has_price = False
-        for pattern in price_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            for match in matches:
-                # Extraer solo el número del precio
-                price_number = re.search(r'\d+\.?\d*', match)
-                if price_number:
-                    price_value = float(price_number.group())
-                    if price_value > 0:  # Si el precio es mayor a 0
-                        has_price = True
-                        print(f"❌ Precio detectado: {match} (valor: {price_value})")
-                        break
-            if has_price:
-                break
-        
-        # Buscar indicadores específicos de gratis (más amplios)
-        free_indicators = [
-            "100% gratis",
-            "100% free", 
-            "gratis",
-            "free",
-            "$0",
-            "0.00",
-            "0,00",
-            "gratuito",
-            "sin costo",
-            "no cost",
-            "completamente gratis",
-            "completely free",
-            "inscribirse gratis",
-            "enroll for free",
-            "inscribirse sin costo",
-            "enroll at no cost",
-            "inscribirse ahora",
-            "enroll now",
-            "add to cart",
-            "agregar al carrito",
-            "free enrollment",
-            "inscripción gratuita",
-            "curso gratuito",
-            "free course",
-            "sin pagar",
-            "no payment",
-            "gratis para siempre",
-            "free forever"
-        ]
-        
-        # Verificar si hay indicadores de gratis
-        is_free = False
-        for indicator in free_indicators:
-            if indicator.lower() in page_text:
-                is_free = True
-                print(f"✅ Indicador de gratis encontrado: {indicator}")
-                break
-        
-        # Buscar botones específicos de inscripción gratuita
-        free_button_selectors = [
-            "//button[contains(text(), 'Inscribirse gratis')]",
-            "//button[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Inscribirse sin costo')]",
-            "//button[contains(text(), 'Enroll at no cost')]",
-            "//button[contains(text(), 'Inscribirse ahora')]",
-            "//button[contains(text(), 'Enroll now')]",
-            "//a[contains(text(), 'Inscribirse gratis')]",
-            "//a[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Free')]",
-            "//button[contains(text(), 'Gratis')]",
-            "//a[contains(text(), 'Free')]",
-            "//a[contains(text(), 'Gratis')]",
-            "//span[contains(text(), 'Free')]",
-            "//span[contains(text(), 'Gratis')]"
-        ]
-        
-        for selector in free_button_selectors:
-            try:
-                buttons = driver.find_elements(By.XPATH, selector)
-                if buttons:
-                    print(f"✅ Botón de inscripción gratuita encontrado: {selector}")
-                    is_free = True
-                    break
-            except:
-                continue
-        
-        # Buscar elementos con precio $0 o 0€
-        zero_price_selectors = [
-            "//span[contains(text(), '$0')]",
-            "//span[contains(text(), '0€')]",
-            "//span[contains(text(), '0.00')]",
-            "//div[contains(text(), '$0')]",
-            "//div[contains(text(), '0€')]",
-            "//div[contains(text(), '0.00')]"
-        ]
-        
-        for selector in zero_price_selectors:
-            try:
-                elements = driver.find_elements(By.XPATH, selector)
-                if elements:
-                    print(f"✅ Precio $0 encontrado: {selector}")
-                    is_free = True
-                    break
-            except:
-                continue
-        
-        # Lógica de decisión mejorada
-        if has_price and not is_free:
-            print("❌ El curso tiene precio, no es gratis")
-            return False
-        elif is_free:
-            print("✅ El curso es 100% gratis")
-            return True
-        else:
-            # Verificación adicional: buscar si hay botones de compra
-            buy_button_selectors = [
-                "//button[contains(text(), 'Buy')]",
-                "//button[contains(text(), 'Comprar')]",
-                "//button[contains(text(), 'Purchase')]",
-                "//button[contains(text(), 'Add to cart')]",
-                "//button[contains(text(), 'Agregar al carrito')]",
-                "//button[contains(text(), 'Buy now')]",
-                "//button[contains(text(), 'Comprar ahora')]"
-            ]
-            
-            has_buy_button = False
-            for selector in buy_button_selectors:
-                try:
-                    buttons = driver.find_elements(By.XPATH, selector)
-                    if buttons:
-                        print(f"❌ Botón de compra encontrado: {selector}")
-                        has_buy_button = True
-                        break
-                except:
-                    continue
-            
-            if has_buy_button:
-                return False
-            
-            # Si no encontramos indicadores claros, verificar cupón
-            print("⚠️ No se encontraron indicadores claros, verificando cupón...")
-            
-            # Verificar si el cupón hace el curso gratis
-            if 'couponcode=' in udemy_url.lower() or 'cupon=' in udemy_url.lower():
-                print("✅ Cupón detectado en URL, asumiendo que puede hacer el curso gratis")
-                return True
-            
-            print("❌ No se encontraron indicadores claros de que sea gratis")
-            return False
-        
-    except Exception as e:
-        print(f"⚠️ Error verificando si el curso es gratis: {e}")
-        return False
+    """Verificar si el curso es 100% gratis con la cascada de verificación
 
-def verify_course_is_free_and_screenshot(driver, udemy_url, course_id):
-    """Verificar si el curso es gratis y tomar captura durante la verificación"""
+    Caché, URL, API de precios por HTTP, elemento de precio y escaneo completo de
+    la página, en ese orden: el primer nivel con un resultado definitivo decide.
+    """
+    return verificar_en_cascada(
+        driver,
+        udemy_url,
+        extract_course_id(udemy_url),
+        extract_coupon_from_url(udemy_url),
+        escaner_precios,
+    )
+
+def take_free_course_screenshot(driver, udemy_url, course_id):
+    """Tomar la captura de un curso que la cascada ya verificó como gratis
+
+    Si la ficha sigue abierta (la decidió la página) se sondea tal cual; si la
+    decidió la caché o la API de precios, se abre ahora. Devuelve la ruta o None.
+    """
     try:
-        print(f"🔍 Verificando si el curso es gratis: {udemy_url}")
-        
-        # Navegar a la página del curso
-        driver.get(udemy_url)
-        time.sleep(5)  # Más tiempo para cargar
-        
-        # Manejar Cloudflare con más paciencia
-        max_cloudflare_attempts = 3
-        for attempt in range(max_cloudflare_attempts):
-            page_source = driver.page_source.lower()
-            if "cloudflare" in page_source or "verifique que usted es un ser humano" in page_source:
-                print(f"⚠️ Detectada página de verificación Cloudflare (intento {attempt + 1}/{max_cloudflare_attempts})")
-                print("💡 Esperando a que se complete la verificación...")
-                time.sleep(15)  # Esperar más tiempo para que se complete la verificación
-                
-                # Intentar hacer clic en el botón de verificación si existe
-                try:
-                    verify_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Verify')] | //button[contains(text(), 'Verificar')] | //input[@type='submit']")
-                    if verify_buttons:
-                        print("🖱️ Haciendo clic en botón de verificación...")
-                        verify_buttons[0].click()
-                        time.sleep(10)
-                except:
-                    pass
-                
-                # Verificar si ya no estamos en Cloudflare
-                page_source = driver.page_source.lower()
-                if "cloudflare" not in page_source and "verifique que usted es un ser humano" not in page_source:
-                    print("✅ Verificación Cloudflare completada, continuando...")
-                    break
-            else:
-                break
-        
-        # Verificar si seguimos en Cloudflare después de todos los intentos
-        page_source = driver.page_source.lower()
-        if "cloudflare" in page_source or "verifique que usted es un ser humano" in page_source:
-            print("❌ No se pudo completar la verificación Cloudflare")
-            return False, None
-        
-        # Obtener el texto de la página
-        page_text = page_source
-        
-        # Buscar indicadores específicos de precio (más precisos)
-        price_patterns = [
-            r'\$\d+\.?\d*',  # $19.99, $20, etc.
-            r'€\d+\.?\d*',   # €19.99, €20, etc.
-            r'£\d+\.?\d*',   # £19.99, £20, etc.
-            r'\d+\.?\d*\s*\$',  # 19.99 $, 20 $, etc.
-            r'\d+\.?\d*\s*€',   # 19.99 €, 20 €, etc.
-            r'\d+\.?\d*\s*£',   # 19.99 £, 20 £, etc.
-            r'precio.*?\$\d+',  # precio $19
-            r'price.*?\$\d+',   # price $19
-            r'costo.*?\$\d+',   # costo $19
-            r'cost.*?\$\d+'     # cost $19
-        ]
-        
-        # Verificar si hay precios específicos (no $0)
-        has_price = False
-        for pattern in price_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            for match in matches:
-                # Extraer solo el número del precio
-                price_number = re.search(r'\d+\.?\d*', match)
-                if price_number:
-                    price_value = float(price_number.group())
-                    if price_value > 0:  # Si el precio es mayor a 0
-                        has_price = True
-                        print(f"❌ Precio detectado: {match} (valor: {price_value})")
-                        break
-            if has_price:
-                break
-        
-        # Buscar indicadores específicos de gratis (más amplios)
-        free_indicators = [
-            "100% gratis",
-            "100% free", 
-            "gratis",
-            "free",
-            "$0",
-            "0.00",
-            "0,00",
-            "gratuito",
-            "sin costo",
-            "no cost",
-            "completamente gratis",
-            "completely free",
-            "inscribirse gratis",
-            "enroll for free",
-            "inscribirse sin costo",
-            "enroll at no cost",
-            "inscribirse ahora",
-            "enroll now",
-            "add to cart",
-            "agregar al carrito",
-            "free enrollment",
-            "inscripción gratuita",
-            "curso gratuito",
-            "free course",
-            "sin pagar",
-            "no payment",
-            "gratis para siempre",
-            "free forever"
-        ]
-        
-        # Verificar si hay indicadores de gratis
-        is_free = False
-        free_element = None
-        for indicator in free_indicators:
-            if indicator.lower() in page_text:
-                is_free = True
-                print(f"✅ Indicador de gratis encontrado: {indicator}")
-                # Buscar el elemento específico para la captura
-                try:
-                    elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{indicator}')]")
-                    if elements:
-                        free_element = elements[0]
-                        break
-                except:
-                    pass
-                break
-        
-        # Buscar botones específicos de inscripción gratuita
-        free_button_selectors = [
-            "//button[contains(text(), 'Inscribirse gratis')]",
-            "//button[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Inscribirse sin costo')]",
-            "//button[contains(text(), 'Enroll at no cost')]",
-            "//button[contains(text(), 'Inscribirse ahora')]",
-            "//button[contains(text(), 'Enroll now')]",
-            "//a[contains(text(), 'Inscribirse gratis')]",
-            "//a[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Free')]",
-            "//button[contains(text(), 'Gratis')]",
-            "//a[contains(text(), 'Free')]",
-            "//a[contains(text(), 'Gratis')]",
-            "//span[contains(text(), 'Free')]",
-            "//span[contains(text(), 'Gratis')]"
-        ]
-        
-        for selector in free_button_selectors:
-            try:
-                buttons = driver.find_elements(By.XPATH, selector)
-                if buttons:
-                    print(f"✅ Botón de inscripción gratuita encontrado: {selector}")
-                    is_free = True
-                    free_element = buttons[0]
-                    break
-            except:
-                continue
-        
-        # Buscar elementos con precio $0 o 0€
-        zero_price_selectors = [
-            "//span[contains(text(), '$0')]",
-            "//span[contains(text(), '0€')]",
-            "//span[contains(text(), '0.00')]",
-            "//div[contains(text(), '$0')]",
-            "//div[contains(text(), '0€')]",
-            "//div[contains(text(), '0.00')]"
-        ]
-        
-        for selector in zero_price_selectors:
+        if ficha_abierta(driver, udemy_url):
+            sonda = sondear(driver, escaner_precios)
+        else:
+            # Navegar a la página del curso y sondearla, esperando a Cloudflare si aparece
+            sonda = abrir_y_sondear(driver, udemy_url, escaner_precios)
+        if sonda is None:
+            # Intentar hacer clic en el botón de verificación si existe
             try:
-                elements = driver.find_elements(By.XPATH, selector)
-                if elements:
-                    print(f"✅ Precio $0 encontrado: {selector}")
-                    is_free = True
-                    free_element = elements[0]
-                    break
+                verify_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Verify')] | //button[contains(text(), 'Verificar')] | //input[@type='submit']")
+                if verify_buttons:
+                    print("🖱️ Haciendo clic en botón de verificación...")
+                    verify_buttons[0].click()
+                    if esperar_sin_desafio(driver, timeout=10):
+                        print("✅ Verificación Cloudflare completada, continuando...")
+                        sonda = sondear(driver, escaner_precios)
+                        aprender_de_sonda(sonda)
             except:
-                continue
+                pass
+        if sonda is None:
+            return None
         
-        # Lógica de decisión mejorada
-        if has_price and not is_free:
-            print("❌ El curso tiene precio, no es gratis")
-            return False, None
-        elif is_free:
-            print("✅ El curso es 100% gratis")
-            
-            # Tomar captura enfocada en el elemento de gratis
-            screenshot_path = take_focused_screenshot_from_element(driver, free_element, course_id)
-            return True, screenshot_path
-        else:
-            # Verificación adicional: buscar si hay botones de compra
-            buy_button_selectors = [
-                "//button[contains(text(), 'Buy')]",
-                "//button[contains(text(), 'Comprar')]",
-                "//button[contains(text(), 'Purchase')]",
-                "//button[contains(text(), 'Add to cart')]",
-                "//button[contains(text(), 'Agregar al carrito')]",
-                "//button[contains(text(), 'Buy now')]",
-                "//button[contains(text(), 'Comprar ahora')]"
-            ]
-            
-            has_buy_button = False
-            for selector in buy_button_selectors:
-                try:
-                    buttons = driver.find_elements(By.XPATH, selector)
-                    if buttons:
-                        print(f"❌ Botón de compra encontrado: {selector}")
-                        has_buy_button = True
-                        break
-                except:
-                    continue
-            
-            if has_buy_button:
-                return False, None
-            
-            # Si no encontramos indicadores claros, verificar cupón
-            print("⚠️ No se encontraron indicadores claros, verificando cupón...")
-            
-            # Verificar si el cupón hace el curso gratis
-            if 'couponcode=' in udemy_url.lower() or 'cupon=' in udemy_url.lower():
-                print("✅ Cupón detectado en URL, asumiendo que puede hacer el curso gratis")
-                # Tomar captura completa ya que no encontramos elemento específico
-                screenshot_path = take_focused_screenshot_from_element(driver, None, course_id)
-                return True, screenshot_path
-            
-            print("❌ No se encontraron indicadores claros de que sea gratis")
-            return False, None
+        # Selector del elemento a capturar; se busca de nuevo al recargar la página completa
+        # (prioridad: precio $0, botón de inscripción gratuita, indicador de gratis;
+        # sin ninguno se toma la captura completa)
+        free_selector = (sonda.get('selector_precio_cero') or sonda.get('selector_gratis')
+                         or sonda.get('selector_indicador'))
+        return take_focused_screenshot_from_element(driver, free_selector, course_id)
         
     except Exception as e:
-        print(f"⚠️ Error verificando si el curso es gratis: {e}")
-        return False, None
+        print(f"❌ Error al tomar captura: {e}")
+        return None
+
+@medido("captura", contador="screenshots_taken")
+def take_focused_screenshot_from_element(driver, focused_selector, course_id):
+    """Tomar captura enfocada en el elemento del selector XPath o completa si no se especifica
 
-def take_focused_screenshot_from_element(driver, focused_element, course_id):
-    """Tomar captura enfocada en un elemento específico o completa si no se especifica"""
+    La página se recarga sin el bloqueo de recursos, por eso se recibe el selector
+    y no el elemento (que quedaría obsoleto).
+    """
     try:
         print(f"📸 Tomando captura enfocada...")
         
@@ -615,74 +147,95 @@ def take_focused_screenshot_from_element(driver, focused_element, course_id):
             print("❌ No se puede tomar captura: no estamos en una página de curso de Udemy")
             return None
         
-        # Si no se especifica elemento, tomar captura completa
-        if not focused_element:
-            print("📸 Tomando captura completa de la página del curso")
-            screenshot = driver.get_screenshot_as_png()
-        else:
-            # Tomar captura enfocada en el elemento
-            location = focused_element.location
-            size = focused_element.size
-            
-            # Tomar captura completa
-            screenshot = driver.get_screenshot_as_png()
-            
-            # Recortar la imagen para enfocarse en el elemento
-            img = Image.open(io.BytesIO(screenshot))
-            
-            # Calcular coordenadas del elemento
-            left = location['x']
-            top = location['y']
-            right = location['x'] + size['width']
-            bottom = location['y'] + size['height']
-            
-            # Agregar margen más amplio para incluir título del curso
-            margin_x = 200  # Margen horizontal más amplio
-            margin_y = 100  # Margen vertical
-            
-            left = max(0, left - margin_x)
-            top = max(0, top - margin_y)
-            right = min(img.width, right + margin_x)
-            bottom = min(img.height, bottom + margin_y)
+        # Capturar con la página completa: se levanta el bloqueo de imágenes y fuentes
+        with renderizado_completo(driver):
+            focused_element = None
+            if focused_selector:
+                elements = driver.find_elements(By.XPATH, focused_selector)
+                focused_element = elements[0] if elements else None
+
+            # Si no se especifica elemento, tomar captura completa
+            if not focused_element:
+                print("📸 Tomando captura completa de la página del curso")
+                screenshot = driver.get_screenshot_as_png()
+            else:
+                # Tomar captura enfocada en el elemento
+                location = focused_element.location
+                size = focused_element.size
             
-            # Recortar la imagen
-            img = img.crop((left, top, right, bottom))
-            screenshot = io.BytesIO()
-            img.save(screenshot, format='PNG')
-            screenshot = screenshot.getvalue()
+                # Tomar captura completa y recortarla alrededor del elemento
+                screenshot = recortar_captura(driver.get_screenshot_as_png(), location, size)
         
-        # Redimensionar la imagen para que sea más pequeña
-        img = Image.open(io.BytesIO(screenshot))
-        
-        # Calcular nuevas dimensiones (máximo 500px de ancho para mejor calidad)
-        max_width = 500
-        if img.width > max_width:
-            ratio = max_width / img.width
-            new_width = max_width
-            new_height = int(img.height * ratio)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Guardar la imagen optimizada
-        screenshot_path = f"screenshots/{course_id}_focused.png"
-        os.makedirs("screenshots", exist_ok=True)
-        
-        # Guardar con compresión
-        img.save(screenshot_path, "PNG", optimize=True, quality=90)
-        
-        print(f"✅ Captura guardada: {screenshot_path}")
-        return screenshot_path
+        return guardar_captura_optimizada(screenshot, course_id)
         
     except Exception as e:
         print(f"❌ Error al tomar captura: {str(e)}")
         return None
 
-def extract_courses_from_cursosdev(driver, max_courses=10):
-    """Extraer cursos de CursosDev: 10 de IT y 10 de la página principal"""
+def recortar_captura(screenshot, location, size):
+    """Recortar una captura PNG alrededor de un elemento (con margen para incluir el título)"""
+    img = Image.open(io.BytesIO(screenshot))
+    
+    # Calcular coordenadas del elemento
+    left = location['x']
+    top = location['y']
+    right = location['x'] + size['width']
+    bottom = location['y'] + size['height']
+    
+    # Agregar margen más amplio para incluir título del curso
+    margin_x = 200  # Margen horizontal más amplio
+    margin_y = 100  # Margen vertical
+    
+    left = max(0, left - margin_x)
+    top = max(0, top - margin_y)
+    right = min(img.width, right + margin_x)
+    bottom = min(img.height, bottom + margin_y)
+    
+    # Recortar la imagen
+    img = img.crop((left, top, right, bottom))
+    recorte = io.BytesIO()
+    img.save(recorte, format='PNG')
+    return recorte.getvalue()
+
+def guardar_captura_optimizada(screenshot, course_id):
+    """Redimensionar una captura PNG y guardarla comprimida en screenshots/"""
+    img = Image.open(io.BytesIO(screenshot))
+    
+    # Calcular nuevas dimensiones (máximo 500px de ancho para mejor calidad)
+    max_width = 500
+    if img.width > max_width:
+        ratio = max_width / img.width
+        new_width = max_width
+        new_height = int(img.height * ratio)
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    
+    # Guardar la imagen optimizada
+    screenshot_path = f"screenshots/{course_id}_focused.png"
+    os.makedirs("screenshots", exist_ok=True)
+    
+    # Guardar con compresión
+    img.save(screenshot_path, "PNG", optimize=True, quality=90)
+    
+    print(f"✅ Captura guardada: {screenshot_path}")
+    return screenshot_path
+
+@medido("extraccion")
+def extract_courses_from_cursosdev(driver, max_courses=10, estado=None, entregar=None):
+    """Extraer cursos de CursosDev: 10 de IT y 10 de la página principal
+
+    Con un EstadoIncremental se saltan los cursos ya publicados y se deja de
+    recorrer un listado al encontrar varios conocidos seguidos.
+    Con entregar(curso) cada curso verificado se entrega en cuanto está listo;
+    si entregar devuelve False (la publicación terminó) se deja de extraer.
+    """
     print(f"🎯 Buscando {max_courses} cursos gratuitos...")
     print("📋 Estrategia: 10 cursos de IT + 10 de página principal")
     
     courses = []
     processed_urls = set()
+    processed_ids = set()
+    cache = obtener_cache()
+    detenido = False
     
     # Páginas específicas a buscar
     pages_to_search = [
@@ -700,50 +253,45 @@ def extract_courses_from_cursosdev(driver, max_courses=10):
     
     try:
         for page_info in pages_to_search:
+            if detenido:
+                break
             page_name = page_info['name']
             page_url = page_info['url']
             page_max = page_info['max_courses']
             
             print(f"\n🌐 Navegando a {page_name}: {page_url}")
             print(f"🎯 Objetivo: {page_max} cursos de {page_name}")
+            if estado:
+                estado.nueva_pagina()
             
             try:
                 # Navegar a la página
-                driver.get(page_url)
-                time.sleep(3)
+                navegar(driver, page_url)
                 
                 # Buscar enlaces de cursos en esta página
                 course_links = []
                 
+                # Recolectar todos los enlaces en una sola llamada al navegador
+                enlaces = recolectar_enlaces(driver)
+                
                 # Estrategia 1: Buscar enlaces directos de Udemy
                 print("   🔍 Buscando enlaces directos de Udemy...")
-                links = driver.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    try:
-                        href = link.get_attribute("href")
-                        if href and "udemy.com/course/" in href and href not in processed_urls:
-                            course_links.append(href)
-                            processed_urls.add(href)
-                    except:
-                        continue
+                for enlace in enlaces:
+                    href = enlace['href']
+                    if "udemy.com/course/" in href and href not in processed_urls:
+                        course_links.append(href)
+                        processed_urls.add(href)
                 
                 print(f"   ✅ Encontrados {len(course_links)} enlaces directos de Udemy")
                 
                 # Estrategia 2: Buscar enlaces de CursosDev que redirijan a Udemy
                 print("   🔍 Buscando enlaces de CursosDev...")
-                try:
-                    dev_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'cursosdev')]")
-                    for link in dev_links:
-                        try:
-                            href = link.get_attribute("href")
-                            if href and href not in processed_urls:
-                                course_links.append(href)
-                                processed_urls.add(href)
-                        except:
-                            continue
-                    print(f"   ✅ Encontrados {len(dev_links)} enlaces de CursosDev")
-                except:
-                    pass
+                dev_links = [enlace['href'] for enlace in enlaces if 'cursosdev' in enlace['href']]
+                for href in dev_links:
+                    if href not in processed_urls:
+                        course_links.append(href)
+                        processed_urls.add(href)
+                print(f"   ✅ Encontrados {len(dev_links)} enlaces de CursosDev")
                 
                 # Estrategia 3: Buscar en el texto de la página
                 print("   🔍 Extrayendo URLs del texto...")
@@ -773,12 +321,21 @@ def extract_courses_from_cursosdev(driver, max_courses=10):
                             
                         try:
                             print(f"      📚 Procesando enlace {i+1}/{max_links_to_process}: {url[:50]}...")
+                            contar("courses_processed")
+                            source_url = url
+                            
+                            # Modo incremental: enlace del listado ya publicado en la ejecución anterior
+                            if estado and estado.curso_de_origen(source_url):
+                                print("         📂 Enlace ya publicado anteriormente, saltando...")
+                                if estado.debe_parar(True):
+                                    print(f"   ⏹️ Cursos ya conocidos seguidos, se deja de recorrer {page_name}")
+                                    break
+                                continue
                             
                             # Si es un enlace de CursosDev, navegar primero para obtener el enlace de Udemy
                             if "cursosdev.com" in url and "udemy.com" not in url:
                                 print("         🔄 Navegando a enlace de CursosDev...")
-                                driver.get(url)
-                                time.sleep(2)
+                                navegar(driver, url)
                                 
                                 # Buscar enlaces de Udemy en esta página
                                 udemy_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'udemy.com/course/')]")
@@ -789,33 +346,62 @@ def extract_courses_from_cursosdev(driver, max_courses=10):
                                     print("         ❌ No se encontró enlace de Udemy en esta página")
                                     continue
                             
-                            # Extraer ID del curso
+                            # Extraer ID del curso (sin parámetros de rastreo ni envoltorios de afiliados)
+                            url = url_canonica(url)
                             course_id = extract_course_id(url)
                             if not course_id:
                                 print("         ❌ No se pudo extraer ID del curso")
                                 continue
                             
-                            print(f"         🆔 ID del curso: {course_id}")
-                            
-                            # Verificar que el curso sea gratis y tomar captura durante la verificación
-                            is_free, screenshot_path = verify_course_is_free_and_screenshot(driver, url, course_id)
-                            if not is_free:
-                                print("         ❌ Curso no es gratis, saltando...")
+                            # El mismo curso puede aparecer con otra URL (slug o ID numérico)
+                            if course_id in processed_ids:
+                                print(f"         ⚠️ Curso duplicado ignorado: {course_id}")
                                 continue
+                            processed_ids.add(course_id)
                             
-                            if not screenshot_path:
-                                print("         ⚠️ No se pudo tomar captura, continuando...")
-                            
-                            # Extraer título del curso
-                            try:
-                                title_element = driver.find_element(By.CSS_SELECTOR, "h1")
-                                title = title_element.text.strip()
-                            except:
-                                title = f"Curso {course_id}"
+                            print(f"         🆔 ID del curso: {course_id}")
                             
                             # Extraer código de cupón
                             coupon_code = extract_coupon_from_url(url)
                             
+                            # Modo incremental: solo se verifican los pares curso/cupón nuevos
+                            if estado:
+                                conocido = estado.es_conocido(course_id, coupon_code)
+                                if estado.debe_parar(conocido):
+                                    print(f"   ⏹️ Cursos ya conocidos seguidos, se deja de recorrer {page_name}")
+                                    break
+                                if conocido:
+                                    print("         📂 Curso y cupón ya publicados anteriormente, saltando...")
+                                    continue
+                            
+                            # Verificar con la cascada (caché, URL, API de precios, página)
+                            if not verificar_en_cascada(driver, url, course_id, coupon_code, escaner_precios):
+                                print("         ❌ Curso no es gratis, saltando...")
+                                continue
+                            
+                            # La captura solo se toma si no hay una reciente en la caché
+                            en_cache = cache.consultar(course_id, coupon_code) if cache else None
+                            detalles = en_cache[1] if en_cache else {}
+                            screenshot_path = detalles.get('screenshot_path')
+                            if screenshot_path and os.path.exists(screenshot_path):
+                                print("         💾 Curso verificado recientemente como gratis, se reutiliza la captura")
+                                title = detalles.get('title') or f"Curso {course_id}"
+                            else:
+                                screenshot_path = take_free_course_screenshot(driver, url, course_id)
+                                if not screenshot_path:
+                                    print("         ⚠️ No se pudo tomar captura, continuando...")
+                                
+                                # Extraer título del curso
+                                try:
+                                    title_element = driver.find_element(By.CSS_SELECTOR, "h1")
+                                    title = title_element.text.strip()
+                                except:
+                                    title = f"Curso {course_id}"
+                                
+                                if cache:
+                                    cache.guardar(course_id, coupon_code, True,
+                                                  {'title': title, 'screenshot_path': screenshot_path})
+                            
                             # Crear objeto del curso
                             course = {
                                 'title': title,
@@ -824,19 +410,22 @@ def extract_courses_from_cursosdev(driver, max_courses=10):
                                 'coupon_code': coupon_code,
                                 'screenshot_path': screenshot_path,
                                 'extracted_at': datetime.now().isoformat(),
-                                'source_page': page_name
+                                'source_page': page_name,
+                                'source_url': source_url
                             }
                             
                             courses.append(course)
+                            contar("courses_found")
                             page_courses += 1
                             print(f"         ✅ Curso agregado: {title}")
                             print(f"         🎫 Cupón: {coupon_code}")
                             if screenshot_path:
                                 print(f"         📸 Captura: {screenshot_path}")
                             print(f"         📊 Cursos de {page_name}: {page_courses}/{page_max}")
-                            
-                            # Delay entre requests
-                            time.sleep(1)
+                            if entregar is not None and not entregar(course):
+                                print("   ⏹️ La publicación ya no acepta cursos, se deja de extraer")
+                                detenido = True
+                                break
                             
                         except Exception as e:
                             print(f"         ❌ Error procesando enlace: {str(e)}")
@@ -869,6 +458,7 @@ def extract_courses_from_cursosdev(driver, max_courses=10):
         print(f"❌ Error en extracción: {str(e)}")
         return courses
 
+@medido("html")
 def create_html_page(courses):
     """Crear página HTML moderna y responsive"""
     print("🌐 Creando página web...")
@@ -1186,66 +776,114 @@ def create_html_page(courses):
     
     return html_content
 
-def publish_to_github(courses):
-    """Publicar en GitHub Pages"""
-    print("🚀 Publicando en GitHub Pages...")
+def guardar_sitio(courses):
+    """Generar docs/index.html y courses.json con los cursos"""
+    # Crear directorio docs si no existe
+    os.makedirs("docs", exist_ok=True)
+    
+    # Crear página HTML
+    html_content = create_html_page(courses)
     
+    # Guardar archivo HTML
+    with open("docs/index.html", "w", encoding="utf-8") as f:
+        f.write(html_content)
+    
+    print("✅ Página HTML creada: docs/index.html")
+    
+    guardar_json_cursos(courses)
+
+def guardar_json_cursos(courses):
+    """Guardar los datos de los cursos en courses.json"""
+    courses_data = {
+        'courses': courses,
+        'total_courses': len(courses),
+        'last_updated': datetime.now().isoformat(),
+        'source': 'CursosDev.com'
+    }
+    
+    with open("courses.json", "w", encoding="utf-8") as f:
+        json.dump(courses_data, f, indent=2, ensure_ascii=False)
+    
+    print("✅ Datos guardados: courses.json")
+
+@medido("git")
+def subir_a_github(total_cursos):
+    """Hacer commit y push del sitio generado"""
     try:
-        # Crear directorio docs si no existe
-        os.makedirs("docs", exist_ok=True)
+        import subprocess
         
-        # Crear página HTML
-        html_content = create_html_page(courses)
+        # Agregar archivos
+        subprocess.run(["git", "add", "."], check=True)
+        print("✅ Archivos agregados al staging")
         
-        # Guardar archivo HTML
-        with open("docs/index.html", "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # Hacer commit
+        commit_message = f"Actualización automática: {total_cursos} cursos gratuitos - {datetime.now().strftime('%d/%m/%Y %H:%M')}"
+        subprocess.run(["git", "commit", "-m", commit_message], check=True)
+        print("✅ Commit realizado")
         
-        print("✅ Página HTML creada: docs/index.html")
+        # Push a GitHub
+        subprocess.run(["git", "push"], check=True)
+        print("✅ Cambios subidos a GitHub")
         
-        # Guardar datos de cursos en JSON
-        courses_data = {
-            'courses': courses,
-            'total_courses': len(courses),
-            'last_updated': datetime.now().isoformat(),
-            'source': 'CursosDev.com'
-        }
-        
-        with open("courses.json", "w", encoding="utf-8") as f:
-            json.dump(courses_data, f, indent=2, ensure_ascii=False)
-        
-        print("✅ Datos guardados: courses.json")
-        
-        # Hacer commit y push a GitHub
-        try:
-            import subprocess
-            
-            # Agregar archivos
-            subprocess.run(["git", "add", "."], check=True)
-            print("✅ Archivos agregados al staging")
-            
-            # Hacer commit
-            commit_message = f"Actualización automática: {len(courses)} cursos gratuitos - {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-            subprocess.run(["git", "commit", "-m", commit_message], check=True)
-            print("✅ Commit realizado")
-            
-            # Push a GitHub
-            subprocess.run(["git", "push"], check=True)
-            print("✅ Cambios subidos a GitHub")
-            
-            print("🎉 ¡Publicación completada!")
-            print("🌐 La página estará disponible en GitHub Pages en unos minutos")
-            
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️ Error en Git: {str(e)}")
-            print("💡 Verifica que el repositorio esté configurado correctamente")
+        print("🎉 ¡Publicación completada!")
+        print("🌐 La página estará disponible en GitHub Pages en unos minutos")
         
+    except subprocess.CalledProcessError as e:
+        print(f"⚠️ Error en Git: {str(e)}")
+        print("💡 Verifica que el repositorio esté configurado correctamente")
+
+def publish_to_github(courses):
+    """Publicar en GitHub Pages"""
+    print("🚀 Publicando en GitHub Pages...")
+    
+    try:
+        guardar_sitio(courses)
+        subir_a_github(len(courses))
         return True
         
     except Exception as e:
         print(f"❌ Error al publicar: {str(e)}")
         return False
 
+def publicar_a_medida(cursos, estado=None):
+    """Publicar los cursos a medida que llegan del pipeline y devolver los nuevos
+
+    El sitio local se regenera con cada curso; la subida a GitHub se agrupa cada
+    publish_batch cursos o publish_interval segundos, y se repite al terminar.
+    """
+    config = get_config('pipeline')
+    lote = config.get('publish_batch', 5)
+    intervalo = config.get('publish_interval', 120)
+    
+    nuevos = []
+    publicados = []
+    pendientes = 0
+    ultima_subida = time.monotonic()
+    for curso in cursos:
+        nuevos.append(curso)
+        pendientes += 1
+        try:
+            # Modo incremental: conservar los cursos anteriores que siguen vigentes
+            publicados = estado.fusionar(nuevos) if estado else list(nuevos)
+            guardar_sitio(publicados)
+            if pendientes >= lote or time.monotonic() - ultima_subida >= intervalo:
+                print(f"🚀 Publicando {pendientes} cursos nuevos en GitHub Pages...")
+                subir_a_github(len(publicados))
+                pendientes = 0
+                ultima_subida = time.monotonic()
+        except Exception as e:
+            print(f"❌ Error al publicar: {str(e)}")
+    
+    if pendientes:
+        print(f"🚀 Publicando los últimos {pendientes} cursos en GitHub Pages...")
+        try:
+            subir_a_github(len(publicados))
+        except Exception as e:
+            print(f"❌ Error al publicar: {str(e)}")
+    return nuevos
+
+@perfilado("bot_mejorado_simple")
+@ejecucion_medida("bot_mejorado_simple")
 def main():
     """Función principal"""
     print("🤖 BOT MEJORADO - CURSOS GRATUITOS DE UDEMY")
@@ -1258,39 +896,36 @@ def main():
         return
     
     try:
-        # Extraer cursos (solo cursos reales verificados)
-        courses = extract_courses_from_cursosdev(driver, max_courses=20)  # Buscar más para encontrar suficientes reales
+        # Modo incremental: cursos de la ejecución anterior
+        estado = obtener_estado_incremental()
+        
+        # Extraer cursos (solo cursos reales verificados) y publicarlos a medida
+        # que se verifican, sin esperar a que termine la extracción
+        _, courses = Pipeline().ejecutar(
+            lambda entregar: extract_courses_from_cursosdev(driver, max_courses=20, estado=estado, entregar=entregar),  # Buscar más para encontrar suficientes reales
+            lambda cursos: publicar_a_medida(cursos, estado)
+        )
         
         if not courses:
-            print("❌ No se encontraron cursos gratuitos")
+            print("❌ No se encontraron cursos gratuitos nuevos")
             return
         
         print(f"\n📊 Resumen:")
-        print(f"   ✅ Cursos encontrados: {len(courses)}")
+        print(f"   ✅ Cursos nuevos publicados: {len(courses)}")
         print(f"   📸 Capturas tomadas: {len([c for c in courses if c['screenshot_path']])}")
         print(f"   🎯 Cursos reales verificados: {len(courses)}")
-        
-        # Solo publicar si hay al menos 1 curso real
-        if len(courses) >= 1:
-            # Publicar en GitHub
-            if publish_to_github(courses):
-                print("\n🎉 ¡Proceso completado exitosamente!")
-                print("🌐 Visita tu página en GitHub Pages para ver los resultados")
-            else:
-                print("\n⚠️ Hubo problemas al publicar, pero los cursos se extrajeron correctamente")
-        else:
-            print("\n⚠️ No se encontraron suficientes cursos reales para publicar")
+        if estado:
+            print(f"   📂 Cursos de la ejecución anterior conservados: {len(estado.fusionar(courses)) - len(courses)}")
+        print("\n🎉 ¡Proceso completado exitosamente!")
+        print("🌐 Visita tu página en GitHub Pages para ver los resultados")
     
     except Exception as e:
         print(f"❌ Error en el proceso: {str(e)}")
     
     finally:
-        # Cerrar driver
-        try:
-            driver.quit()
-            print("🔒 Chrome Driver cerrado")
-        except:
-            pass
+        obtener_cascada().imprimir_resumen()
+        # Devolver el driver al gestor de sesiones
+        liberar_driver(driver, "scraping")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
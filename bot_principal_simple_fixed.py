@@ -3,20 +3,30 @@
 Bot simplificado para extraer cursos con cupones de Coupon Scorpion y enviarlos por WhatsApp
 """
 import os
-import time
 import re
 from datetime import datetime
+from itertools import islice
 from send_cursos_sin_emojis import enviar_cursos_sin_emojis
 from selenium.webdriver.common.by import By
+from browser_pool import PoolNavegadores
+from course_identity import identidad_curso, url_canonica
+from cursosdev_crawler import RastreadorCursosDev
+from incremental_state import obtener_estado_incremental
+from page_waits import clic_y_esperar, navegar
+from pipeline import Pipeline
+from redirect_resolver import resolver_redireccion
+from dev_profiling import perfilado
+from run_metrics import contar, ejecucion_medida, tramo
+from session_manager import crear_driver, liberar_driver, obtener_driver
+from source_adapters import AdaptadorFuente, ejecutar_fuentes, fuentes_habilitadas, registrar_fuente
+from price_scanner import escaner_precios
+from verification_cascade import obtener_cascada, verificar_en_cascada
+from config_bot_mejorado import get_config
 
 def extract_course_id(url):
-    """Extraer el ID único del curso de Udemy"""
+    """Extraer el ID único del curso de Udemy (su slug, aunque la URL traiga el ID numérico)"""
     try:
-        # Buscar el patrón /course/nombre-del-curso/ o /course/ID/
-        match = re.search(r'/course/([^/?]+)', url)
-        if match:
-            return match.group(1)
-        return url
+        return identidad_curso(url) or url
     except:
         return url
 
@@ -70,1543 +80,438 @@ def extract_coupon_code_from_url(url):
         return None
 
 def verify_course_is_free(driver, udemy_url):
-    """Verificar si el curso es 100% gratis navegando a la página de Udemy"""
+    """Verificar si el curso es 100% gratis con la cascada de verificación
+
+    Caché, URL, API de precios por HTTP, elemento de precio y escaneo completo de
+    la página, en ese orden: el primer nivel con un resultado definitivo decide.
+    """
+    return verificar_en_cascada(
+        driver,
+        udemy_url,
+        extract_course_id(udemy_url),
+        extract_coupon_code_from_url(udemy_url),
+        escaner_precios,
+    )
+
+COUPONSCORPION_LISTADO_URL = "https://couponscorpion-com.translate.goog/category/100-off-coupons/?_x_tr_sl=en&_x_tr_tl=es&_x_tr_hl=es&_x_tr_pto=tc"
+
+COUPONSCORPION_COUPON_BUTTON_SELECTORS = [
+    "//button[contains(text(), 'OBTENER CÓDIGO DE CUPÓN')]",
+    "//button[contains(text(), 'GET COUPON CODE')]",
+    "//a[contains(text(), 'OBTENER CÓDIGO DE CUPÓN')]",
+    "//a[contains(text(), 'GET COUPON CODE')]",
+    "//button[contains(text(), 'cupón') or contains(text(), 'coupon')]",
+    "//a[contains(text(), 'cupón') or contains(text(), 'coupon')]",
+    "//*[contains(text(), 'OBTENER') and contains(text(), 'CUPÓN')]",
+    "//*[contains(text(), 'GET') and contains(text(), 'COUPON')]"
+]
+
+ENROLL_BUTTON_SELECTORS = [
+    "//button[contains(text(), 'INSCRIBIRSE')]",
+    "//button[contains(text(), 'ENROLL')]",
+    "//a[contains(text(), 'INSCRIBIRSE')]",
+    "//a[contains(text(), 'ENROLL')]",
+    "//*[contains(text(), 'INSCRIBIRSE')]",
+    "//*[contains(text(), 'ENROLL')]",
+    "//button[contains(text(), 'inscribirse')]",
+    "//button[contains(text(), 'enroll')]",
+    "//a[contains(text(), 'inscribirse')]",
+    "//a[contains(text(), 'enroll')]"
+]
+
+def buscar_primero(driver, selectores, descripcion):
+    """Devolver el primer elemento que encuentre alguno de los selectores XPath, o None"""
+    for selector in selectores:
+        try:
+            elementos = driver.find_elements(By.XPATH, selector)
+            if elementos:
+                print(f"✅ {descripcion} encontrado con selector: {selector}")
+                return elementos[0]
+        except Exception as e:
+            continue
+    return None
+
+def resolver_enlace_couponscorpion(driver, link_url):
+    """Navegar a un post de Coupon Scorpion y obtener (udemy_url, coupon_code) o (None, None)"""
     try:
-        print(f"🔍 Verificando si el curso es gratis: {udemy_url}")
-        
-        # Navegar a la página del curso
-        driver.get(udemy_url)
-        time.sleep(3)
-        
-        # Obtener el texto de la página
-        page_text = driver.page_source.lower()
-        
-        # Buscar indicadores específicos de precio (más precisos)
-        price_patterns = [
-            r'\$\d+\.?\d*',  # $19.99, $20, etc.
-            r'€\d+\.?\d*',   # €19.99, €20, etc.
-            r'£\d+\.?\d*',   # £19.99, £20, etc.
-            r'\d+\.?\d*\s*\$',  # 19.99 $, 20 $, etc.
-            r'\d+\.?\d*\s*€',   # 19.99 €, 20 €, etc.
-            r'\d+\.?\d*\s*£',   # 19.99 £, 20 £, etc.
-            r'precio.*?\$\d+',  # precio $19
-            r'price.*?\$\d+',   # price $19
-            r'costo.*?\$\d+',   # costo $19
-            r'cost.*?\$\d+'     # cost $19
-        ]
-        
-        # Verificar si hay precios específicos (no $0)
-        has_price = False
-        for pattern in price_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            for match in matches:
-                # Extraer solo el número del precio
-                price_number = re.search(r'\d+\.?\d*', match)
-                if price_number:
-                    price_value = float(price_number.group())
-                    if price_value > 0:  # Si el precio es mayor a 0
-                        has_price = True
-                        print(f"❌ Precio detectado: {match} (valor: {price_value})")
-                        break
-            if has_price:
-                break
-        
-        # Buscar indicadores específicos de gratis (más amplios)
-        free_indicators = [
-            "100% gratis",
-            "100% free", 
-            "gratis",
-            "free",
-            "$0",
-            "0.00",
-            "0,00",
-            "gratuito",
-            "sin costo",
-            "no cost",
-            "completamente gratis",
-            "completely free",
-            "inscribirse gratis",
-            "enroll for free",
-            "inscribirse sin costo",
-            "enroll at no cost",
-            "inscribirse ahora",
-            "enroll now",
-            "add to cart",
-            "agregar al carrito",
-            "free enrollment",
-            "inscripción gratuita",
-            "curso gratuito",
-            "free course",
-            "sin pagar",
-            "no payment",
-            "gratis para siempre",
-            "free forever"
-        ]
-        
-        # Verificar si hay indicadores de gratis
-        is_free = False
-        for indicator in free_indicators:
-            if indicator.lower() in page_text:
-                is_free = True
-                print(f"✅ Indicador de gratis encontrado: {indicator}")
-                break
-        
-        # Buscar botones específicos de inscripción gratuita (más selectores)
-        free_button_selectors = [
-            "//button[contains(text(), 'Inscribirse gratis')]",
-            "//button[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Inscribirse sin costo')]",
-            "//button[contains(text(), 'Enroll at no cost')]",
-            "//button[contains(text(), 'Inscribirse ahora')]",
-            "//button[contains(text(), 'Enroll now')]",
-            "//a[contains(text(), 'Inscribirse gratis')]",
-            "//a[contains(text(), 'Enroll for free')]",
-            "//button[contains(text(), 'Free')]",
-            "//button[contains(text(), 'Gratis')]",
-            "//a[contains(text(), 'Free')]",
-            "//a[contains(text(), 'Gratis')]",
-            "//span[contains(text(), 'Free')]",
-            "//span[contains(text(), 'Gratis')]"
-        ]
-        
-        for selector in free_button_selectors:
-            try:
-                buttons = driver.find_elements(By.XPATH, selector)
-                if buttons:
-                    print(f"✅ Botón de inscripción gratuita encontrado: {selector}")
-                    is_free = True
-                    break
-            except:
-                continue
-        
-        # Buscar elementos con precio $0 o 0€
-        zero_price_selectors = [
-            "//span[contains(text(), '$0')]",
-            "//span[contains(text(), '0€')]",
-            "//span[contains(text(), '0.00')]",
-            "//div[contains(text(), '$0')]",
-            "//div[contains(text(), '0€')]",
-            "//div[contains(text(), '0.00')]"
-        ]
-        
-        for selector in zero_price_selectors:
-            try:
-                elements = driver.find_elements(By.XPATH, selector)
-                if elements:
-                    print(f"✅ Precio $0 encontrado: {selector}")
-                    is_free = True
-                    break
-            except:
-                continue
-        
-        # Lógica de decisión mejorada
-        if has_price and not is_free:
-            print("❌ El curso tiene precio, no es gratis")
-            return False
-        elif is_free:
-            print("✅ El curso es 100% gratis")
-            return True
+        navegar(driver, link_url)
+    except Exception as e:
+        print(f"⚠️ Error navegando a la página: {e}")
+        return None, None
+    
+    # Buscar el botón "OBTENER CÓDIGO DE CUPÓN" o "GET COUPON CODE"
+    print("🔍 Buscando botón de obtener cupón...")
+    coupon_button = buscar_primero(driver, COUPONSCORPION_COUPON_BUTTON_SELECTORS, "Botón")
+    if not coupon_button:
+        print("⚠️ No se encontró el botón de obtener cupón")
+        return None, None
+    
+    button_href = coupon_button.get_attribute("href")
+    print(f"🔗 Href del botón: {button_href}")
+    try:
+        if button_href and ("out.php" in button_href or "redirect" in button_href):
+            print("🔍 Encontrado enlace de redirección, siguiéndolo...")
+            # Primero sin navegador; si no se resuelve, abrir la redirección
+            current_url = resolver_redireccion(button_href)
+            if not current_url:
+                navegar(driver, button_href)
+                current_url = driver.current_url
+            print(f"🔍 URL después de la redirección: {current_url}")
         else:
-            # Verificación adicional: buscar si hay botones de compra
-            buy_button_selectors = [
-                "//button[contains(text(), 'Buy')]",
-                "//button[contains(text(), 'Comprar')]",
-                "//button[contains(text(), 'Purchase')]",
-                "//button[contains(text(), 'Add to cart')]",
-                "//button[contains(text(), 'Agregar al carrito')]",
-                "//button[contains(text(), 'Buy now')]",
-                "//button[contains(text(), 'Comprar ahora')]"
-            ]
-            
-            has_buy_button = False
-            for selector in buy_button_selectors:
-                try:
-                    buttons = driver.find_elements(By.XPATH, selector)
-                    if buttons:
-                        print(f"❌ Botón de compra encontrado: {selector}")
-                        has_buy_button = True
-                        break
-                except:
-                    continue
-            
-            if has_buy_button:
-                return False
-            
-            # Si no encontramos indicadores claros, ser más permisivo
-            print("⚠️ No se encontraron indicadores claros, verificando cupón...")
-            
-            # Verificar si el cupón hace el curso gratis
-            if 'couponcode=' in udemy_url.lower():
-                print("✅ Cupón detectado en URL, asumiendo que puede hacer el curso gratis")
-                return True
-            
-            print("❌ No se encontraron indicadores claros de que sea gratis")
-            return False
-        
+            # Si el botón no tiene href, hacer clic directamente en él
+            print("🖱️ El botón no tiene href, haciendo clic directamente...")
+            clic_y_esperar(driver, coupon_button)
+            current_url = driver.current_url
+            print(f"🔍 URL después de hacer clic en el botón: {current_url}")
     except Exception as e:
-        print(f"⚠️ Error verificando si el curso es gratis: {e}")
-        return False
+        print(f"⚠️ Error siguiendo el botón de cupón: {e}")
+        return None, None
+    
+    if "udemy.com/course/" in current_url:
+        print("✅ ¡Enlace de Udemy encontrado!")
+        return normalizar_enlace_udemy(current_url)
+    
+    # Si no es Udemy, buscar botón "INSCRIBIRSE" o "ENROLL" para obtener el enlace final
+    print("🔍 Buscando botón INSCRIBIRSE/ENROLL para obtener el enlace final...")
+    enroll_button = buscar_primero(driver, ENROLL_BUTTON_SELECTORS, "Botón INSCRIBIRSE")
+    if not enroll_button:
+        print("⚠️ No se encontró botón INSCRIBIRSE")
+        return None, None
+    
+    try:
+        print("🖱️ Haciendo clic en botón INSCRIBIRSE para obtener el enlace final...")
+        clic_y_esperar(driver, enroll_button)
+    except Exception as e:
+        print(f"⚠️ Error haciendo clic en INSCRIBIRSE: {e}")
+        return None, None
+    
+    current_url = driver.current_url
+    print(f"🔍 URL después de hacer clic en INSCRIBIRSE: {current_url}")
+    if "udemy.com/course/" in current_url:
+        print("✅ ¡Enlace de Udemy encontrado después de hacer clic en INSCRIBIRSE!")
+        return normalizar_enlace_udemy(current_url)
+    
+    print("⚠️ No se llegó a Udemy después de hacer clic en INSCRIBIRSE")
+    return None, None
+
+CURSOSDEV_COUPON_BUTTON_SELECTORS = [
+    "//button[contains(text(), 'OBTENER CUPÓN')]",
+    "//button[contains(text(), 'GET COUPON')]",
+    "//a[contains(text(), 'OBTENER CUPÓN')]",
+    "//a[contains(text(), 'GET COUPON')]",
+    "//button[contains(text(), 'cupón') or contains(text(), 'coupon')]",
+    "//a[contains(text(), 'cupón') or contains(text(), 'coupon')]",
+    "//*[contains(text(), 'OBTENER') and contains(text(), 'CUPÓN')]",
+    "//*[contains(text(), 'GET') and contains(text(), 'COUPON')]",
+    # Agregar selectores para el formato con emoji
+    "//a[contains(text(), '🎟️ Obtener Cupón')]",
+    "//a[contains(text(), 'Obtener Cupón')]",
+    "//*[contains(text(), 'Obtener Cupón')]",
+    "//*[contains(text(), 'obtener cupón')]",
+    "//*[contains(text(), 'cupón')]"
+]
 
-def extraer_cursos_de_coupon_scorpion(driver):
-    """Extraer cursos directamente de Coupon Scorpion"""
-    print("🔍 Extrayendo cursos de Coupon Scorpion...")
+def normalizar_enlace_udemy(url):
+    """Convertir un enlace de Udemy (incluido checkout) en (udemy_url, coupon_code)"""
+    udemy_url = url
+    original_url = url
     
-    udemy_links = []
-    processed_courses = set()
+    # Verificar si es un enlace de checkout y convertirlo
+    if "/payment/checkout/" in udemy_url:
+        print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
+        udemy_url = convert_checkout_to_course_url(udemy_url)
+        print(f"🔗 Enlace original: {original_url}")
+        print(f"🔗 Enlace convertido: {udemy_url}")
     
+    # Extraer código de cupón
+    coupon_code = extract_coupon_code_from_url(original_url)
+    if not coupon_code:
+        coupon_code = extract_coupon_code_from_url(udemy_url)
+    
+    # Quitar parámetros de rastreo y envoltorios de afiliados
+    return url_canonica(udemy_url), coupon_code
+
+def resolver_enlace_cursosdev(driver, link_url):
+    """Navegar a un enlace de CursosDev y obtener (udemy_url, coupon_code) o (None, None)"""
+    # Navegar directamente a la página del curso
     try:
-        # Navegar a la página específica de 100% Off Coupons
-        print("🌐 Navegando a la página de 100% Off Coupons...")
-        driver.set_page_load_timeout(30)
-        driver.get("https://couponscorpion-com.translate.goog/category/100-off-coupons/?_x_tr_sl=en&_x_tr_tl=es&_x_tr_hl=es&_x_tr_pto=tc")
-        time.sleep(3)
-        
-        # Verificar que la página cargó correctamente
-        if "100-off-coupons" not in driver.current_url.lower():
-            print("❌ Error: No se pudo cargar la página de 100% Off Coupons")
-            return udemy_links
+        navegar(driver, link_url)
+    except Exception as e:
+        print(f"⚠️ Error navegando a la página: {e}")
+        return None, None
+    
+    # Verificar si ya estamos en Udemy
+    current_url = driver.current_url
+    print(f"🔍 URL actual: {current_url}")
+    
+    if "udemy.com/course/" in current_url:
+        print("✅ ¡Ya estamos en Udemy!")
+        return normalizar_enlace_udemy(current_url)
+    
+    # Buscar botón "OBTENER CUPÓN" o similar en CursosDev
+    print("🔍 Buscando botón de obtener cupón en CursosDev...")
+    coupon_button = buscar_primero(driver, CURSOSDEV_COUPON_BUTTON_SELECTORS, "Botón")
+    
+    if not coupon_button:
+        print("⚠️ No se encontró el botón de obtener cupón en CursosDev")
+        return None, None
+    
+    # Obtener el href del botón antes de hacer clic
+    button_href = coupon_button.get_attribute("href")
+    print(f"🔗 Href del botón: {button_href}")
+    
+    # Resolver el enlace del botón sin navegador (linksynergy, proxies y redirecciones HTTP)
+    final_url = resolver_redireccion(button_href)
+    if final_url:
+        print(f"🔗 URL final resuelta: {final_url}")
+        print("✅ ¡Enlace de Udemy obtenido sin abrir la página!")
+        return normalizar_enlace_udemy(final_url)
+    
+    # Hacer clic en el botón normalmente
+    print("🖱️ Haciendo clic en botón de cupón...")
+    try:
+        clic_y_esperar(driver, coupon_button)
         
-        print("✅ Página cargada correctamente")
+        # Verificar si se redirigió a Udemy
+        current_url = driver.current_url
+        print(f"🔍 URL después de hacer clic: {current_url}")
         
-        # Hacer scroll para cargar más cursos
-        print("📜 Haciendo scroll para cargar cursos...")
-        for scroll in range(3):  # Reducir a 3 scrolls
-            try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                print(f"Scroll {scroll+1}/3 completado")
-            except Exception as e:
-                print(f"⚠️ Error en scroll {scroll+1}: {e}")
-                break
+        if "udemy.com/course/" in current_url:
+            print("✅ ¡Enlace de Udemy encontrado!")
+            return normalizar_enlace_udemy(current_url)
         
-        # Buscar enlaces de cursos en la página principal
-        print("🔍 Buscando enlaces de cursos en la página...")
+        print("⚠️ No se llegó a Udemy después de hacer clic en el botón")
+    except Exception as e:
+        print(f"⚠️ Error haciendo clic en el botón: {e}")
+    return None, None
+
+def registrar_curso_si_es_gratis(driver, udemy_url, coupon_code, indice, etiqueta):
+    """Verificar un curso con cupón y devolver su entrada si es gratis y no está duplicado"""
+    # Procesar el curso solo si tenemos cupón y URL de Udemy
+    if not (coupon_code and udemy_url):
+        print("❌ No se encontró código de cupón o URL de Udemy válida")
+        return None
+    
+    print(f"🎫 Código de cupón encontrado: {coupon_code}")
+    
+    # Extraer ID del curso para evitar duplicados
+    course_id = extract_course_id(udemy_url)
+    if not indice.reservar(course_id):
+        print(f"⚠️ Curso duplicado ignorado: {course_id}")
+        return None
+    
+    # Verificar si el curso es realmente gratis
+    print("🔍 Verificando si el curso es 100% gratis...")
+    if not verify_course_is_free(driver, udemy_url):
+        indice.liberar(course_id)
+        print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
+        return None
+    
+    # La ficha puede haber revelado el slug de un ID numérico: deduplicar también por él
+    clave_final = extract_course_id(udemy_url)
+    if clave_final != course_id:
+        indice.liberar(course_id)
+        if not indice.reservar(clave_final):
+            print(f"⚠️ Curso duplicado ignorado: {course_id} = {clave_final}")
+            return None
+        course_id = clave_final
+    
+    if not indice.confirmar(course_id):
+        print(f"⚠️ Límite de {indice.max_cursos} cursos alcanzado, descartando: {course_id}")
+        return None
+    
+    # Construir URL completa con cupón
+    if "couponCode=" in udemy_url:
+        full_url = udemy_url
+    else:
+        full_url = f"{udemy_url}?couponCode={coupon_code}"
+    
+    contar("courses_found")
+    print(f"✅ Curso GRATIS agregado: {extract_course_name(udemy_url)}")
+    print(f"🎫 Código del cupón: {coupon_code}")
+    print(f"🔗 URL completa: {full_url}")
+    print(f"📊 Cursos válidos encontrados: {indice.validos}/{indice.max_cursos}")
+    
+    return {
+        'text': f"{etiqueta}: {extract_course_name(udemy_url)}",
+        'urls': [full_url],
+        'index': None,
+        'screenshot': None
+    }
+
+def procesar_candidato(driver, adaptador, link_url, indice, entregar=None):
+    """Resolver un enlace candidato de una fuente y registrarlo si es un curso gratis
+
+    Si se pasa entregar(curso), cada curso válido se entrega en cuanto se verifica;
+    cuando entregar devuelve False se detiene la búsqueda en el índice (y en las demás fuentes).
+    """
+    print(f"📄 URL del enlace: {link_url}")
+    contar("courses_processed")
+    udemy_url, coupon_code = adaptador.resolver(driver, link_url)
+    if not udemy_url:
+        return None
+    curso = registrar_curso_si_es_gratis(driver, udemy_url, coupon_code, indice, adaptador.etiqueta)
+    if curso:
+        curso['fuente'] = adaptador.fuente
+        if entregar is not None and not entregar(curso):
+            print("⏹️ El envío ya no acepta cursos, se deja de extraer")
+            indice.detener()
+    return curso
+
+def procesar_candidatos(driver, adaptador, course_urls, indice, pool=None, entregar=None):
+    """Procesar los enlaces candidatos de una fuente hasta alcanzar el límite del índice
+
+    Los enlaces ya están extraídos, así que no hace falta volver al listado entre uno y otro.
+    Con un pool de navegadores se reparten entre sus workers.
+    """
+    if pool is not None:
+        return pool.procesar(
+            course_urls,
+            lambda worker_driver, url: procesar_candidato(worker_driver, adaptador, url, indice, entregar),
+            indice
+        )
+    
+    cursos = []
+    for i, link_url in enumerate(course_urls):
+        # Limitar a procesar máximo max_cursos válidos - verificar ANTES de procesar
+        if indice.limite_alcanzado():
+            if not indice.detenido():
+                print(f"✅ Ya se encontraron {indice.max_cursos} cursos válidos, deteniendo búsqueda")
+            break
         
         try:
-            # Buscar enlaces en títulos
-            course_links = driver.find_elements(By.XPATH, "//h2//a")
-            if not course_links:
-                course_links = driver.find_elements(By.XPATH, "//h3//a")
-            
-            # Eliminar duplicados y guardar URLs
-            unique_urls = []
-            seen_urls = set()
-            for link in course_links:
-                try:
-                    href = link.get_attribute("href")
-                    if href and href not in seen_urls and "couponscorpion" in href:
-                        seen_urls.add(href)
-                        unique_urls.append(href)
-                except:
-                    continue
-            
-            course_urls = unique_urls
-            print(f"🔍 Encontrados {len(course_urls)} enlaces únicos de cursos...")
-            
-            # Mostrar algunos enlaces para debug
-            for i, url in enumerate(course_urls[:3]):
-                print(f"📄 Enlace {i+1}: {url}")
-                
+            print(f"🔍 Procesando enlace {i+1}/{len(course_urls)}...")
+            curso = procesar_candidato(driver, adaptador, link_url, indice, entregar)
+            if curso:
+                cursos.append(curso)
         except Exception as e:
-            print(f"❌ Error buscando enlaces: {e}")
-            return udemy_links
-        
-        # Procesar solo los primeros 10 enlaces para la prueba
-        for i in range(min(10, len(course_urls))):
-            try:
-                print(f"🔍 Procesando enlace {i+1}/10...")
-                
-                if i >= len(course_urls):
-                    print("⚠️ No hay más enlaces disponibles")
+            print(f"⚠️ Error procesando curso {i+1}: {e}")
+            continue
+    
+    return cursos
+
+def extraer_cursos_de_fuente(driver, adaptador, indice, workers=1, entregar=None):
+    """Recorrer los listados de una fuente y devolver sus cursos válidos
+
+    Con entregar(curso) los cursos se entregan uno a uno mientras se sigue extrayendo.
+    """
+    print(f"🔍 Extrayendo cursos de {adaptador.fuente}...")
+    cursos = []
+    # Un solo pool por fuente: sus navegadores se reutilizan en todas las páginas y categorías
+    pool = PoolNavegadores(lambda: crear_driver("scraping", headless=True), workers) if workers > 1 else None
+    try:
+        with tramo(f"extraccion.{adaptador.nombre}", {'fuente': adaptador.fuente}):
+            for url_listado in adaptador.urls_listado(driver):
+                if indice.limite_alcanzado():
                     break
-                
-                link_url = course_urls[i]
-                print(f"📄 URL del enlace: {link_url}")
-                
-                # Inicializar variables para este curso
-                coupon_code = None
-                udemy_url = None
-                original_url = None
-                
-                # Navegar directamente a la página del curso
                 try:
-                    driver.get(link_url)
-                    time.sleep(3)
-                except Exception as e:
-                    print(f"⚠️ Error navegando a la página: {e}")
-                    continue
-                
-                # Buscar el botón "OBTENER CÓDIGO DE CUPÓN" o "GET COUPON CODE"
-                print("🔍 Buscando botón de obtener cupón...")
-                coupon_button_selectors = [
-                    "//button[contains(text(), 'OBTENER CÓDIGO DE CUPÓN')]",
-                    "//button[contains(text(), 'GET COUPON CODE')]",
-                    "//a[contains(text(), 'OBTENER CÓDIGO DE CUPÓN')]",
-                    "//a[contains(text(), 'GET COUPON CODE')]",
-                    "//button[contains(text(), 'cupón') or contains(text(), 'coupon')]",
-                    "//a[contains(text(), 'cupón') or contains(text(), 'coupon')]",
-                    "//*[contains(text(), 'OBTENER') and contains(text(), 'CUPÓN')]",
-                    "//*[contains(text(), 'GET') and contains(text(), 'COUPON')]"
-                ]
-                
-                coupon_button = None
-                for selector in coupon_button_selectors:
-                    try:
-                        buttons = driver.find_elements(By.XPATH, selector)
-                        if buttons:
-                            coupon_button = buttons[0]
-                            print(f"✅ Botón encontrado con selector: {selector}")
+                    for course_urls in adaptador.lotes_candidatos(driver, url_listado):
+                        cursos.extend(procesar_candidatos(driver, adaptador, course_urls, indice, pool, entregar))
+                        if indice.limite_alcanzado():
                             break
-                    except Exception as e:
-                        continue
-                
-                if coupon_button:
-                    # Verificar si el botón tiene un enlace
-                    button_href = coupon_button.get_attribute("href")
-                    print(f"🔗 Href del botón: {button_href}")
-                    
-                    # Si el botón tiene un enlace de redirección, seguirlo
-                    if button_href and ("out.php" in button_href or "redirect" in button_href):
-                        print("🔍 Encontrado enlace de redirección, siguiéndolo...")
-                        try:
-                            driver.get(button_href)
-                            time.sleep(3)
-                            
-                            # Verificar si se redirigió a Udemy
-                            current_url = driver.current_url
-                            print(f"🔍 URL después de la redirección: {current_url}")
-                            
-                            if "udemy.com/course/" in current_url:
-                                print("✅ ¡Enlace de Udemy encontrado después de la redirección!")
-                                udemy_url = current_url
-                                original_url = current_url  # Guardar la URL original
-                                
-                                # Verificar si es un enlace de checkout y convertirlo
-                                if "/payment/checkout/" in udemy_url:
-                                    print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                    original_url = udemy_url
-                                    udemy_url = convert_checkout_to_course_url(udemy_url)
-                                    print(f"🔗 Enlace original: {original_url}")
-                                    print(f"🔗 Enlace convertido: {udemy_url}")
-                                
-                                # Extraer código de cupón
-                                coupon_code = extract_coupon_code_from_url(original_url)
-                                if not coupon_code:
-                                    coupon_code = extract_coupon_code_from_url(udemy_url)
-                            else:
-                                # SIEMPRE buscar botón "INSCRIBIRSE" o "ENROLL" para obtener el enlace final
-                                print("🔍 Buscando botón INSCRIBIRSE/ENROLL para obtener el enlace final...")
-                                enroll_button_selectors = [
-                                    "//button[contains(text(), 'INSCRIBIRSE')]",
-                                    "//button[contains(text(), 'ENROLL')]",
-                                    "//a[contains(text(), 'INSCRIBIRSE')]",
-                                    "//a[contains(text(), 'ENROLL')]",
-                                    "//*[contains(text(), 'INSCRIBIRSE')]",
-                                    "//*[contains(text(), 'ENROLL')]",
-                                    "//button[contains(text(), 'inscribirse')]",
-                                    "//button[contains(text(), 'enroll')]",
-                                    "//a[contains(text(), 'inscribirse')]",
-                                    "//a[contains(text(), 'enroll')]"
-                                ]
-                                
-                                enroll_button = None
-                                for selector in enroll_button_selectors:
-                                    try:
-                                        buttons = driver.find_elements(By.XPATH, selector)
-                                        if buttons:
-                                            enroll_button = buttons[0]
-                                            print(f"✅ Botón INSCRIBIRSE encontrado con selector: {selector}")
-                                            break
-                                    except Exception as e:
-                                        continue
-                                
-                                if enroll_button:
-                                    try:
-                                        print("🖱️ Haciendo clic en botón INSCRIBIRSE para obtener el enlace final...")
-                                        enroll_button.click()
-                                        time.sleep(3)
-                                        
-                                        # Verificar si ahora estamos en Udemy
-                                        current_url = driver.current_url
-                                        print(f"🔍 URL después de hacer clic en INSCRIBIRSE: {current_url}")
-                                        
-                                        if "udemy.com/course/" in current_url:
-                                            print("✅ ¡Enlace de Udemy encontrado después de hacer clic en INSCRIBIRSE!")
-                                            udemy_url = current_url
-                                            original_url = current_url
-                                            
-                                            # Verificar si es un enlace de checkout y convertirlo
-                                            if "/payment/checkout/" in udemy_url:
-                                                print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                                original_url = udemy_url
-                                                udemy_url = convert_checkout_to_course_url(udemy_url)
-                                                print(f"🔗 Enlace original: {original_url}")
-                                                print(f"🔗 Enlace convertido: {udemy_url}")
-                                            
-                                            # Extraer código de cupón
-                                            coupon_code = extract_coupon_code_from_url(original_url)
-                                            if not coupon_code:
-                                                coupon_code = extract_coupon_code_from_url(udemy_url)
-                                        else:
-                                            print("⚠️ No se llegó a Udemy después de hacer clic en INSCRIBIRSE")
-                                            continue
-                                    except Exception as e:
-                                        print(f"⚠️ Error haciendo clic en INSCRIBIRSE: {e}")
-                                        continue
-                                else:
-                                    print("⚠️ No se encontró botón INSCRIBIRSE")
-                                    continue
-                            
-                            # Procesar el curso si tenemos cupón y URL de Udemy
-                            if coupon_code and udemy_url:
-                                print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                                
-                                # Extraer ID del curso para evitar duplicados
-                                course_id = extract_course_id(udemy_url)
-                                
-                                if course_id not in processed_courses:
-                                    # SIEMPRE verificar si el curso es realmente gratis navegando a la página final
-                                    print("🔍 Verificando si el curso es 100% gratis navegando a la página final...")
-                                    is_free = verify_course_is_free(driver, udemy_url)
-                                    
-                                    if is_free:
-                                        processed_courses.add(course_id)
-                                        
-                                        # Construir URL completa con cupón
-                                        # Verificar si la URL ya tiene couponCode
-                                        if "couponCode=" in udemy_url:
-                                            full_url = udemy_url
-                                        else:
-                                            full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                        
-                                        udemy_links.append({
-                                            'text': f"Curso de Coupon Scorpion: {extract_course_name(udemy_url)}",
-                                            'urls': [full_url],
-                                            'index': len(udemy_links),
-                                            'screenshot': None
-                                        })
-                                        print(f"✅ Curso GRATIS agregado: {extract_course_name(udemy_url)}")
-                                        print(f"🎫 Código del cupón: {coupon_code}")
-                                        print(f"🔗 URL completa: {full_url}")
-                                    else:
-                                        print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                                else:
-                                    print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                            else:
-                                print("❌ No se encontró código de cupón o URL de Udemy válida")
-                            
-                            # Volver a la página anterior
-                            driver.back()
-                            time.sleep(2)
-                            continue
-                        except Exception as e:
-                            print(f"⚠️ Error siguiendo la redirección: {e}")
-                            try:
-                                driver.back()
-                                time.sleep(2)
-                            except:
-                                pass
-                    else:
-                        # Si el botón no tiene href, hacer clic directamente en él
-                        print("🖱️ El botón no tiene href, haciendo clic directamente...")
-                        try:
-                            coupon_button.click()
-                            time.sleep(3)
-                            
-                            # Verificar si se redirigió a Udemy
-                            current_url = driver.current_url
-                            print(f"🔍 URL después de hacer clic en el botón: {current_url}")
-                            
-                            if "udemy.com/course/" in current_url:
-                                print("✅ ¡Enlace de Udemy encontrado después de hacer clic en el botón!")
-                                udemy_url = current_url
-                                original_url = current_url
-                                
-                                # Verificar si es un enlace de checkout y convertirlo
-                                if "/payment/checkout/" in udemy_url:
-                                    print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                    original_url = udemy_url
-                                    udemy_url = convert_checkout_to_course_url(udemy_url)
-                                    print(f"🔗 Enlace original: {original_url}")
-                                    print(f"🔗 Enlace convertido: {udemy_url}")
-                                
-                                # Extraer código de cupón
-                                coupon_code = extract_coupon_code_from_url(original_url)
-                                if not coupon_code:
-                                    coupon_code = extract_coupon_code_from_url(udemy_url)
-                                
-                                # Procesar el curso si tenemos cupón y URL de Udemy
-                                if coupon_code and udemy_url:
-                                    print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                                    
-                                    # Extraer ID del curso para evitar duplicados
-                                    course_id = extract_course_id(udemy_url)
-                                    
-                                    if course_id not in processed_courses:
-                                        # SIEMPRE verificar si el curso es realmente gratis navegando a la página final
-                                        print("🔍 Verificando si el curso es 100% gratis navegando a la página final...")
-                                        is_free = verify_course_is_free(driver, udemy_url)
-                                        
-                                        if is_free:
-                                            processed_courses.add(course_id)
-                                            
-                                            # Construir URL completa con cupón
-                                            # Verificar si la URL ya tiene couponCode
-                                            if "couponCode=" in udemy_url:
-                                                full_url = udemy_url
-                                            else:
-                                                full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                            
-                                            udemy_links.append({
-                                                'text': f"Curso de Coupon Scorpion: {extract_course_name(udemy_url)}",
-                                                'urls': [full_url],
-                                                'index': len(udemy_links),
-                                                'screenshot': None
-                                            })
-                                            print(f"✅ Curso GRATIS agregado: {extract_course_name(udemy_url)}")
-                                            print(f"🎫 Código del cupón: {coupon_code}")
-                                            print(f"🔗 URL completa: {full_url}")
-                                        else:
-                                            print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                                    else:
-                                        print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                                else:
-                                    print("❌ No se encontró código de cupón o URL de Udemy válida")
-                            else:
-                                # Si no es Udemy, buscar botón "INSCRIBIRSE" o "ENROLL"
-                                print("🔍 Buscando botón INSCRIBIRSE/ENROLL para obtener el enlace final...")
-                                enroll_button_selectors = [
-                                    "//button[contains(text(), 'INSCRIBIRSE')]",
-                                    "//button[contains(text(), 'ENROLL')]",
-                                    "//a[contains(text(), 'INSCRIBIRSE')]",
-                                    "//a[contains(text(), 'ENROLL')]",
-                                    "//*[contains(text(), 'INSCRIBIRSE')]",
-                                    "//*[contains(text(), 'ENROLL')]",
-                                    "//button[contains(text(), 'inscribirse')]",
-                                    "//button[contains(text(), 'enroll')]",
-                                    "//a[contains(text(), 'inscribirse')]",
-                                    "//a[contains(text(), 'enroll')]"
-                                ]
-                                
-                                enroll_button = None
-                                for selector in enroll_button_selectors:
-                                    try:
-                                        buttons = driver.find_elements(By.XPATH, selector)
-                                        if buttons:
-                                            enroll_button = buttons[0]
-                                            print(f"✅ Botón INSCRIBIRSE encontrado con selector: {selector}")
-                                            break
-                                    except Exception as e:
-                                        continue
-                                
-                                if enroll_button:
-                                    try:
-                                        print("🖱️ Haciendo clic en botón INSCRIBIRSE para obtener el enlace final...")
-                                        enroll_button.click()
-                                        time.sleep(3)
-                                        
-                                        # Verificar si ahora estamos en Udemy
-                                        current_url = driver.current_url
-                                        print(f"🔍 URL después de hacer clic en INSCRIBIRSE: {current_url}")
-                                        
-                                        if "udemy.com/course/" in current_url:
-                                            print("✅ ¡Enlace de Udemy encontrado después de hacer clic en INSCRIBIRSE!")
-                                            udemy_url = current_url
-                                            original_url = current_url
-                                            
-                                            # Verificar si es un enlace de checkout y convertirlo
-                                            if "/payment/checkout/" in udemy_url:
-                                                print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                                original_url = udemy_url
-                                                udemy_url = convert_checkout_to_course_url(udemy_url)
-                                                print(f"🔗 Enlace original: {original_url}")
-                                                print(f"🔗 Enlace convertido: {udemy_url}")
-                                            
-                                            # Extraer código de cupón
-                                            coupon_code = extract_coupon_code_from_url(original_url)
-                                            if not coupon_code:
-                                                coupon_code = extract_coupon_code_from_url(udemy_url)
-                                            
-                                            # Procesar el curso si tenemos cupón y URL de Udemy
-                                            if coupon_code and udemy_url:
-                                                print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                                                
-                                                # Extraer ID del curso para evitar duplicados
-                                                course_id = extract_course_id(udemy_url)
-                                                
-                                                if course_id not in processed_courses:
-                                                    # SIEMPRE verificar si el curso es realmente gratis navegando a la página final
-                                                    print("🔍 Verificando si el curso es 100% gratis navegando a la página final...")
-                                                    is_free = verify_course_is_free(driver, udemy_url)
-                                                    
-                                                    if is_free:
-                                                        processed_courses.add(course_id)
-                                                        
-                                                        # Construir URL completa con cupón
-                                                        # Verificar si la URL ya tiene couponCode
-                                                        if "couponCode=" in udemy_url:
-                                                            full_url = udemy_url
-                                                        else:
-                                                            full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                                        
-                                                        udemy_links.append({
-                                                            'text': f"Curso de Coupon Scorpion: {extract_course_name(udemy_url)}",
-                                                            'urls': [full_url],
-                                                            'index': len(udemy_links),
-                                                            'screenshot': None
-                                                        })
-                                                        print(f"✅ Curso GRATIS agregado: {extract_course_name(udemy_url)}")
-                                                        print(f"🎫 Código del cupón: {coupon_code}")
-                                                        print(f"🔗 URL completa: {full_url}")
-                                                    else:
-                                                        print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                                                else:
-                                                    print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                                            else:
-                                                print("❌ No se encontró código de cupón o URL de Udemy válida")
-                                        else:
-                                            print("⚠️ No se llegó a Udemy después de hacer clic en INSCRIBIRSE")
-                                            continue
-                                    except Exception as e:
-                                        print(f"⚠️ Error haciendo clic en INSCRIBIRSE: {e}")
-                                        continue
-                                else:
-                                    print("⚠️ No se encontró botón INSCRIBIRSE")
-                                    continue
-                            
-                            # Volver a la página anterior
-                            driver.back()
-                            time.sleep(2)
-                            continue
-                        except Exception as e:
-                            print(f"⚠️ Error haciendo clic en el botón: {e}")
-                            try:
-                                driver.back()
-                                time.sleep(2)
-                            except:
-                                pass
-                            continue
-                else:
-                    print("⚠️ No se encontró el botón de obtener cupón")
-                
-                # Volver a la página principal
-                try:
-                    driver.back()
-                    time.sleep(2)
                 except Exception as e:
-                    print(f"⚠️ Error volviendo atrás: {e}")
-                    driver.get("https://couponscorpion-com.translate.goog/category/100-off-coupons/?_x_tr_sl=en&_x_tr_tl=es&_x_tr_hl=es&_x_tr_pto=tc")
-                    time.sleep(3)
-                
-            except Exception as e:
-                print(f"⚠️ Error procesando curso {i+1}: {e}")
-                try:
-                    driver.back()
-                    time.sleep(2)
-                except:
-                    driver.get("https://couponscorpion-com.translate.goog/category/100-off-coupons/?_x_tr_sl=en&_x_tr_tl=es&_x_tr_hl=es&_x_tr_pto=tc")
-                    time.sleep(3)
-                continue
+                    print(f"❌ Error extrayendo cursos de {url_listado}: {e}")
+    finally:
+        if pool is not None:
+            pool.cerrar()
     
-    except Exception as e:
-        print(f"❌ Error en extraer_cursos_de_coupon_scorpion: {e}")
+    for i, curso in enumerate(cursos):
+        curso['index'] = i
+    return cursos
+
+@registrar_fuente
+class FuenteCursosDev(AdaptadorFuente):
+    """Página principal de CursosDev"""
+    nombre = "cursosdev"
+    etiqueta = "Curso de CursosDev"
+    fuente = "CursosDev"
+    marcador_url = "cursosdev.com"
+    
+    def urls_listado(self, driver=None):
+        return ["https://cursosdev.com/"]
     
-    print(f"📊 Cursos extraídos de Coupon Scorpion: {len(udemy_links)}")
-    return udemy_links
+    def resolver(self, driver, url_candidato):
+        return resolver_enlace_cursosdev(driver, url_candidato)
 
-def extraer_cursos_de_cursosdev_categoria(driver, categoria_url, max_cursos=10, processed_courses=None):
-    """Extraer cursos de una categoría específica de CursosDev"""
-    print(f"🔍 Extrayendo cursos de categoría: {categoria_url}")
+@registrar_fuente
+class FuenteCursosDevCategorias(FuenteCursosDev):
+    """Todas las categorías de CursosDev, recorridas por sus páginas numeradas"""
+    nombre = "cursosdev_categorias"
+    etiqueta = "Curso de CursosDev (Categorías)"
+    fuente = "CursosDev (Categorías)"
     
-    udemy_links = []
-    if processed_courses is None:
-        processed_courses = set()
+    def urls_listado(self, driver=None):
+        # En modo incremental, los posts publicados en ejecuciones anteriores cuentan como vistos
+        estado = obtener_estado_incremental()
+        conocido = (lambda url: estado.curso_de_origen(url) is not None) if estado else None
+        self.rastreador = RastreadorCursosDev(conocido)
+        return self.rastreador.descubrir_categorias(driver)
     
-    try:
-        # Navegar a la página de la categoría específica
-        print(f"🌐 Navegando a la categoría: {categoria_url}")
-        driver.set_page_load_timeout(30)
-        driver.get(categoria_url)
-        time.sleep(3)
-        
-        # Verificar que la página cargó correctamente
-        if "cursosdev.com" not in driver.current_url.lower():
-            print("❌ Error: No se pudo cargar la página de la categoría")
-            return udemy_links, processed_courses
-        
-        print("✅ Página de categoría cargada correctamente")
-        
-        # Hacer scroll para cargar más cursos
-        print("📜 Haciendo scroll para cargar cursos...")
-        for scroll in range(3):
-            try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                print(f"Scroll {scroll+1}/3 completado")
-            except Exception as e:
-                print(f"⚠️ Error en scroll {scroll+1}: {e}")
-                break
-        
-        # Buscar enlaces de cursos en la página
-        print("🔍 Buscando enlaces de cursos en la categoría...")
-        
-        try:
-            # Buscar TODOS los enlaces en la página para debug
-            all_links = driver.find_elements(By.XPATH, "//a[@href]")
-            print(f"🔍 Total de enlaces encontrados en la página: {len(all_links)}")
-            
-            # Mostrar algunos enlaces para debug
-            for i, link in enumerate(all_links[:10]):
-                try:
-                    href = link.get_attribute("href")
-                    text = link.text.strip()
-                    print(f"📄 Enlace {i+1}: {href} - Texto: {text[:50]}")
-                except:
-                    continue
-            
-            # Buscar enlaces específicos de cursos
-            course_links = []
-            
-            # Buscar enlaces que contengan "udemy"
-            udemy_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'udemy.com')]")
-            course_links.extend(udemy_links)
-            print(f"🔍 Enlaces de Udemy encontrados: {len(udemy_links)}")
-            
-            # Buscar enlaces que contengan "coupons-udemy" en la URL (formato específico de CursosDev)
-            coupons_udemy_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'coupons-udemy')]")
-            course_links.extend(coupons_udemy_links)
-            print(f"🔍 Enlaces con 'coupons-udemy' encontrados: {len(coupons_udemy_links)}")
-            
-            # Buscar enlaces en títulos de cursos (pero excluir categorías)
-            title_links = driver.find_elements(By.XPATH, "//h1//a | //h2//a | //h3//a | //h4//a | //h5//a")
-            course_links.extend(title_links)
-            print(f"🔍 Enlaces en títulos encontrados: {len(title_links)}")
-            
-            # Buscar enlaces en artículos o cards de cursos
-            article_links = driver.find_elements(By.XPATH, "//article//a | //div[contains(@class, 'card')]//a | //div[contains(@class, 'post')]//a | //div[contains(@class, 'course')]//a | //div[contains(@class, 'entry')]//a")
-            course_links.extend(article_links)
-            print(f"🔍 Enlaces en artículos/cards encontrados: {len(article_links)}")
-            
-            # Buscar enlaces que contengan palabras clave de cursos
-            keyword_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'curso') or contains(text(), 'course') or contains(text(), 'udemy') or contains(text(), 'cupón') or contains(text(), 'coupon')]")
-            course_links.extend(keyword_links)
-            print(f"🔍 Enlaces con palabras clave encontrados: {len(keyword_links)}")
-            
-            # Buscar enlaces que contengan "cupón" o "coupon"
-            coupon_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'cupón') or contains(text(), 'coupon')]")
-            course_links.extend(coupon_links)
-            print(f"🔍 Enlaces con 'cupón' encontrados: {len(coupon_links)}")
-            
-            # Buscar enlaces que contengan "obtener" o "get"
-            obtener_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'obtener') or contains(text(), 'get')]")
-            course_links.extend(obtener_links)
-            print(f"🔍 Enlaces con 'obtener/get' encontrados: {len(obtener_links)}")
-            
-            # Buscar enlaces en listas de cursos
-            list_links = driver.find_elements(By.XPATH, "//ul//a | //ol//a | //li//a")
-            course_links.extend(list_links)
-            print(f"🔍 Enlaces en listas encontrados: {len(list_links)}")
-            
-            # Procesar los enlaces encontrados
-            all_course_urls = []
-            seen_urls = set()
-            for link in course_links:
-                try:
-                    href = link.get_attribute("href")
-                    if href and href not in seen_urls and href.startswith('http'):
-                        # Filtrar solo URLs que parezcan ser de cursos individuales (no categorías)
-                        if (('cursosdev.com' in href and ('coupons-udemy' in href or 'udemy.com' in href)) or
-                            'udemy.com' in href or
-                            # Excluir URLs de categorías como /courses/JavaScript, /courses/Angular, etc.
-                            (href.startswith('https://cursosdev.com/') and 
-                             not href.startswith('https://cursosdev.com/courses/') and
-                             not href.startswith('https://cursosdev.com/blog') and
-                             not href.startswith('https://cursosdev.com/submit'))):
-                            seen_urls.add(href)
-                            all_course_urls.append(href)
-                except:
-                    continue
-            
-            # Si no encontramos cursos específicos, buscar enlaces que no sean categorías
-            if not all_course_urls:
-                # Eliminar duplicados y guardar URLs
-                unique_urls = []
-                for link in course_links:
-                    try:
-                        href = link.get_attribute("href")
-                        if href and href not in seen_urls and href.startswith('http'):
-                            # Incluir cualquier enlace de cursosdev que no sea una categoría
-                            if (href.startswith('https://cursosdev.com/') and 
-                                not href.startswith('https://cursosdev.com/courses/') and
-                                not href.startswith('https://cursosdev.com/blog') and
-                                not href.startswith('https://cursosdev.com/submit')):
-                                seen_urls.add(href)
-                                unique_urls.append(href)
-                    except:
-                        continue
-                
-                all_course_urls = unique_urls
-            
-            course_urls = all_course_urls
-            print(f"🔍 Encontrados {len(course_urls)} enlaces únicos de cursos en la categoría...")
-            
-            # Mostrar algunos enlaces para debug
-            for i, url in enumerate(course_urls[:5]):
-                print(f"📄 Enlace de curso {i+1}: {url}")
-                
-        except Exception as e:
-            print(f"❌ Error buscando enlaces en la categoría: {e}")
-            return udemy_links, processed_courses
-        
-        # Procesar enlaces hasta encontrar max_cursos válidos
-        valid_courses_found = 0
-        for i in range(len(course_urls)):
-            # Limitar a procesar máximo max_cursos válidos - verificar ANTES de procesar
-            if valid_courses_found >= max_cursos:
-                print(f"✅ Ya se encontraron {max_cursos} cursos válidos en la categoría, deteniendo búsqueda")
-                break
-                
-            try:
-                print(f"🔍 Procesando enlace {i+1}/{len(course_urls)} de la categoría...")
-                
-                if i >= len(course_urls):
-                    print("⚠️ No hay más enlaces disponibles en la categoría")
-                    break
-                
-                link_url = course_urls[i]
-                print(f"📄 URL del enlace: {link_url}")
-                
-                # Inicializar variables para este curso
-                coupon_code = None
-                udemy_url = None
-                original_url = None
-                
-                # Navegar directamente a la página del curso
-                try:
-                    driver.get(link_url)
-                    time.sleep(3)
-                except Exception as e:
-                    print(f"⚠️ Error navegando a la página: {e}")
-                    continue
-                
-                # Verificar si ya estamos en Udemy
-                current_url = driver.current_url
-                print(f"🔍 URL actual: {current_url}")
-                
-                if "udemy.com/course/" in current_url:
-                    print("✅ ¡Ya estamos en Udemy!")
-                    udemy_url = current_url
-                    original_url = current_url
-                    
-                    # Verificar si es un enlace de checkout y convertirlo
-                    if "/payment/checkout/" in udemy_url:
-                        print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                        original_url = udemy_url
-                        udemy_url = convert_checkout_to_course_url(udemy_url)
-                        print(f"🔗 Enlace original: {original_url}")
-                        print(f"🔗 Enlace convertido: {udemy_url}")
-                    
-                    # Extraer código de cupón
-                    coupon_code = extract_coupon_code_from_url(original_url)
-                    if not coupon_code:
-                        coupon_code = extract_coupon_code_from_url(udemy_url)
-                    
-                    # Procesar el curso si tenemos cupón y URL de Udemy
-                    if coupon_code and udemy_url:
-                        print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                        
-                        # Extraer ID del curso para evitar duplicados
-                        course_id = extract_course_id(udemy_url)
-                        
-                        if course_id not in processed_courses:
-                            # Verificar si el curso es realmente gratis
-                            print("🔍 Verificando si el curso es 100% gratis...")
-                            is_free = verify_course_is_free(driver, udemy_url)
-                            
-                            if is_free:
-                                processed_courses.add(course_id)
-                                
-                                # Construir URL completa con cupón
-                                if "couponCode=" in udemy_url:
-                                    full_url = udemy_url
-                                else:
-                                    full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                
-                                udemy_links.append({
-                                    'text': f"Curso de CursosDev (IT & Software): {extract_course_name(udemy_url)}",
-                                    'urls': [full_url],
-                                    'index': len(udemy_links),
-                                    'screenshot': None
-                                })
-                                valid_courses_found += 1
-                                print(f"✅ Curso GRATIS de categoría agregado: {extract_course_name(udemy_url)}")
-                                print(f"🎫 Código del cupón: {coupon_code}")
-                                print(f"🔗 URL completa: {full_url}")
-                                print(f"📊 Cursos válidos encontrados en categoría: {valid_courses_found}/{max_cursos}")
-                            else:
-                                print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                        else:
-                            print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                    else:
-                        print("❌ No se encontró código de cupón o URL de Udemy válida")
-                else:
-                    # Buscar botón "OBTENER CUPÓN" o similar en CursosDev
-                    print("🔍 Buscando botón de obtener cupón en CursosDev...")
-                    coupon_button_selectors = [
-                        "//button[contains(text(), 'OBTENER CUPÓN')]",
-                        "//button[contains(text(), 'GET COUPON')]",
-                        "//a[contains(text(), 'OBTENER CUPÓN')]",
-                        "//a[contains(text(), 'GET COUPON')]",
-                        "//button[contains(text(), 'cupón') or contains(text(), 'coupon')]",
-                        "//a[contains(text(), 'cupón') or contains(text(), 'coupon')]",
-                        "//*[contains(text(), 'OBTENER') and contains(text(), 'CUPÓN')]",
-                        "//*[contains(text(), 'GET') and contains(text(), 'COUPON')]",
-                        # Agregar selectores para el formato con emoji
-                        "//a[contains(text(), '🎟️ Obtener Cupón')]",
-                        "//a[contains(text(), 'Obtener Cupón')]",
-                        "//*[contains(text(), 'Obtener Cupón')]",
-                        "//*[contains(text(), 'obtener cupón')]",
-                        "//*[contains(text(), 'cupón')]"
-                    ]
-                    
-                    coupon_button = None
-                    for selector in coupon_button_selectors:
-                        try:
-                            buttons = driver.find_elements(By.XPATH, selector)
-                            if buttons:
-                                coupon_button = buttons[0]
-                                print(f"✅ Botón encontrado con selector: {selector}")
-                                break
-                        except Exception as e:
-                            continue
-                    
-                    if coupon_button:
-                        # Obtener el href del botón antes de hacer clic
-                        button_href = coupon_button.get_attribute("href")
-                        print(f"🔗 Href del botón: {button_href}")
-                        
-                        # Si el botón tiene un enlace de linksynergy, extraer la URL final directamente
-                        if button_href and "linksynergy.com" in button_href:
-                            print("🔍 Encontrado enlace de linksynergy, extrayendo URL final...")
-                            try:
-                                # Extraer la URL final del parámetro murl
-                                murl_match = re.search(r'murl=([^&]+)', button_href)
-                                if murl_match:
-                                    final_url = murl_match.group(1)
-                                    # Decodificar URL
-                                    import urllib.parse
-                                    final_url = urllib.parse.unquote(final_url)
-                                    print(f"🔗 URL final extraída: {final_url}")
-                                    
-                                    if "udemy.com/course/" in final_url:
-                                        print("✅ ¡Enlace de Udemy extraído de linksynergy!")
-                                        udemy_url = final_url
-                                        original_url = final_url
-                                        
-                                        # Verificar si es un enlace de checkout y convertirlo
-                                        if "/payment/checkout/" in udemy_url:
-                                            print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                            original_url = udemy_url
-                                            udemy_url = convert_checkout_to_course_url(udemy_url)
-                                            print(f"🔗 Enlace original: {original_url}")
-                                            print(f"🔗 Enlace convertido: {udemy_url}")
-                                        
-                                        # Extraer código de cupón
-                                        coupon_code = extract_coupon_code_from_url(original_url)
-                                        if not coupon_code:
-                                            coupon_code = extract_coupon_code_from_url(udemy_url)
-                                        
-                                        # Procesar el curso si tenemos cupón y URL de Udemy
-                                        if coupon_code and udemy_url:
-                                            print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                                            
-                                            # Extraer ID del curso para evitar duplicados
-                                            course_id = extract_course_id(udemy_url)
-                                            
-                                            if course_id not in processed_courses:
-                                                # Verificar si el curso es realmente gratis
-                                                print("🔍 Verificando si el curso es 100% gratis...")
-                                                is_free = verify_course_is_free(driver, udemy_url)
-                                                
-                                                if is_free:
-                                                    processed_courses.add(course_id)
-                                                    
-                                                    # Construir URL completa con cupón
-                                                    if "couponCode=" in udemy_url:
-                                                        full_url = udemy_url
-                                                    else:
-                                                        full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                                    
-                                                    udemy_links.append({
-                                                        'text': f"Curso de CursosDev (IT & Software): {extract_course_name(udemy_url)}",
-                                                        'urls': [full_url],
-                                                        'index': len(udemy_links),
-                                                        'screenshot': None
-                                                    })
-                                                    valid_courses_found += 1
-                                                    print(f"✅ Curso GRATIS de categoría agregado: {extract_course_name(udemy_url)}")
-                                                    print(f"🎫 Código del cupón: {coupon_code}")
-                                                    print(f"🔗 URL completa: {full_url}")
-                                                    print(f"📊 Cursos válidos encontrados en categoría: {valid_courses_found}/{max_cursos}")
-                                                else:
-                                                    print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                                            else:
-                                                print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                                        else:
-                                            print("❌ No se encontró código de cupón o URL de Udemy válida")
-                                    else:
-                                        print("⚠️ La URL extraída no es de Udemy")
-                                else:
-                                    print("⚠️ No se pudo extraer la URL final del enlace linksynergy")
-                            except Exception as e:
-                                print(f"⚠️ Error extrayendo URL de linksynergy: {e}")
-                        else:
-                            # Hacer clic en el botón normalmente
-                            print("🖱️ Haciendo clic en botón de cupón...")
-                            try:
-                                coupon_button.click()
-                                time.sleep(3)
-                                
-                                # Verificar si se redirigió a Udemy
-                                current_url = driver.current_url
-                                print(f"🔍 URL después de hacer clic: {current_url}")
-                                
-                                if "udemy.com/course/" in current_url:
-                                    print("✅ ¡Enlace de Udemy encontrado!")
-                                    udemy_url = current_url
-                                    original_url = current_url
-                                    
-                                    # Verificar si es un enlace de checkout y convertirlo
-                                    if "/payment/checkout/" in udemy_url:
-                                        print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                        original_url = udemy_url
-                                        udemy_url = convert_checkout_to_course_url(udemy_url)
-                                        print(f"🔗 Enlace original: {original_url}")
-                                        print(f"🔗 Enlace convertido: {udemy_url}")
-                                    
-                                    # Extraer código de cupón
-                                    coupon_code = extract_coupon_code_from_url(original_url)
-                                    if not coupon_code:
-                                        coupon_code = extract_coupon_code_from_url(udemy_url)
-                                    
-                                    # Procesar el curso si tenemos cupón y URL de Udemy
-                                    if coupon_code and udemy_url:
-                                        print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                                        
-                                        # Extraer ID del curso para evitar duplicados
-                                        course_id = extract_course_id(udemy_url)
-                                        
-                                        if course_id not in processed_courses:
-                                            # Verificar si el curso es realmente gratis
-                                            print("🔍 Verificando si el curso es 100% gratis...")
-                                            is_free = verify_course_is_free(driver, udemy_url)
-                                            
-                                            if is_free:
-                                                processed_courses.add(course_id)
-                                                
-                                                # Construir URL completa con cupón
-                                                if "couponCode=" in udemy_url:
-                                                    full_url = udemy_url
-                                                else:
-                                                    full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                                
-                                                udemy_links.append({
-                                                    'text': f"Curso de CursosDev (IT & Software): {extract_course_name(udemy_url)}",
-                                                    'urls': [full_url],
-                                                    'index': len(udemy_links),
-                                                    'screenshot': None
-                                                })
-                                                valid_courses_found += 1
-                                                print(f"✅ Curso GRATIS de categoría agregado: {extract_course_name(udemy_url)}")
-                                                print(f"🎫 Código del cupón: {coupon_code}")
-                                                print(f"🔗 URL completa: {full_url}")
-                                                print(f"📊 Cursos válidos encontrados en categoría: {valid_courses_found}/{max_cursos}")
-                                            else:
-                                                print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                                        else:
-                                            print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                                    else:
-                                        print("❌ No se encontró código de cupón o URL de Udemy válida")
-                                else:
-                                    print("⚠️ No se llegó a Udemy después de hacer clic en el botón")
-                            except Exception as e:
-                                print(f"⚠️ Error haciendo clic en el botón: {e}")
-                    else:
-                        print("⚠️ No se encontró el botón de obtener cupón en CursosDev")
-                
-                # Volver a la página de la categoría
-                try:
-                    driver.back()
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"⚠️ Error volviendo atrás: {e}")
-                    driver.get(categoria_url)
-                    time.sleep(3)
-                
-            except Exception as e:
-                print(f"⚠️ Error procesando curso {i+1} de la categoría: {e}")
-                try:
-                    driver.back()
-                    time.sleep(2)
-                except:
-                    driver.get(categoria_url)
-                    time.sleep(3)
-                continue
+    def lotes_candidatos(self, driver, url_listado):
+        print(f"🗂️ Recorriendo categoría: {url_listado}")
+        return self.rastreador.recorrer_categoria(url_listado, driver)
+
+@registrar_fuente
+class FuenteCouponScorpion(AdaptadorFuente):
+    """Categoría 100% Off Coupons de Coupon Scorpion (a través de Google Translate)"""
+    nombre = "couponscorpion"
+    etiqueta = "Curso de Coupon Scorpion"
+    fuente = "Coupon Scorpion"
+    marcador_url = "100-off-coupons"
+    usar_http = False
+    max_enlaces = 10
     
-    except Exception as e:
-        print(f"❌ Error en extraer_cursos_de_cursosdev_categoria: {e}")
+    def urls_listado(self, driver=None):
+        return [COUPONSCORPION_LISTADO_URL]
+    
+    def filtrar_enlaces(self, enlaces):
+        # Enlaces de los títulos de los posts, sin duplicados
+        urls = []
+        for enlace in enlaces:
+            href = enlace['href']
+            if enlace['en_titulo'] and "couponscorpion" in href and href not in urls:
+                urls.append(href)
+        return urls[:self.max_enlaces]
     
-    print(f"📊 Cursos extraídos de la categoría: {len(udemy_links)}")
-    return udemy_links, processed_courses
+    def resolver(self, driver, url_candidato):
+        return resolver_enlace_couponscorpion(driver, url_candidato)
 
-def extraer_cursos_de_cursosdev(driver, processed_courses=None, max_cursos=10):
-    """Extraer cursos directamente de CursosDev"""
-    print("🔍 Extrayendo cursos de CursosDev...")
+# Máximo de cursos por envío de WhatsApp para evitar baneos
+MAX_CURSOS_WHATSAPP = 15
+
+def post_a_curso(post):
+    """Convertir un curso extraído en la entrada del mensaje de WhatsApp, o None si no es válido"""
+    # Verificar que el post tenga la estructura correcta
+    if not (isinstance(post, dict) and 'urls' in post and post['urls']):
+        print(f"⚠️ Post no válido: {post}")
+        return None
     
-    udemy_links = []
-    if processed_courses is None:
-        processed_courses = set()
+    udemy_url = post['urls'][0]  # La URL de Udemy con cupón
     
-    try:
-        # Navegar directamente a la página principal de CursosDev
-        print("🌐 Navegando a la página principal de CursosDev...")
-        driver.set_page_load_timeout(30)
-        driver.get("https://cursosdev.com/")
-        time.sleep(3)
-        
-        # Verificar que la página cargó correctamente
-        if "cursosdev.com" not in driver.current_url.lower():
-            print("❌ Error: No se pudo cargar la página principal de CursosDev")
-            return udemy_links
-        
-        print("✅ Página principal de CursosDev cargada correctamente")
-        
-        # Hacer scroll para cargar más cursos
-        print("📜 Haciendo scroll para cargar cursos...")
-        for scroll in range(3):
-            try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                print(f"Scroll {scroll+1}/3 completado")
-            except Exception as e:
-                print(f"⚠️ Error en scroll {scroll+1}: {e}")
-                break
-        
-        # Buscar enlaces de cursos en la página
-        print("🔍 Buscando enlaces de cursos en CursosDev...")
-        
-        try:
-            # Buscar TODOS los enlaces en la página para debug
-            all_links = driver.find_elements(By.XPATH, "//a[@href]")
-            print(f"🔍 Total de enlaces encontrados en la página: {len(all_links)}")
-            
-            # Mostrar algunos enlaces para debug
-            for i, link in enumerate(all_links[:10]):
-                try:
-                    href = link.get_attribute("href")
-                    text = link.text.strip()
-                    print(f"📄 Enlace {i+1}: {href} - Texto: {text[:50]}")
-                except:
-                    continue
-            
-            # Buscar enlaces específicos de cursos
-            course_links = []
-            
-            # Buscar enlaces específicos de cursos en la página actual
-            course_links = []
-            
-            # Buscar enlaces que contengan "udemy"
-            udemy_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'udemy.com')]")
-            course_links.extend(udemy_links)
-            print(f"🔍 Enlaces de Udemy encontrados: {len(udemy_links)}")
-            
-            # Buscar enlaces que contengan "coupons-udemy" en la URL (formato específico de CursosDev)
-            coupons_udemy_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'coupons-udemy')]")
-            course_links.extend(coupons_udemy_links)
-            print(f"🔍 Enlaces con 'coupons-udemy' encontrados: {len(coupons_udemy_links)}")
-            
-            # Buscar enlaces en títulos de cursos (pero excluir categorías)
-            title_links = driver.find_elements(By.XPATH, "//h1//a | //h2//a | //h3//a | //h4//a | //h5//a")
-            course_links.extend(title_links)
-            print(f"🔍 Enlaces en títulos encontrados: {len(title_links)}")
-            
-            # Buscar enlaces en artículos o cards de cursos
-            article_links = driver.find_elements(By.XPATH, "//article//a | //div[contains(@class, 'card')]//a | //div[contains(@class, 'post')]//a | //div[contains(@class, 'course')]//a | //div[contains(@class, 'entry')]//a")
-            course_links.extend(article_links)
-            print(f"🔍 Enlaces en artículos/cards encontrados: {len(article_links)}")
-            
-            # Buscar enlaces que contengan palabras clave de cursos
-            keyword_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'curso') or contains(text(), 'course') or contains(text(), 'udemy') or contains(text(), 'cupón') or contains(text(), 'coupon')]")
-            course_links.extend(keyword_links)
-            print(f"🔍 Enlaces con palabras clave encontrados: {len(keyword_links)}")
-            
-            # Buscar enlaces que contengan "cupón" o "coupon"
-            coupon_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'cupón') or contains(text(), 'coupon')]")
-            course_links.extend(coupon_links)
-            print(f"🔍 Enlaces con 'cupón' encontrados: {len(coupon_links)}")
-            
-            # Buscar enlaces que contengan "obtener" o "get"
-            obtener_links = driver.find_elements(By.XPATH, "//a[contains(text(), 'obtener') or contains(text(), 'get')]")
-            course_links.extend(obtener_links)
-            print(f"🔍 Enlaces con 'obtener/get' encontrados: {len(obtener_links)}")
-            
-            # Buscar enlaces en listas de cursos
-            list_links = driver.find_elements(By.XPATH, "//ul//a | //ol//a | //li//a")
-            course_links.extend(list_links)
-            print(f"🔍 Enlaces en listas encontrados: {len(list_links)}")
-            
-            # Procesar los enlaces encontrados
-            all_course_urls = []
-            seen_urls = set()
-            for link in course_links:
-                try:
-                    href = link.get_attribute("href")
-                    if href and href not in seen_urls and href.startswith('http'):
-                        # Filtrar solo URLs que parezcan ser de cursos individuales (no categorías)
-                        if (('cursosdev.com' in href and ('coupons-udemy' in href or 'udemy.com' in href)) or
-                            'udemy.com' in href or
-                            # Excluir URLs de categorías como /courses/JavaScript, /courses/Angular, etc.
-                            (href.startswith('https://cursosdev.com/') and 
-                             not href.startswith('https://cursosdev.com/courses/') and
-                             not href.startswith('https://cursosdev.com/blog') and
-                             not href.startswith('https://cursosdev.com/submit'))):
-                            seen_urls.add(href)
-                            all_course_urls.append(href)
-                except:
-                    continue
-            
-            # Si no encontramos cursos específicos, buscar enlaces que no sean categorías
-            if not all_course_urls:
-                # Eliminar duplicados y guardar URLs
-                unique_urls = []
-                for link in course_links:
-                    try:
-                        href = link.get_attribute("href")
-                        if href and href not in seen_urls and href.startswith('http'):
-                            # Incluir cualquier enlace de cursosdev que no sea una categoría
-                            if (href.startswith('https://cursosdev.com/') and 
-                                not href.startswith('https://cursosdev.com/courses/') and
-                                not href.startswith('https://cursosdev.com/blog') and
-                                not href.startswith('https://cursosdev.com/submit')):
-                                seen_urls.add(href)
-                                unique_urls.append(href)
-                    except:
-                        continue
-                
-                all_course_urls = unique_urls
-            
-            course_urls = all_course_urls
-            print(f"🔍 Encontrados {len(course_urls)} enlaces únicos de cursos en CursosDev...")
-            
-            # Mostrar algunos enlaces para debug
-            for i, url in enumerate(course_urls[:5]):
-                print(f"📄 Enlace de curso {i+1}: {url}")
-                
-        except Exception as e:
-            print(f"❌ Error buscando enlaces en CursosDev: {e}")
-            return udemy_links
-        
-        # Procesar enlaces hasta encontrar 10 cursos válidos
-        valid_courses_found = 0
-        for i in range(len(course_urls)):
-            # Limitar a procesar máximo 10 cursos válidos - verificar ANTES de procesar
-            if valid_courses_found >= 10:
-                print(f"✅ Ya se encontraron 10 cursos válidos, deteniendo búsqueda")
-                break
-                
-            try:
-                print(f"🔍 Procesando enlace {i+1}/{len(course_urls)} de CursosDev...")
-                
-                if i >= len(course_urls):
-                    print("⚠️ No hay más enlaces disponibles en CursosDev")
-                    break
-                
-                link_url = course_urls[i]
-                print(f"📄 URL del enlace: {link_url}")
-                
-                # Inicializar variables para este curso
-                coupon_code = None
-                udemy_url = None
-                original_url = None
-                
-                # Navegar directamente a la página del curso
-                try:
-                    driver.get(link_url)
-                    time.sleep(3)
-                except Exception as e:
-                    print(f"⚠️ Error navegando a la página: {e}")
-                    continue
-                
-                # Verificar si ya estamos en Udemy
-                current_url = driver.current_url
-                print(f"🔍 URL actual: {current_url}")
-                
-                if "udemy.com/course/" in current_url:
-                    print("✅ ¡Ya estamos en Udemy!")
-                    udemy_url = current_url
-                    original_url = current_url
-                    
-                    # Verificar si es un enlace de checkout y convertirlo
-                    if "/payment/checkout/" in udemy_url:
-                        print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                        original_url = udemy_url
-                        udemy_url = convert_checkout_to_course_url(udemy_url)
-                        print(f"🔗 Enlace original: {original_url}")
-                        print(f"🔗 Enlace convertido: {udemy_url}")
-                    
-                    # Extraer código de cupón
-                    coupon_code = extract_coupon_code_from_url(original_url)
-                    if not coupon_code:
-                        coupon_code = extract_coupon_code_from_url(udemy_url)
-                    
-                    # Procesar el curso si tenemos cupón y URL de Udemy
-                    if coupon_code and udemy_url:
-                        print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                        
-                        # Extraer ID del curso para evitar duplicados
-                        course_id = extract_course_id(udemy_url)
-                        
-                        if course_id not in processed_courses:
-                            # Verificar si el curso es realmente gratis
-                            print("🔍 Verificando si el curso es 100% gratis...")
-                            is_free = verify_course_is_free(driver, udemy_url)
-                            
-                            if is_free:
-                                processed_courses.add(course_id)
-                                
-                                # Construir URL completa con cupón
-                                if "couponCode=" in udemy_url:
-                                    full_url = udemy_url
-                                else:
-                                    full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                
-                                udemy_links.append({
-                                    'text': f"Curso de CursosDev: {extract_course_name(udemy_url)}",
-                                    'urls': [full_url],
-                                    'index': len(udemy_links),
-                                    'screenshot': None
-                                })
-                                valid_courses_found += 1
-                                print(f"✅ Curso GRATIS de CursosDev agregado: {extract_course_name(udemy_url)}")
-                                print(f"🎫 Código del cupón: {coupon_code}")
-                                print(f"🔗 URL completa: {full_url}")
-                                print(f"📊 Cursos válidos encontrados: {valid_courses_found}/10")
-                            else:
-                                print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                        else:
-                            print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                    else:
-                        print("❌ No se encontró código de cupón o URL de Udemy válida")
-                else:
-                    # Buscar botón "OBTENER CUPÓN" o similar en CursosDev
-                    print("🔍 Buscando botón de obtener cupón en CursosDev...")
-                    coupon_button_selectors = [
-                        "//button[contains(text(), 'OBTENER CUPÓN')]",
-                        "//button[contains(text(), 'GET COUPON')]",
-                        "//a[contains(text(), 'OBTENER CUPÓN')]",
-                        "//a[contains(text(), 'GET COUPON')]",
-                        "//button[contains(text(), 'cupón') or contains(text(), 'coupon')]",
-                        "//a[contains(text(), 'cupón') or contains(text(), 'coupon')]",
-                        "//*[contains(text(), 'OBTENER') and contains(text(), 'CUPÓN')]",
-                        "//*[contains(text(), 'GET') and contains(text(), 'COUPON')]",
-                        # Agregar selectores para el formato con emoji
-                        "//a[contains(text(), '🎟️ Obtener Cupón')]",
-                        "//a[contains(text(), 'Obtener Cupón')]",
-                        "//*[contains(text(), 'Obtener Cupón')]",
-                        "//*[contains(text(), 'obtener cupón')]",
-                        "//*[contains(text(), 'cupón')]"
-                    ]
-                    
-                    coupon_button = None
-                    for selector in coupon_button_selectors:
-                        try:
-                            buttons = driver.find_elements(By.XPATH, selector)
-                            if buttons:
-                                coupon_button = buttons[0]
-                                print(f"✅ Botón encontrado con selector: {selector}")
-                                break
-                        except Exception as e:
-                            continue
-                    
-                    if coupon_button:
-                        # Obtener el href del botón antes de hacer clic
-                        button_href = coupon_button.get_attribute("href")
-                        print(f"🔗 Href del botón: {button_href}")
-                        
-                        # Si el botón tiene un enlace de linksynergy, extraer la URL final directamente
-                        if button_href and "linksynergy.com" in button_href:
-                            print("🔍 Encontrado enlace de linksynergy, extrayendo URL final...")
-                            try:
-                                # Extraer la URL final del parámetro murl
-                                murl_match = re.search(r'murl=([^&]+)', button_href)
-                                if murl_match:
-                                    final_url = murl_match.group(1)
-                                    # Decodificar URL
-                                    import urllib.parse
-                                    final_url = urllib.parse.unquote(final_url)
-                                    print(f"🔗 URL final extraída: {final_url}")
-                                    
-                                    if "udemy.com/course/" in final_url:
-                                        print("✅ ¡Enlace de Udemy extraído de linksynergy!")
-                                        udemy_url = final_url
-                                        original_url = final_url
-                                        
-                                        # Verificar si es un enlace de checkout y convertirlo
-                                        if "/payment/checkout/" in udemy_url:
-                                            print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                            original_url = udemy_url
-                                            udemy_url = convert_checkout_to_course_url(udemy_url)
-                                            print(f"🔗 Enlace original: {original_url}")
-                                            print(f"🔗 Enlace convertido: {udemy_url}")
-                                        
-                                        # Extraer código de cupón
-                                        coupon_code = extract_coupon_code_from_url(original_url)
-                                        if not coupon_code:
-                                            coupon_code = extract_coupon_code_from_url(udemy_url)
-                                        
-                                        # Procesar el curso si tenemos cupón y URL de Udemy
-                                        if coupon_code and udemy_url:
-                                            print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                                            
-                                            # Extraer ID del curso para evitar duplicados
-                                            course_id = extract_course_id(udemy_url)
-                                            
-                                            if course_id not in processed_courses:
-                                                # Verificar si el curso es realmente gratis
-                                                print("🔍 Verificando si el curso es 100% gratis...")
-                                                is_free = verify_course_is_free(driver, udemy_url)
-                                                
-                                                if is_free:
-                                                    processed_courses.add(course_id)
-                                                    
-                                                    # Construir URL completa con cupón
-                                                    if "couponCode=" in udemy_url:
-                                                        full_url = udemy_url
-                                                    else:
-                                                        full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                                    
-                                                    udemy_links.append({
-                                                        'text': f"Curso de CursosDev: {extract_course_name(udemy_url)}",
-                                                        'urls': [full_url],
-                                                        'index': len(udemy_links),
-                                                        'screenshot': None
-                                                    })
-                                                    valid_courses_found += 1
-                                                    print(f"✅ Curso GRATIS de CursosDev agregado: {extract_course_name(udemy_url)}")
-                                                    print(f"🎫 Código del cupón: {coupon_code}")
-                                                    print(f"🔗 URL completa: {full_url}")
-                                                    print(f"📊 Cursos válidos encontrados: {valid_courses_found}/10")
-                                                else:
-                                                    print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                                            else:
-                                                print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                                        else:
-                                            print("❌ No se encontró código de cupón o URL de Udemy válida")
-                                    else:
-                                        print("⚠️ La URL extraída no es de Udemy")
-                                else:
-                                    print("⚠️ No se pudo extraer la URL final del enlace linksynergy")
-                            except Exception as e:
-                                print(f"⚠️ Error extrayendo URL de linksynergy: {e}")
-                        else:
-                            # Hacer clic en el botón normalmente
-                            print("🖱️ Haciendo clic en botón de cupón...")
-                            try:
-                                coupon_button.click()
-                                time.sleep(3)
-                                
-                                # Verificar si se redirigió a Udemy
-                                current_url = driver.current_url
-                                print(f"🔍 URL después de hacer clic: {current_url}")
-                                
-                                if "udemy.com/course/" in current_url:
-                                    print("✅ ¡Enlace de Udemy encontrado!")
-                                    udemy_url = current_url
-                                    original_url = current_url
-                                    
-                                    # Verificar si es un enlace de checkout y convertirlo
-                                    if "/payment/checkout/" in udemy_url:
-                                        print("🔄 Enlace de checkout detectado, convirtiendo a enlace directo...")
-                                        original_url = udemy_url
-                                        udemy_url = convert_checkout_to_course_url(udemy_url)
-                                        print(f"🔗 Enlace original: {original_url}")
-                                        print(f"🔗 Enlace convertido: {udemy_url}")
-                                    
-                                    # Extraer código de cupón
-                                    coupon_code = extract_coupon_code_from_url(original_url)
-                                    if not coupon_code:
-                                        coupon_code = extract_coupon_code_from_url(udemy_url)
-                                    
-                                    # Procesar el curso si tenemos cupón y URL de Udemy
-                                    if coupon_code and udemy_url:
-                                        print(f"🎫 Código de cupón encontrado: {coupon_code}")
-                                        
-                                        # Extraer ID del curso para evitar duplicados
-                                        course_id = extract_course_id(udemy_url)
-                                        
-                                        if course_id not in processed_courses:
-                                            # Verificar si el curso es realmente gratis
-                                            print("🔍 Verificando si el curso es 100% gratis...")
-                                            is_free = verify_course_is_free(driver, udemy_url)
-                                            
-                                            if is_free:
-                                                processed_courses.add(course_id)
-                                                
-                                                # Construir URL completa con cupón
-                                                if "couponCode=" in udemy_url:
-                                                    full_url = udemy_url
-                                                else:
-                                                    full_url = f"{udemy_url}?couponCode={coupon_code}"
-                                                
-                                                udemy_links.append({
-                                                    'text': f"Curso de CursosDev: {extract_course_name(udemy_url)}",
-                                                    'urls': [full_url],
-                                                    'index': len(udemy_links),
-                                                    'screenshot': None
-                                                })
-                                                valid_courses_found += 1
-                                                print(f"✅ Curso GRATIS de CursosDev agregado: {extract_course_name(udemy_url)}")
-                                                print(f"🎫 Código del cupón: {coupon_code}")
-                                                print(f"🔗 URL completa: {full_url}")
-                                                print(f"📊 Cursos válidos encontrados: {valid_courses_found}/10")
-                                            else:
-                                                print(f"❌ Curso descartado - tiene precio: {extract_course_name(udemy_url)}")
-                                        else:
-                                            print(f"⚠️ Curso duplicado ignorado: {course_id}")
-                                    else:
-                                        print("❌ No se encontró código de cupón o URL de Udemy válida")
-                                else:
-                                    print("⚠️ No se llegó a Udemy después de hacer clic en el botón")
-                            except Exception as e:
-                                print(f"⚠️ Error haciendo clic en el botón: {e}")
-                    else:
-                        print("⚠️ No se encontró el botón de obtener cupón en CursosDev")
-                
-                # Volver a la página principal de CursosDev
-                try:
-                    driver.back()
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"⚠️ Error volviendo atrás: {e}")
-                    driver.get("https://cursosdev.com/")
-                    time.sleep(3)
-                
-            except Exception as e:
-                print(f"⚠️ Error procesando curso {i+1} de CursosDev: {e}")
-                try:
-                    driver.back()
-                    time.sleep(2)
-                except:
-                    driver.get("https://cursosdev.com/")
-                    time.sleep(3)
-                continue
+    # Verificar que sea una URL de Udemy con cupón
+    if not ('udemy.com/course/' in udemy_url and 'couponCode=' in udemy_url):
+        print(f"⚠️ URL no válida o sin cupón: {udemy_url}")
+        return None
     
-    except Exception as e:
-        print(f"❌ Error en extraer_cursos_de_cursosdev: {e}")
+    # Extraer información del curso y código de cupón de la URL
+    course_name = extract_course_name(udemy_url)
+    coupon_code = udemy_url.split('couponCode=')[1].split('&')[0]
+    
+    # Fuente de la que salió el curso
+    fuente = post.get('fuente', "CursosDev")
     
-    print(f"📊 Cursos extraídos de CursosDev: {len(udemy_links)}")
-    return udemy_links, processed_courses
+    print(f"✅ Curso agregado: {course_name}")
+    print(f"🎫 Cupón: {coupon_code}")
+    print(f"🔗 URL: {udemy_url}")
+    return {
+        'titulo': f"{course_name}",
+        'url': udemy_url,  # URL completa de Udemy con cupón
+        'descripcion': f"Curso 100% gratis encontrado en {fuente} - Cupón: {coupon_code}",
+        'screenshot': None
+    }
 
+@perfilado("bot_principal_simple_fixed")
+@ejecucion_medida("bot_principal_simple_fixed")
 def run_bot_envio_directo():
     """Bot principal que extrae cursos CON CUPONES de CursosDev y los envía por WhatsApp"""
     print("🚀 Iniciando bot de extracción de cursos CON CUPONES...")
@@ -1622,94 +527,51 @@ def run_bot_envio_directo():
     try:
         # 1. INICIALIZAR DRIVER DE CHROME
         print("\nPASO 1: Inicializando navegador...")
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        # 2. EXTRAER CURSOS DE CURSOSDEV (CATEGORÍA IT & SOFTWARE PRIMERO)
-        print("\nPASO 2: Extrayendo cursos CON CUPONES de CursosDev...")
-        all_courses = []
-        processed_courses = set()  # Para evitar duplicados entre fuentes
-        
-                # Primero extraer 10 cursos de la categoría IT & Software
-        print("🌐 Extrayendo de CursosDev - Categoría IT & Software...")
-        categoria_url = "https://cursosdev.com/category/it-and-software/1"
-        posts_categoria, processed_courses = extraer_cursos_de_cursosdev_categoria(driver, categoria_url, max_cursos=10, processed_courses=processed_courses)
-        
-        # Luego extraer cursos de la página principal de CursosDev
-        print("🌐 Extrayendo de CursosDev - Página principal...")
-        posts_cursosdev, processed_courses = extraer_cursos_de_cursosdev(driver, processed_courses, max_cursos=10)
-        
-        # Combinar ambos resultados
-        all_posts = posts_categoria + posts_cursosdev
-        
-        # Procesar directamente los cursos extraídos
-        print(f"Total de cursos extraídos de categoría IT & Software: {len(posts_categoria)}")
-        print(f"Total de cursos extraídos de página principal: {len(posts_cursosdev)}")
-        print(f"Total combinado: {len(all_posts)}")
-        
-        # Verificar que se extrajeron cursos correctamente
-        if not all_posts:
-            print("❌ No se extrajeron cursos de CursosDev")
-            return False
-        
-        # Procesar los cursos extraídos con URLs de Udemy y cupones
-        print(f"Procesando {len(all_posts)} cursos extraídos...")
-        
-        for i, post in enumerate(all_posts):
-            try:
-                # Verificar que el post tenga la estructura correcta
-                if isinstance(post, dict) and 'urls' in post and post['urls']:
-                    udemy_url = post['urls'][0]  # La URL de Udemy con cupón
-                    titulo = post['text']
-                    
-                    # Verificar que sea una URL de Udemy con cupón
-                    if 'udemy.com/course/' in udemy_url and 'couponCode=' in udemy_url:
-                        # Extraer información del curso
-                        course_name = extract_course_name(udemy_url)
-                        # Extraer código de cupón de la URL
-                        if 'couponCode=' in udemy_url:
-                            coupon_code = udemy_url.split('couponCode=')[1].split('&')[0]
-                        else:
-                            coupon_code = "No encontrado"
-                        
-                        # Extraer la fuente del curso del texto
-                        fuente = "CursosDev"
-                        if "(IT & Software)" in post['text']:
-                            fuente = "CursosDev (IT & Software)"
-                        
-                        curso = {
-                            'titulo': f"{course_name}",
-                            'url': udemy_url,  # URL completa de Udemy con cupón
-                            'descripcion': f"Curso 100% gratis encontrado en {fuente} - Cupón: {coupon_code}",
-                            'screenshot': None
-                        }
-                        
-                        all_courses.append(curso)
-                        print(f"✅ Curso agregado: {course_name}")
-                        print(f"🎫 Cupón: {coupon_code}")
-                        print(f"🔗 URL: {udemy_url}")
-                    else:
-                        print(f"⚠️ URL no válida o sin cupón en índice {i}: {udemy_url}")
-                else:
-                    print(f"⚠️ Post no válido en índice {i}: {post}")
-                        
-            except Exception as e:
-                print(f"⚠️ Error procesando curso {i}: {e}")
+        driver = obtener_driver("scraping")
+        workers = get_config('bot').get('workers', 1)
+        if workers > 1:
+            print(f"🧵 Modo pool: {workers} navegadores verificarán los cursos en paralelo")
+        
+        # 2. EXTRAER CURSOS DE TODAS LAS FUENTES HABILITADAS (EN PARALELO)
+        # 3. ENVIAR POR WHATSAPP A MEDIDA QUE SE VERIFICAN
+        print("\nPASO 2: Extrayendo cursos CON CUPONES de las fuentes habilitadas...")
+        print("PASO 3: Los cursos se enviarán por WhatsApp en cuanto se verifiquen")
+        print("IMPORTANTE: Se aplicaran delays para evitar baneos")
+        print("Se enviaran capturas de pantalla si estan disponibles")
+        processed_courses = set()  # Índice único para evitar duplicados entre fuentes
+        
+        adaptadores = fuentes_habilitadas()
+        print(f"🌐 Fuentes: {', '.join(adaptador.fuente for adaptador in adaptadores)}")
+        
+        def extraer(entregar):
+            return ejecutar_fuentes(
+                adaptadores,
+                lambda driver_fuente, adaptador, indice: extraer_cursos_de_fuente(
+                    driver_fuente, adaptador, indice, workers, entregar
+                ),
+                driver,
+                lambda: crear_driver("scraping", headless=True),
+                processed_courses
+            )
+        
+        def enviar(cursos):
+            # Limitar a máximo 15 cursos para evitar baneos
+            enviados = []
+            def registrar():
+                for curso in islice(cursos, MAX_CURSOS_WHATSAPP):
+                    enviados.append(curso)
+                    yield curso
+            # Enviar a grupo (cambia "contacto" por "grupo" si quieres enviar a grupo)
+            return enviar_cursos_sin_emojis(registrar(), destino="grupo"), enviados
+        
+        pipeline = Pipeline().etapa("preparar mensaje", post_a_curso)
+        resultados, (success, all_courses) = pipeline.ejecutar(extraer, enviar)
+        resultados = resultados or {}
         
         print(f"\n📊 RESUMEN:")
-        print(f"Total de cursos CON CUPONES encontrados en CursosDev: {len(all_courses)}")
-        print(f"  - De categoría IT & Software: {len(posts_categoria)}")
-        print(f"  - De página principal: {len(posts_cursosdev)}")
+        print(f"Total de cursos CON CUPONES enviados: {len(all_courses)}")
+        for adaptador in adaptadores:
+            print(f"  - De {adaptador.fuente}: {len(resultados.get(adaptador.nombre, []))} extraídos")
         
         if not all_courses:
             print("❌ No se encontraron cursos CON CUPONES en CursosDev")
@@ -1719,19 +581,6 @@ def run_bot_envio_directo():
             print("- La página no cargó correctamente")
             return False
         
-        # 3. ENVIAR POR WHATSAPP
-        print(f"\nPASO 3: Enviando {len(all_courses)} cursos CON CUPONES por WhatsApp...")
-        print("IMPORTANTE: Se aplicaran delays para evitar baneos")
-        print("Se enviaran capturas de pantalla si estan disponibles")
-        
-        # Limitar a máximo 15 cursos para evitar baneos
-        if len(all_courses) > 15:
-            print(f"Limitando a 15 cursos para evitar baneos (encontrados: {len(all_courses)})")
-            all_courses = all_courses[:15]
-        
-        # Enviar a grupo (cambia "contacto" por "grupo" si quieres enviar a grupo)
-        success = enviar_cursos_sin_emojis(all_courses, destino="grupo")
-        
         if success:
             print(f"\n🎉 ¡PROCESO COMPLETADO EXITOSAMENTE!")
             print(f"✅ Cursos de Udemy CON CUPONES extraidos de CursosDev: {len(all_courses)}")
@@ -1746,13 +595,9 @@ def run_bot_envio_directo():
         return False
     
     finally:
-        # Cerrar el navegador
-        if driver:
-            try:
-                driver.quit()
-                print("🌐 Navegador cerrado")
-            except:
-                pass
+        obtener_cascada().imprimir_resumen()
+        # Devolver el navegador al gestor de sesiones (queda abierto para la próxima ejecución)
+        liberar_driver(driver, "scraping")
 
 def main():
     """Función principal"""
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Pool de navegadores Chrome para verificar cursos en paralelo
+Cada worker tiene su propio driver y comparte la lista de enlaces candidatos
+"""
+import queue
+import threading
+
+
+class IndiceProcesados:
+    """Conjunto de cursos procesados compartido entre workers, con límite de cursos válidos"""
+
+    def __init__(self, processed_courses=None, max_cursos=None):
+        # Se reutiliza el mismo set para que el llamador vea los cursos agregados
+        self.processed_courses = processed_courses if processed_courses is not None else set()
+        self.max_cursos = max_cursos
+        self.validos = 0
+        self._en_proceso = set()
+        self._detenido = False
+        self._lock = threading.Lock()
+
+    def limite_alcanzado(self):
+        """Indica si ya se encontraron max_cursos cursos válidos o se detuvo la búsqueda"""
+        with self._lock:
+            return self._detenido or (self.max_cursos is not None and self.validos >= self.max_cursos)
+
+    def detener(self):
+        """Dejar de buscar cursos aunque no se haya llegado al límite (nadie más los recibe)"""
+        with self._lock:
+            self._detenido = True
+
+    def detenido(self):
+        with self._lock:
+            return self._detenido
+
+    def reservar(self, course_id):
+        """Reservar un curso para verificarlo; False si ya fue procesado o lo verifica otro worker"""
+        with self._lock:
+            if course_id in self.processed_courses or course_id in self._en_proceso:
+                return False
+            self._en_proceso.add(course_id)
+            return True
+
+    def confirmar(self, course_id):
+        """Marcar un curso reservado como válido; False si el límite ya se alcanzó"""
+        with self._lock:
+            self._en_proceso.discard(course_id)
+            if self.max_cursos is not None and self.validos >= self.max_cursos:
+                return False
+            self.processed_courses.add(course_id)
+            self.validos += 1
+            return True
+
+    def liberar(self, course_id):
+        """Liberar la reserva de un curso que no resultó válido"""
+        with self._lock:
+            self._en_proceso.discard(course_id)
+
+
+class IndiceFuente(IndiceProcesados):
+    """Vista de un índice compartido con su propio límite de cursos válidos
+
+    Varias fuentes que se ejecutan a la vez deduplican contra el mismo índice,
+    pero cada una cuenta sus cursos válidos por separado.
+    """
+
+    def __init__(self, compartido, max_cursos=None):
+        super().__init__(compartido.processed_courses, max_cursos)
+        self.compartido = compartido
+
+    def limite_alcanzado(self):
+        return self.compartido.limite_alcanzado() or super().limite_alcanzado()
+
+    def detener(self):
+        self.compartido.detener()
+
+    def detenido(self):
+        return self.compartido.detenido()
+
+    def reservar(self, course_id):
+        return self.compartido.reservar(course_id)
+
+    def confirmar(self, course_id):
+        with self._lock:
+            if self.max_cursos is not None and self.validos >= self.max_cursos:
+                self.compartido.liberar(course_id)
+                return False
+            self.validos += 1
+        return self.compartido.confirmar(course_id)
+
+    def liberar(self, course_id):
+        self.compartido.liberar(course_id)
+
+
+class PoolNavegadores:
+    """Navegadores de los workers, abiertos la primera vez que se usan y reutilizados entre lotes
+
+    Una fuente paginada procesa una tanda de enlaces por página: con el mismo
+    pool cada página no abre ni cierra sus propios navegadores.
+    """
+
+    def __init__(self, crear_driver, num_workers):
+        self.crear_driver = crear_driver
+        self.drivers = [None] * max(1, num_workers)
+
+    def _driver(self, numero):
+        """Navegador del worker numero (se abre en su propio hilo la primera vez)"""
+        if self.drivers[numero - 1] is None:
+            self.drivers[numero - 1] = self.crear_driver()
+            print(f"🧵 Worker {numero}: navegador iniciado")
+        return self.drivers[numero - 1]
+
+    def procesar(self, urls, procesar, indice):
+        """Repartir las URLs entre los navegadores y devolver los resultados válidos
+
+        procesar(driver, url) debe devolver el curso encontrado o None.
+        Los workers dejan de tomar enlaces en cuanto el índice alcanza su límite.
+        """
+        if not urls:
+            return []
+        cola = queue.Queue()
+        for url in urls:
+            cola.put(url)
+
+        resultados = []
+        lock_resultados = threading.Lock()
+        num_workers = min(len(self.drivers), len(urls))
+
+        def worker(numero):
+            try:
+                driver = self._driver(numero)
+            except Exception as e:
+                print(f"❌ Worker {numero}: no se pudo iniciar el navegador: {e}")
+                return
+            while not indice.limite_alcanzado():
+                try:
+                    url = cola.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    resultado = procesar(driver, url)
+                    if resultado:
+                        with lock_resultados:
+                            resultados.append(resultado)
+                except Exception as e:
+                    print(f"⚠️ Worker {numero}: error procesando {url}: {e}")
+
+        print(f"🚀 Procesando {len(urls)} enlaces con {num_workers} navegadores en paralelo...")
+        hilos = [threading.Thread(target=worker, args=(n + 1,), daemon=True) for n in range(num_workers)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        return resultados
+
+    def cerrar(self):
+        """Cerrar los navegadores abiertos"""
+        for numero, driver in enumerate(self.drivers, 1):
+            if driver is None:
+                continue
+            try:
+                driver.quit()
+            except:
+                pass
+            print(f"🧵 Worker {numero}: terminado")
+        self.drivers = [None] * len(self.drivers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def ejecutar_en_pool(urls, procesar, crear_driver, num_workers, indice):
+    """Procesar un único lote de URLs con un pool que se cierra al terminar
+
+    procesar(driver, url) debe devolver el curso encontrado o None.
+    """
+    if not urls:
+        return []
+    with PoolNavegadores(crear_driver, num_workers) as pool:
+        return pool.procesar(urls, procesar, indice)
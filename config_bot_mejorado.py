@@ -9,6 +9,7 @@ BOT_CONFIG = {
     "timeout": 10,                       # Timeout para esperar elementos (segundos)
     "delay_between_requests": 2,         # Delay entre requests (segundos)
     "max_retries": 3,                    # Máximo número de reintentos
+    "workers": 1,                        # Navegadores en paralelo para verificar cursos (1 = secuencial)
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
@@ -29,6 +30,17 @@ SCREENSHOT_CONFIG = {
     ]
 }
 
+# Configuración de las fuentes de cupones
+SOURCES_CONFIG = {
+    "enabled_sources": [                 # Fuentes a recorrer (nombres registrados en source_adapters)
+        "cursosdev_categorias",
+        "cursosdev",
+        "couponscorpion"
+    ],
+    "max_courses_per_source": 10,        # Cursos válidos como máximo por fuente
+    "concurrent": True                   # Recorrer las fuentes en paralelo (un navegador por fuente)
+}
+
 # Configuración de CursosDev
 CURSOSDEV_CONFIG = {
     "base_url": "https://cursosdev.com",
@@ -37,12 +49,17 @@ CURSOSDEV_CONFIG = {
         r'https://cursosdev\.com/.*?udemy.*?',
         r'https://www\.udemy\.com/course/.*?',
         r'https://udemy\.com/course/.*?'
-    ]
+    ],
+    "categories": [],                    # Categorías a recorrer (vacío = descubrirlas en la portada)
+    "max_pages_per_category": 10,        # Páginas numeradas (/1, /2, ...) como máximo por categoría
+    "page_concurrency": 4,               # Páginas descargadas a la vez
+    "stop_after_seen": 3                 # Dejar una categoría tras este número de cursos ya vistos seguidos
 }
 
 # Configuración de Udemy
 UDEMY_CONFIG = {
-    "base_url": "https://www.udemy.com",
+    "base_url": "https://www.udemy.com",   # Con udemy_standin.py se puede apuntar a http://127.0.0.1:<puerto>
+    "http_verification": True,           # Consultar la API de precios por HTTP antes de abrir el navegador
     "price_selectors": [                 # Selectores para encontrar precios
         "span[data-purpose='price-text']",
         ".price-text",
@@ -69,25 +86,15 @@ GITHUB_CONFIG = {
 # Configuración del navegador Chrome
 CHROME_CONFIG = {
     "headless": True,                    # Ejecutar en modo headless
-    "window_size": "1920x1080",          # Tamaño de ventana
-    "disable_images": False,             # Deshabilitar carga de imágenes
-    "disable_javascript": False,         # Deshabilitar JavaScript
-    "user_data_dir": None,               # Directorio de datos de usuario
-    "arguments": [                       # Argumentos adicionales de Chrome
+    "window_size": "1920,1080",          # Tamaño de ventana
+    "block_resources": True,             # Bloquear imágenes, multimedia, fuentes y rastreadores al hacer scraping
+    "extra_blocked_urls": [],            # Patrones de URL adicionales a bloquear (comodín *)
+    "arguments": [                       # Argumentos adicionales de Chrome (solo switches reales)
         "--no-sandbox",
         "--disable-dev-shm-usage",
         "--disable-gpu",
-        "--disable-web-security",
-        "--disable-features=VizDisplayCompositor",
         "--disable-extensions",
-        "--disable-plugins",
-        "--disable-images",
-        "--disable-javascript",
-        "--disable-css",
-        "--disable-fonts",
-        "--disable-animations",
-        "--disable-video",
-        "--disable-audio",
+        "--mute-audio",
         "--disable-background-timer-throttling",
         "--disable-backgrounding-occluded-windows",
         "--disable-renderer-backgrounding",
@@ -177,7 +184,8 @@ SECURITY_CONFIG = {
     "user_agent_rotation": False,        # Rotación de User-Agent
     "proxy_usage": False,                # Uso de proxy
     "rate_limiting": True,               # Limitación de velocidad
-    "requests_per_minute": 30            # Requests por minuto
+    "requests_per_minute": 30,           # Requests por minuto (por host)
+    "burst": 5                           # Requests seguidos permitidos antes de aplicar el ritmo
 }
 
 # Configuración de notificaciones
@@ -230,6 +238,70 @@ CLEANUP_CONFIG = {
     "max_backup_age": 90                 # Edad máxima de backups (días)
 }
 
+# Configuración de sesiones de navegador
+SESSION_CONFIG = {
+    "keep_alive": True,                  # Mantener los navegadores abiertos entre ejecuciones
+    "state_file": "browser_sessions.json",  # Puertos y usos de los navegadores abiertos
+    "max_uses": 20,                      # Reciclar un navegador tras este número de ejecuciones
+    "debug_port_base": 9230              # Puerto de depuración del primer perfil
+}
+
+# Configuración de caché de verificaciones
+CACHE_CONFIG = {
+    "enable_cache": True,                # Reutilizar verificaciones recientes
+    "cache_file": "verification_cache.db",  # Base de datos SQLite de la caché
+    "ttl_hours": 12,                     # Vigencia de un curso verificado como gratis (horas)
+    "negative_ttl_hours": 6,             # Vigencia de un curso verificado como de pago (horas)
+    "max_entries": 5000                  # Máximo de entradas antes de desalojar las más antiguas
+}
+
+# Configuración de la deduplicación de cursos entre fuentes
+DEDUP_CONFIG = {
+    "id_map_file": "course_ids.json",    # Equivalencias slug ↔ ID numérico aprendidas
+    "resolve_numeric_ids": True          # Resolver por HTTP el slug de un ID numérico desconocido
+}
+
+# Configuración del modo incremental
+INCREMENTAL_CONFIG = {
+    "enable_incremental": True,          # Partir de los cursos de la ejecución anterior
+    "state_file": "courses.json",        # Salida de la ejecución anterior
+    "max_entry_age_hours": 72,           # Vigencia de un curso publicado antes de volver a verificarlo (horas)
+    "stop_after_known": 3,               # Dejar un listado tras este número de cursos conocidos seguidos
+    "max_courses": 50                    # Máximo de cursos en la salida fusionada
+}
+
+# Configuración del barrido de cupones ya publicados
+SWEEPER_CONFIG = {
+    "enable_sweeper": True,              # Revisar en segundo plano los cursos publicados
+    "interval_minutes": 30,              # Tiempo entre barridos (minutos)
+    "batch_size": 10,                    # Cursos revisados por barrido, los más antiguos primero
+    "min_age_hours": 6                   # No revisar cursos comprobados hace menos de esto (horas)
+}
+
+# Configuración del pipeline extracción → verificación → publicación
+PIPELINE_CONFIG = {
+    "queue_size": 10,                    # Capacidad de cada cola entre etapas (backpressure)
+    "publish_batch": 5,                  # Subir el sitio cada este número de cursos nuevos
+    "publish_interval": 120              # ...o tras este tiempo desde la última subida (segundos)
+}
+
+# Grabación y reproducción de páginas sin red (page_fixtures.py)
+FIXTURES_CONFIG = {
+    "mode": None,                        # "record" graba cada página visitada, "replay" la sirve en local
+    "directory": "fixtures",             # Respuestas comprimidas (gzip) e índice URL → archivo
+    "port": 0                            # Puerto del servidor de reproducción (0 = uno libre)
+}
+
+# Benchmark de extremo a extremo sobre fixtures servidas en local (benchmark_bot.py)
+BENCHMARK_CONFIG = {
+    "sizes": [10, 100, 10000],           # Número de cursos de cada ronda
+    "history_file": "benchmark_history.json",  # Historial de resultados (una entrada por ejecución)
+    "regression_threshold": 0.25,        # Falla si una etapa es más de un 25% más lenta que la referencia
+    "baseline_runs": 5,                  # Referencia: mediana de las últimas ejecuciones
+    "min_regression_seconds": 0.05,      # Diferencias menores se consideran ruido
+    "screenshot_sample": 50              # Capturas procesadas por ronda (el resto se extrapola)
+}
+
 # Configuración de desarrollo
 DEV_CONFIG = {
     "debug_mode": False,                 # Modo debug
@@ -238,7 +310,21 @@ DEV_CONFIG = {
     "test_mode": False,                  # Modo de prueba
     "dry_run": False,                    # Ejecución sin cambios
     "profile_performance": False,        # Perfil de rendimiento
-    "memory_tracking": False             # Rastreo de memoria
+    "memory_tracking": False,            # Rastreo de memoria
+    "profile_webdriver": False,          # Contar y cronometrar los comandos WebDriver por tipo y punto de llamada
+    "trace_export": False,               # Guardar la línea de tiempo de la ejecución (chrome://tracing / Perfetto)
+    "profile_dir": "profiles",           # Carpeta de los .prof y los informes de memoria
+    "profile_top_n": 25,                 # Funciones del resumen del perfil de CPU
+    "memory_top_n": 10,                  # Puntos de asignación del informe de memoria
+    "webdriver_top_n": 15,               # Puntos de llamada del informe de comandos WebDriver
+    "memory_stages": [                   # Tramos de run_metrics tras los que se toma una instantánea
+        "extraccion",
+        "captura",
+        "html",
+        "git",
+        "whatsapp",
+        "ejecucion"
+    ]
 }
 
 # Exportar todas las configuraciones
@@ -246,6 +332,7 @@ ALL_CONFIGS = {
     "bot": BOT_CONFIG,
     "screenshot": SCREENSHOT_CONFIG,
     "cursosdev": CURSOSDEV_CONFIG,
+    "sources": SOURCES_CONFIG,
     "udemy": UDEMY_CONFIG,
     "github": GITHUB_CONFIG,
     "chrome": CHROME_CONFIG,
@@ -259,6 +346,14 @@ ALL_CONFIGS = {
     "stats": STATS_CONFIG,
     "backup": BACKUP_CONFIG,
     "cleanup": CLEANUP_CONFIG,
+    "session": SESSION_CONFIG,
+    "cache": CACHE_CONFIG,
+    "dedup": DEDUP_CONFIG,
+    "incremental": INCREMENTAL_CONFIG,
+    "sweeper": SWEEPER_CONFIG,
+    "pipeline": PIPELINE_CONFIG,
+    "fixtures": FIXTURES_CONFIG,
+    "benchmark": BENCHMARK_CONFIG,
     "dev": DEV_CONFIG
 }
 
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Barrido en segundo plano de los cupones ya publicados
+Vuelve a verificar por tandas las entradas de courses.json (primero las que
+llevan más tiempo sin comprobarse), quita las que ya no son gratis y
+republica el sitio solo cuando algo cambió
+"""
+import threading
+from datetime import datetime, timedelta
+
+from incremental_state import cargar_cursos_anteriores, fecha_comprobacion
+from verification_cache import obtener_cache
+from config_bot_mejorado import get_config
+
+
+def ultima_comprobacion(curso):
+    """Fecha de la última verificación de una entrada (checked_at o, si no hay, extracted_at)"""
+    return fecha_comprobacion(curso) or datetime.min
+
+
+def cursos_por_revisar(cursos, lote=10, edad_minima_horas=6):
+    """Las lote entradas comprobadas hace más tiempo, si superan la edad mínima"""
+    limite = datetime.now() - timedelta(hours=edad_minima_horas)
+    pendientes = [curso for curso in cursos if ultima_comprobacion(curso) <= limite]
+    pendientes.sort(key=ultima_comprobacion)
+    return pendientes[:lote]
+
+
+def comprobar_cupon(curso, verificar):
+    """True/False si el cupón sigue gratis o no, None si no se pudo saber
+
+    No se consulta la caché de verificaciones: su vigencia es mayor que la edad
+    mínima del barrido, y una respuesta antigua daría la entrada por comprobada
+    (checked_at) sin volver a verificarla. El resultado nuevo sí se guarda en ella.
+    """
+    es_gratis = verificar(curso['url'])
+    cache = obtener_cache()
+    if es_gratis is not None and cache is not None:
+        cache.guardar(curso.get('course_id'), curso.get('coupon_code'), es_gratis)
+    return es_gratis
+
+
+class BarredorCupones:
+    """Hilo que revisa periódicamente los cursos publicados
+
+    verificar(url) devuelve True/False, o None si la verificación no pudo completarse.
+    publicar(cursos, republicar) guarda el sitio con las entradas que siguen vigentes
+    y lo sube a GitHub Pages si republicar es True (se eliminó alguna).
+    """
+
+    def __init__(self, verificar, publicar, ruta='courses.json', intervalo_minutos=30,
+                 lote=10, edad_minima_horas=6):
+        self.verificar = verificar
+        self.publicar = publicar
+        self.ruta = ruta
+        self.intervalo = intervalo_minutos * 60
+        self.lote = lote
+        self.edad_minima_horas = edad_minima_horas
+        self.revisados = 0
+        self.eliminados = 0
+        self._parar = threading.Event()
+        self._hilo = None
+
+    def barrer(self):
+        """Revisar una tanda de entradas; devuelve cuántas se eliminaron"""
+        revisar = cursos_por_revisar(cargar_cursos_anteriores(self.ruta), self.lote, self.edad_minima_horas)
+        if not revisar:
+            print("🧹 No hay cursos publicados pendientes de revisar")
+            return 0
+
+        print(f"🧹 Revisando {len(revisar)} cupones publicados (los más antiguos primero)...")
+        caducados = set()
+        comprobados = {}
+        for curso in revisar:
+            if self._parar.is_set():
+                break
+            try:
+                es_gratis = comprobar_cupon(curso, self.verificar)
+            except Exception as e:
+                print(f"⚠️ Error revisando {curso.get('course_id')}: {e}")
+                continue
+            self.revisados += 1
+            if es_gratis is None:
+                print(f"❓ No se pudo comprobar {curso.get('course_id')}, se mantiene")
+            elif es_gratis:
+                comprobados[curso['course_id']] = datetime.now().isoformat()
+            else:
+                print(f"🗑️ Cupón caducado: {curso.get('title', curso['course_id'])}")
+                caducados.add((curso['course_id'], curso.get('coupon_code')))
+
+        # Volver a leer el archivo por si otra ejecución lo reescribió durante el barrido
+        cursos = cargar_cursos_anteriores(self.ruta)
+        vigentes = []
+        for curso in cursos:
+            if (curso['course_id'], curso.get('coupon_code')) in caducados:
+                continue
+            if curso['course_id'] in comprobados:
+                curso['checked_at'] = comprobados[curso['course_id']]
+            vigentes.append(curso)
+
+        eliminados = len(cursos) - len(vigentes)
+        if comprobados or eliminados:
+            # Con solo fechas nuevas basta con guardar; con cursos eliminados se republica
+            self.publicar(vigentes, eliminados > 0)
+        self.eliminados += eliminados
+        print(f"🧹 Barrido completado: {eliminados} cursos eliminados, {len(vigentes)} siguen publicados")
+        return eliminados
+
+    def ejecutar(self):
+        """Barrer cada intervalo hasta que se llame a detener()"""
+        while not self._parar.is_set():
+            try:
+                self.barrer()
+            except Exception as e:
+                print(f"❌ Error en el barrido de cupones: {e}")
+            self._parar.wait(self.intervalo)
+
+    def iniciar(self):
+        """Arrancar el barrido periódico en un hilo en segundo plano"""
+        if self._hilo is None or not self._hilo.is_alive():
+            self._parar.clear()
+            self._hilo = threading.Thread(target=self.ejecutar, daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self, timeout=None):
+        """Pedir al hilo que termine tras el curso en revisión"""
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+
+def crear_barredor(verificar, publicar):
+    """Barredor configurado según SWEEPER_CONFIG, o None si está deshabilitado"""
+    config = get_config('sweeper')
+    if not config.get('enable_sweeper', False):
+        return None
+    return BarredorCupones(
+        verificar,
+        publicar,
+        ruta=get_config('incremental').get('state_file', 'courses.json'),
+        intervalo_minutos=config.get('interval_minutes', 30),
+        lote=config.get('batch_size', 10),
+        edad_minima_horas=config.get('min_age_hours', 6),
+    )
+
+
+def main():
+    """Ejecutar el barrido periódico hasta Ctrl+C, publicando en GitHub Pages"""
+    from bot_mejorado_simple import guardar_sitio, subir_a_github
+    from session_manager import liberar_driver, obtener_driver
+    from udemy_http import verificar_con_respaldo
+    from verification_cascade import verificar_en_navegador
+
+    # El navegador se abre con la primera verificación que no resuelva HTTP
+    driver = {}
+
+    def verificar_en_pagina(url):
+        if 'actual' not in driver:
+            driver['actual'] = obtener_driver("scraping")
+        return verificar_en_navegador(driver['actual'], url)
+
+    def verificar(url):
+        return verificar_con_respaldo(url, lambda: verificar_en_pagina(url))
+
+    def publicar(cursos, republicar):
+        guardar_sitio(cursos)
+        if republicar:
+            subir_a_github(len(cursos))
+
+    barredor = crear_barredor(verificar, publicar)
+    if barredor is None:
+        print("⚠️ El barrido de cupones está deshabilitado en SWEEPER_CONFIG")
+        return
+    print(f"🧹 Barrido de cupones cada {barredor.intervalo // 60} minutos (Ctrl+C para detener)")
+    try:
+        barredor.ejecutar()
+    except KeyboardInterrupt:
+        print("\n⏹️ Barrido detenido")
+    finally:
+        if 'actual' in driver:
+            liberar_driver(driver['actual'], "scraping")
+        print(f"📊 Cupones revisados: {barredor.revisados}, eliminados: {barredor.eliminados}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Identidad canónica de los cursos de Udemy
+- URL canónica: sin envoltorios de afiliados ni parámetros de rastreo, y con
+  los enlaces de checkout convertidos en la ficha del curso
+- Índice persistente slug ↔ ID numérico aprendido de las páginas ya visitadas,
+  para que /course/flutter-gemini/ y /course/5123456/ cuenten como el mismo curso
+"""
+import json
+import os
+import re
+import threading
+from urllib.parse import parse_qsl, urljoin, urlparse
+
+from http_client import descargar, http_disponible
+from redirect_resolver import desenvolver
+from config_bot_mejorado import get_config
+
+PATRON_CURSO = re.compile(r'/course/([^/?#]+)')
+PATRON_CHECKOUT = re.compile(r'/payment/checkout/.*?/course/(\d+)')
+
+# Parámetros que contienen el cupón; el resto (utm_*, ranMID, ranEAID...) es rastreo
+PARAMETROS_CUPON = ("couponCode", "discountCode")
+
+
+def es_url_udemy(url):
+    host = urlparse(url).netloc.lower()
+    return host == "udemy.com" or host.endswith(".udemy.com")
+
+
+def identificador_en_url(url):
+    """Slug o ID numérico que aparece en la URL del curso, o None"""
+    if not url:
+        return None
+    coincidencia = PATRON_CHECKOUT.search(url) or PATRON_CURSO.search(url)
+    return coincidencia.group(1) if coincidencia else None
+
+
+def cupon_en_url(url):
+    """Código de cupón de la URL (couponCode o discountCode), o None"""
+    consulta = dict(parse_qsl(urlparse(url).query))
+    for parametro in PARAMETROS_CUPON:
+        if consulta.get(parametro):
+            return consulta[parametro]
+    return None
+
+
+def url_canonica(url):
+    """https://www.udemy.com/course/<id>/ con solo el couponCode, sea cual sea el enlace de origen"""
+    if not url:
+        return url
+    url = desenvolver(url)
+    identificador = identificador_en_url(url)
+    if not es_url_udemy(url) or not identificador:
+        return url
+    canonica = f"https://www.udemy.com/course/{identificador}/"
+    cupon = cupon_en_url(url)
+    return f"{canonica}?couponCode={cupon}" if cupon else canonica
+
+
+class IndiceIdentidades:
+    """Equivalencias slug ↔ ID numérico guardadas en disco entre ejecuciones"""
+
+    def __init__(self, ruta=None, resolver_por_http=True):
+        self.ruta = ruta
+        self.resolver_por_http = resolver_por_http
+        self.id_a_slug = {}
+        self.slug_a_id = {}
+        self._sin_resolver = set()
+        self._lock = threading.Lock()
+        self.cargar()
+
+    def cargar(self):
+        if not self.ruta:
+            return
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return
+        for id_numerico, slug in datos.get('ids', {}).items():
+            self.id_a_slug[id_numerico] = slug
+            self.slug_a_id[slug] = id_numerico
+
+    def guardar(self):
+        """Escribir el índice (en un temporal y luego reemplazando, para no dejarlo a medias)"""
+        if not self.ruta:
+            return
+        with self._lock:
+            datos = {'ids': dict(self.id_a_slug)}
+        temporal = self.ruta + ".tmp"
+        try:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, indent=2, ensure_ascii=False)
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el índice de cursos: {e}")
+
+    def aprender(self, slug, id_numerico):
+        """Registrar que slug e id_numerico son el mismo curso; True si era nuevo"""
+        if not slug or not id_numerico or slug.isdigit():
+            return False
+        id_numerico = str(id_numerico)
+        with self._lock:
+            if self.id_a_slug.get(id_numerico) == slug:
+                return False
+            self.id_a_slug[id_numerico] = slug
+            self.slug_a_id[slug] = id_numerico
+        print(f"🆔 Curso {id_numerico} = {slug}")
+        self.guardar()
+        return True
+
+    def _resolver_id(self, id_numerico):
+        """Averiguar el slug de un ID numérico siguiendo la redirección de Udemy por HTTP"""
+        with self._lock:
+            if id_numerico in self._sin_resolver:
+                return None
+            self._sin_resolver.add(id_numerico)
+        url = f"https://www.udemy.com/course/{id_numerico}/"
+        respuesta = descargar(url, metodo="HEAD", allow_redirects=False)
+        if respuesta is None or not respuesta.is_redirect:
+            return None
+        slug = identificador_en_url(urljoin(url, respuesta.headers.get("Location", "")))
+        if slug and not slug.isdigit():
+            self.aprender(slug, id_numerico)
+            return slug
+        return None
+
+    def clave(self, url):
+        """Clave única del curso: su slug, también cuando la URL trae el ID numérico"""
+        canonica = url_canonica(url)
+        if not canonica or not es_url_udemy(canonica):
+            return None
+        identificador = identificador_en_url(canonica)
+        if not identificador or not identificador.isdigit():
+            return identificador
+        with self._lock:
+            slug = self.id_a_slug.get(identificador)
+        if slug is None and self.resolver_por_http and http_disponible():
+            slug = self._resolver_id(identificador)
+        return slug or identificador
+
+_indice = None
+_lock_indice = threading.Lock()
+
+
+def obtener_indice_identidades():
+    """Índice compartido según DEDUP_CONFIG"""
+    global _indice
+    with _lock_indice:
+        if _indice is None:
+            config = get_config('dedup')
+            _indice = IndiceIdentidades(
+                config.get('id_map_file', 'course_ids.json'),
+                resolver_por_http=config.get('resolve_numeric_ids', True),
+            )
+        return _indice
+
+
+def identidad_curso(url):
+    """Clave canónica del curso de una URL de Udemy (None si la URL no es de un curso)"""
+    return obtener_indice_identidades().clave(url)
+
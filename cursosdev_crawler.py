@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Rastreador de CursosDev por categorías y páginas numeradas
+Recorre https://cursosdev.com/category/<categoria>/1, /2, ... directamente
+(sin scroll), descargando varias páginas a la vez y dejando una categoría
+en cuanto aparecen cursos ya vistos
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml es opcional en requirements_bot_mejorado.txt
+    lxml_html = None
+
+from http_client import descargar
+from link_harvester import recolectar_enlaces, recolectar_enlaces_html, urls_de_cursos
+from listing_fetcher import obtener_enlaces_listado
+from page_waits import navegar
+from config_bot_mejorado import get_config
+
+PATRON_CATEGORIA = re.compile(r'^https?://(?:www\.)?cursosdev\.com/category/([\w-]+)')
+
+# Categoría usada si no se puede descubrir ninguna
+CATEGORIA_POR_DEFECTO = "it-and-software"
+
+
+def url_categoria(base_url, slug):
+    return f"{base_url}/category/{slug}"
+
+
+def url_pagina(url_base_categoria, numero):
+    """URL de la página numero (1, 2, ...) de una categoría"""
+    return f"{url_base_categoria.rstrip('/')}/{numero}"
+
+
+class RastreadorCursosDev:
+    """Descubre las categorías y recorre sus páginas con concurrencia limitada
+
+    conocido(url) permite marcar como vistos los enlaces de ejecuciones anteriores;
+    los enlaces encontrados en esta ejecución (en cualquier categoría) también cuentan.
+    """
+
+    def __init__(self, conocido=None):
+        config = get_config('cursosdev')
+        self.base_url = config.get('base_url', 'https://cursosdev.com').rstrip('/')
+        self.categorias = config.get('categories', [])
+        self.max_paginas = config.get('max_pages_per_category', 10)
+        self.concurrencia = max(1, config.get('page_concurrency', 4))
+        self.parar_tras = config.get('stop_after_seen', 3)
+        self.patrones_post = [re.compile(patron) for patron in config.get('link_patterns', [])]
+        self.conocido = conocido
+        self.vistos = set()
+
+    def es_post(self, url):
+        """Indica si un enlace es la ficha de un curso (y no navegación, categorías o paginación)"""
+        if PATRON_CATEGORIA.match(url):
+            return False
+        return any(patron.match(url) for patron in self.patrones_post)
+
+    def descubrir_categorias(self, driver=None):
+        """URLs base de las categorías: las configuradas o las enlazadas desde la portada"""
+        if self.categorias:
+            return [url_categoria(self.base_url, slug) for slug in self.categorias]
+
+        hrefs = []
+        respuesta = descargar(self.base_url + "/") if lxml_html is not None else None
+        if respuesta is not None and respuesta.status_code == 200:
+            try:
+                documento = lxml_html.fromstring(respuesta.text)
+                hrefs = [enlace['href'] for enlace in recolectar_enlaces_html(documento, respuesta.url)]
+            except Exception as e:
+                print(f"⚠️ Error analizando la portada de CursosDev: {e}")
+        if not hrefs and driver is not None:
+            navegar(driver, self.base_url + "/")
+            hrefs = [enlace['href'] for enlace in recolectar_enlaces(driver)]
+
+        slugs = []
+        for href in hrefs:
+            coincidencia = PATRON_CATEGORIA.match(href)
+            if coincidencia and coincidencia.group(1) not in slugs:
+                slugs.append(coincidencia.group(1))
+        if not slugs:
+            print("⚠️ No se encontraron categorías, se usará la categoría por defecto")
+            slugs = [CATEGORIA_POR_DEFECTO]
+        print(f"🗂️ {len(slugs)} categorías de CursosDev: {', '.join(slugs)}")
+        return [url_categoria(self.base_url, slug) for slug in slugs]
+
+    def _enlaces_pagina(self, url, driver=None):
+        """Enlaces de cursos de una página por HTTP; con el navegador si hace falta y se dispone de él"""
+        urls = obtener_enlaces_listado(url)
+        if urls is None and driver is not None:
+            navegar(driver, url)
+            urls = urls_de_cursos(recolectar_enlaces(driver))
+        return [href for href in (urls or []) if self.es_post(href)]
+
+    def _descargar_lote(self, urls, driver):
+        """Descargar varias páginas a la vez (en orden); sin HTTP se usa el navegador, una a una"""
+        if self.concurrencia == 1 or len(urls) == 1:
+            return [self._enlaces_pagina(url, driver) for url in urls]
+        with ThreadPoolExecutor(max_workers=self.concurrencia) as pool:
+            resultados = list(pool.map(self._enlaces_pagina, urls))
+        # Las páginas que necesitaron JavaScript se repiten con el navegador
+        return [
+            enlaces if enlaces or driver is None else self._enlaces_pagina(url, driver)
+            for url, enlaces in zip(urls, resultados)
+        ]
+
+    def recorrer_categoria(self, url_base_categoria, driver=None):
+        """Generar los enlaces nuevos de cada página de la categoría, en orden
+
+        Se deja la categoría al llegar a una página vacía, al máximo de páginas
+        o tras parar_tras enlaces ya vistos seguidos (los listados van del más
+        reciente al más antiguo).
+        """
+        seguidos = 0
+        for inicio in range(1, self.max_paginas + 1, self.concurrencia):
+            numeros = range(inicio, min(inicio + self.concurrencia, self.max_paginas + 1))
+            lote = self._descargar_lote([url_pagina(url_base_categoria, n) for n in numeros], driver)
+            for numero, enlaces in zip(numeros, lote):
+                if not enlaces:
+                    print(f"📄 Página {numero} sin cursos, fin de la categoría")
+                    return
+                nuevos = []
+                for href in enlaces:
+                    visto = href in self.vistos or (self.conocido is not None and self.conocido(href))
+                    seguidos = seguidos + 1 if visto else 0
+                    if self.parar_tras and seguidos >= self.parar_tras:
+                        print(f"⏹️ Cursos ya vistos en la página {numero}, fin de la categoría")
+                        if nuevos:
+                            yield nuevos
+                        return
+                    if not visto:
+                        self.vistos.add(href)
+                        nuevos.append(href)
+                print(f"📄 Página {numero}: {len(nuevos)} cursos nuevos de {len(enlaces)}")
+                if nuevos:
+                    yield nuevos
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Perfilado de CPU y seguimiento de memoria de una ejecución completa
+Con DEV_CONFIG['profile_performance'] la ejecución se perfila con cProfile
+(también los hilos que arranque) y se guarda el .prof junto a un resumen con
+las funciones más costosas. Con DEV_CONFIG['memory_tracking'] se toma una
+instantánea de tracemalloc al cerrar cada etapa (los tramos de run_metrics
+listados en DEV_CONFIG['memory_stages']) y se informa de los puntos del
+código que más memoria asignan. Con DEV_CONFIG['profile_webdriver'] se
+cuentan los comandos WebDriver de la ejecución (webdriver_profiler) y con
+DEV_CONFIG['trace_export'] se guarda su línea de tiempo en formato Trace
+Event de Chrome (trace_export).
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from run_metrics import agregar_observador, quitar_observador
+from trace_export import detener_traza, iniciar_traza
+from webdriver_profiler import detener_registro, iniciar_registro
+from config_bot_mejorado import get_config
+
+# Las asignaciones de las herramientas de perfilado y de la importación de módulos no interesan
+FILTROS_MEMORIA = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def _mb(octetos):
+    return octetos / (1024 * 1024)
+
+
+def _ruta_salida(nombre, sufijo):
+    directorio = get_config('dev').get('profile_dir', 'profiles')
+    os.makedirs(directorio, exist_ok=True)
+    return os.path.join(directorio, f"{nombre}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{sufijo}")
+
+
+class PerfilCPU:
+    """cProfile del hilo actual y de los hilos que se arranquen mientras está activo"""
+
+    def __init__(self):
+        self.perfiles = []
+        self._lock = threading.Lock()
+
+    def _perfilar_hilo(self, *args):
+        # Primer evento de un hilo nuevo: se cambia este gancho por un perfilador propio
+        sys.setprofile(None)
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:  # Solo se admite un perfilador a la vez en algunas versiones
+            return
+        with self._lock:
+            self.perfiles.append(perfil)
+
+    def iniciar(self):
+        perfil = cProfile.Profile()
+        perfil.enable()
+        self.perfiles.append(perfil)
+        threading.setprofile(self._perfilar_hilo)
+
+    def detener(self):
+        threading.setprofile(None)
+        self.perfiles[0].disable()
+        with self._lock:
+            estadisticas = pstats.Stats(self.perfiles[0])
+            for perfil in self.perfiles[1:]:
+                estadisticas.add(perfil)
+        return estadisticas
+
+    def guardar(self, nombre, top_n=25):
+        """Guardar el .prof y el resumen de las top_n funciones por tiempo acumulado"""
+        estadisticas = self.detener()
+        ruta = _ruta_salida(nombre, ".prof")
+        estadisticas.dump_stats(ruta)
+        texto = io.StringIO()
+        estadisticas.stream = texto
+        estadisticas.sort_stats("cumulative").print_stats(top_n)
+        ruta_resumen = ruta[:-len(".prof")] + "_top.txt"
+        with open(ruta_resumen, 'w', encoding='utf-8') as f:
+            f.write(texto.getvalue())
+        print(f"🔬 Perfil de CPU guardado: {ruta} (resumen en {ruta_resumen})")
+        print(texto.getvalue())
+
+
+class SeguimientoMemoria:
+    """Instantáneas de tracemalloc en los límites de las etapas"""
+
+    def __init__(self, etapas, top_n=10):
+        self.etapas = etapas
+        self.top_n = top_n
+        self.marcas = []
+        self._anterior = None
+        self._lock = threading.Lock()
+        self._iniciado_aqui = False
+
+    def es_etapa(self, nombre):
+        return any(nombre == etapa or nombre.startswith(etapa + ".") for etapa in self.etapas)
+
+    def iniciar(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciado_aqui = True
+        self._anterior = tracemalloc.take_snapshot().filter_traces(FILTROS_MEMORIA)
+
+    def marcar(self, etapa):
+        """Instantánea al cerrar una etapa: memoria actual, pico y mayores crecimientos desde la anterior"""
+        with self._lock:
+            instantanea = tracemalloc.take_snapshot().filter_traces(FILTROS_MEMORIA)
+            actual, pico = tracemalloc.get_traced_memory()
+            crecimientos = [d for d in instantanea.compare_to(self._anterior, 'lineno') if d.size_diff > 0][:3]
+            self._anterior = instantanea
+            self.marcas.append((etapa, actual, pico, crecimientos))
+
+    def observar(self, nombre, inicio, fin, error, detalles=None):
+        if self.es_etapa(nombre):
+            self.marcar(nombre)
+
+    def informe(self):
+        """Texto con la memoria por etapa y los puntos que más memoria asignan"""
+        lineas = ["📈 Memoria por etapa:"]
+        for etapa, actual, pico, crecimientos in self.marcas:
+            lineas.append(f"   {etapa}: {_mb(actual):.1f} MB (pico {_mb(pico):.1f} MB)")
+            for diferencia in crecimientos:
+                marco = diferencia.traceback[0]
+                lineas.append(f"      +{diferencia.size_diff / 1024:.0f} KB {marco.filename}:{marco.lineno}")
+        lineas.append(f"🧠 Puntos con más memoria asignada (top {self.top_n}):")
+        instantanea = tracemalloc.take_snapshot().filter_traces(FILTROS_MEMORIA)
+        for estadistica in instantanea.statistics('lineno')[:self.top_n]:
+            marco = estadistica.traceback[0]
+            lineas.append(f"   {estadistica.size / 1024:.0f} KB en {estadistica.count} bloques: {marco.filename}:{marco.lineno}")
+        return "\n".join(lineas)
+
+    def guardar(self, nombre):
+        texto = self.informe()
+        if self._iniciado_aqui:
+            tracemalloc.stop()
+        ruta = _ruta_salida(nombre, "_memoria.txt")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+        print(texto)
+        print(f"🧠 Informe de memoria guardado: {ruta}")
+
+
+def guardar_informe_webdriver(nombre, registro, top_n=15):
+    """Mostrar el informe de comandos WebDriver y guardarlo en JSON"""
+    print(registro.informe(top_n))
+    veces, total = registro.totales()
+    ruta = _ruta_salida(nombre, "_webdriver.json")
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(dict(registro.como_dict(top_n), total_comandos=veces, total_segundos=round(total, 3)),
+                  f, indent=2, ensure_ascii=False)
+    print(f"🔌 Informe de comandos WebDriver guardado: {ruta}")
+
+
+_en_curso = False
+
+
+@contextmanager
+def perfilado(nombre):
+    """Perfilar una ejecución completa según DEV_CONFIG (se usa también como decorador)
+
+    Si ya hay una ejecución perfilada en curso (un bot que llama a otro) no hace nada.
+    """
+    global _en_curso
+    config = get_config('dev')
+    cpu = config.get('profile_performance', False)
+    memoria = config.get('memory_tracking', False)
+    comandos = config.get('profile_webdriver', False)
+    traza = config.get('trace_export', False)
+    if _en_curso or not (cpu or memoria or comandos or traza):
+        yield
+        return
+
+    _en_curso = True
+    perfil = seguimiento = None
+    if memoria:
+        seguimiento = SeguimientoMemoria(
+            config.get('memory_stages', []),
+            top_n=config.get('memory_top_n', 10),
+        )
+        seguimiento.iniciar()
+        agregar_observador(seguimiento.observar)
+    if comandos:
+        iniciar_registro()
+    if traza:
+        agregar_observador(iniciar_traza(nombre).observar)
+    if cpu:
+        perfil = PerfilCPU()
+        perfil.iniciar()
+    try:
+        yield
+    finally:
+        _en_curso = False
+        if perfil is not None:
+            try:
+                perfil.guardar(nombre, top_n=config.get('profile_top_n', 25))
+            except Exception as e:
+                print(f"⚠️ No se pudo guardar el perfil de CPU: {e}")
+        if seguimiento is not None:
+            quitar_observador(seguimiento.observar)
+            try:
+                seguimiento.guardar(nombre)
+            except Exception as e:
+                print(f"⚠️ No se pudo guardar el informe de memoria: {e}")
+        if comandos:
+            try:
+                guardar_informe_webdriver(nombre, detener_registro(), config.get('webdriver_top_n', 15))
+            except Exception as e:
+                print(f"⚠️ No se pudo guardar el informe de comandos WebDriver: {e}")
+        if traza:
+            traza = detener_traza()
+            quitar_observador(traza.observar)
+            try:
+                traza.guardar(_ruta_salida(nombre, "_trace.json"))
+            except Exception as e:
+                print(f"⚠️ No se pudo guardar la traza de la ejecución: {e}")
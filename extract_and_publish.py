@@ -4,24 +4,24 @@ Script para extraer cursos con capturas de pantalla y publicarlos en GitHub Page
 SIN envío a WhatsApp - Solo publicación web
 """
 import os
-import time
 import re
 import json
 import base64
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from course_identity import identidad_curso
+from page_waits import hacer_scroll, navegar, volver
+from redirect_resolver import resolver_redireccion
+from resource_blocking import renderizado_completo
+from dev_profiling import perfilado
+from run_metrics import contar, ejecucion_medida, medido
+from session_manager import liberar_driver, obtener_driver
 
 def extract_course_id(url):
-    """Extraer el ID único del curso de Udemy"""
+    """Extraer el ID único del curso de Udemy (su slug, aunque la URL traiga el ID numérico)"""
     try:
-        match = re.search(r'/course/([^/?]+)', url)
-        if match:
-            return match.group(1)
-        return url
+        return identidad_curso(url) or url
     except:
         return url
 
@@ -55,6 +55,7 @@ def extract_coupon_code_from_url(url):
     except:
         return None
 
+@medido("captura", contador="screenshots_taken")
 def take_screenshot(driver, course_name, index):
     """Tomar captura de pantalla del curso"""
     try:
@@ -70,8 +71,9 @@ def take_screenshot(driver, course_name, index):
         filename = f"{index:02d}_{safe_name}_{timestamp}.png"
         filepath = os.path.join(screenshots_dir, filename)
         
-        # Tomar screenshot
-        driver.save_screenshot(filepath)
+        # Tomar screenshot con la página completa (sin el bloqueo de imágenes y fuentes)
+        with renderizado_completo(driver):
+            driver.save_screenshot(filepath)
         print(f"Screenshot guardado: {filepath}")
         
         return filepath
@@ -79,6 +81,7 @@ def take_screenshot(driver, course_name, index):
         print(f"Error tomando screenshot: {e}")
         return None
 
+@medido("extraccion")
 def extract_courses_with_screenshots():
     """Extraer cursos con capturas de pantalla"""
     print("Extrayendo cursos con capturas de pantalla...")
@@ -88,28 +91,19 @@ def extract_courses_with_screenshots():
     courses = []
     
     try:
-        # Configurar Chrome
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Navegador del perfil de scraping
+        driver = obtener_driver("scraping")
         
         # Navegar a CursosDev
         print("Navegando a CursosDev...")
-        driver.get("https://cursosdev.com/")
-        time.sleep(3)
+        navegar(driver, "https://cursosdev.com/")
         
         # Hacer scroll para cargar más cursos
         print("Cargando cursos...")
         for scroll in range(3):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            if not hacer_scroll(driver):
+                print("📜 No se cargó más contenido")
+                break
         
         # Buscar enlaces de cursos
         course_links = driver.find_elements(By.XPATH, "//a[contains(@href, 'udemy.com') or contains(@href, 'coupons-udemy')]")
@@ -125,10 +119,10 @@ def extract_courses_with_screenshots():
                     continue
                 
                 print(f"\nProcesando curso {i+1}/{min(len(course_links), max_courses)}...")
+                contar("courses_processed")
                 
                 # Navegar al curso
-                driver.get(href)
-                time.sleep(3)
+                navegar(driver, href)
                 
                 # Buscar botón de cupón
                 coupon_button = None
@@ -150,47 +144,42 @@ def extract_courses_with_screenshots():
                     # Obtener href del botón
                     button_href = coupon_button.get_attribute("href")
                     
-                    if button_href and "linksynergy.com" in button_href:
-                        # Extraer URL final de linksynergy
-                        import urllib.parse
-                        murl_match = re.search(r'murl=([^&]+)', button_href)
-                        if murl_match:
-                            final_url = urllib.parse.unquote(murl_match.group(1))
+                    # Resolver el enlace sin navegador (linksynergy, proxies y redirecciones HTTP)
+                    final_url = resolver_redireccion(button_href)
+                    if final_url:
+                        # Extraer información del curso
+                        course_name = extract_course_name(final_url)
+                        coupon_code = extract_coupon_code_from_url(final_url)
+                        
+                        if coupon_code:
+                            # Tomar screenshot
+                            screenshot_path = take_screenshot(driver, course_name, len(courses))
+                            
+                            # Construir URL completa
+                            if "couponCode=" in final_url:
+                                full_url = final_url
+                            else:
+                                full_url = f"{final_url}?couponCode={coupon_code}"
+                            
+                            course_data = {
+                                'title': course_name,
+                                'url': full_url,
+                                'coupon_code': coupon_code,
+                                'screenshot': screenshot_path,
+                                'source': 'CursosDev',
+                                'extracted_at': datetime.now().isoformat()
+                            }
+                            
+                            courses.append(course_data)
+                            contar("courses_found")
+                            processed_courses.add(href)
                             
-                            if "udemy.com/course/" in final_url:
-                                # Extraer información del curso
-                                course_name = extract_course_name(final_url)
-                                coupon_code = extract_coupon_code_from_url(final_url)
-                                
-                                if coupon_code:
-                                    # Tomar screenshot
-                                    screenshot_path = take_screenshot(driver, course_name, len(courses))
-                                    
-                                    # Construir URL completa
-                                    if "couponCode=" in final_url:
-                                        full_url = final_url
-                                    else:
-                                        full_url = f"{final_url}?couponCode={coupon_code}"
-                                    
-                                    course_data = {
-                                        'title': course_name,
-                                        'url': full_url,
-                                        'coupon_code': coupon_code,
-                                        'screenshot': screenshot_path,
-                                        'source': 'CursosDev',
-                                        'extracted_at': datetime.now().isoformat()
-                                    }
-                                    
-                                    courses.append(course_data)
-                                    processed_courses.add(href)
-                                    
-                                    print(f"Curso agregado: {course_name}")
-                                    print(f"Cupon: {coupon_code}")
-                                    print(f"Screenshot: {screenshot_path}")
+                            print(f"Curso agregado: {course_name}")
+                            print(f"Cupon: {coupon_code}")
+                            print(f"Screenshot: {screenshot_path}")
                 
                 # Volver a la página principal
-                driver.back()
-                time.sleep(2)
+                volver(driver)
                 
             except Exception as e:
                 print(f"Error procesando curso {i+1}: {e}")
@@ -204,9 +193,9 @@ def extract_courses_with_screenshots():
         return []
     
     finally:
-        if driver:
-            driver.quit()
+        liberar_driver(driver, "scraping")
 
+@medido("html")
 def create_html_page(courses):
     """Crear página HTML con los cursos"""
     html_content = """
@@ -517,6 +506,8 @@ Página web con cursos gratuitos de Udemy extraídos de CursosDev.
         print(f"Error publicando: {e}")
         return False
 
+@perfilado("extract_and_publish")
+@ejecucion_medida("extract_and_publish")
 def main():
     """Función principal"""
     print("Bot de Extraccion y Publicacion de Cursos")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP compartido por los bots (sesión con pool de conexiones)
+"""
+import threading
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # requests es opcional en requirements_bot_mejorado.txt
+    requests = None
+
+from page_fixtures import grabando, grabar_respuesta, reproduciendo
+from rate_limiter import esperar_turno, registrar_respuesta
+from config_bot_mejorado import get_config
+
+_sesion = None
+_lock_sesion = threading.Lock()
+
+
+def http_disponible():
+    """Indica si la librería requests está instalada"""
+    return requests is not None
+
+
+def obtener_sesion():
+    """Obtener la sesión HTTP compartida (se crea la primera vez)"""
+    global _sesion
+    if requests is None:
+        return None
+    with _lock_sesion:
+        if _sesion is None:
+            _sesion = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            if reproduciendo():
+                # Las peticiones van al servidor de fixtures grabadas (page_fixtures)
+                from page_fixtures import AdaptadorReproduccion
+                adapter = AdaptadorReproduccion(pool_connections=10, pool_maxsize=20)
+            _sesion.mount("http://", adapter)
+            _sesion.mount("https://", adapter)
+            _sesion.headers.update({
+                "User-Agent": get_config('bot').get('user_agent', 'Mozilla/5.0'),
+                "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+            })
+        return _sesion
+
+
+def es_bloqueo(respuesta):
+    """Indica si la respuesta es un 429 o un desafío de Cloudflare"""
+    return (respuesta.status_code == 429
+            or respuesta.headers.get("cf-mitigated") == "challenge")
+
+
+def _segundos_retry_after(respuesta):
+    try:
+        return float(respuesta.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def descargar(url, metodo="GET", timeout=None, **kwargs):
+    """Hacer una petición con la sesión compartida; devuelve la respuesta o None si falla
+
+    Cada petición pide turno al limitador de velocidad del host, salvo al
+    reproducir fixtures grabadas.
+    """
+    sesion = obtener_sesion()
+    if sesion is None:
+        return None
+    if timeout is None:
+        timeout = get_config('error').get('network_timeout', 30)
+    if not reproduciendo():
+        esperar_turno(url)
+    try:
+        respuesta = sesion.request(metodo, url, timeout=timeout, **kwargs)
+    except Exception as e:
+        print(f"⚠️ Error HTTP en {url}: {e}")
+        return None
+    if grabando():
+        grabar_respuesta(respuesta)
+    bloqueado = es_bloqueo(respuesta)
+    registrar_respuesta(url, bloqueado, _segundos_retry_after(respuesta) if bloqueado else None)
+    return respuesta
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Modo incremental: parte del courses.json de la ejecución anterior
+Solo se verifican los pares curso/cupón nuevos y la salida se fusiona con
+las entradas anteriores que siguen vigentes
+"""
+import json
+from datetime import datetime, timedelta
+
+from config_bot_mejorado import get_config
+
+
+def cargar_cursos_anteriores(ruta):
+    """Leer la lista de cursos guardada por la ejecución anterior ([] si no existe)"""
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        return []
+    cursos = datos.get('courses', []) if isinstance(datos, dict) else datos
+    return [curso for curso in cursos if isinstance(curso, dict) and curso.get('course_id')]
+
+
+def clave_curso(curso):
+    """Par (course_id, coupon_code) que identifica una entrada"""
+    return curso.get('course_id'), curso.get('coupon_code')
+
+
+def fecha_comprobacion(curso):
+    """Fecha de la última verificación: la del barrido de cupones (checked_at) o la de extracción"""
+    for campo in ('checked_at', 'extracted_at'):
+        try:
+            return datetime.fromisoformat(curso.get(campo) or '')
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class EstadoIncremental:
+    """Pares curso/cupón ya publicados y parada anticipada al encontrarlos en un listado"""
+
+    def __init__(self, cursos_anteriores, max_horas=72, parar_tras=3, max_cursos=50):
+        limite = datetime.now() - timedelta(hours=max_horas)
+        # Las entradas caducadas no cuentan como conocidas: se vuelven a verificar
+        self.anteriores = [
+            curso for curso in cursos_anteriores
+            if (fecha_comprobacion(curso) or datetime.min) >= limite
+        ]
+        self.parar_tras = parar_tras
+        self.max_cursos = max_cursos
+        self._conocidos = {clave_curso(curso): curso for curso in self.anteriores}
+        self._por_origen = {curso['source_url']: curso for curso in self.anteriores if curso.get('source_url')}
+        self._seguidos = 0
+
+    def es_conocido(self, course_id, coupon_code):
+        """Indica si el par ya estaba en la salida anterior y sigue vigente"""
+        return (course_id, coupon_code) in self._conocidos
+
+    def curso_de_origen(self, url):
+        """Entrada anterior que salió de este enlace del listado, si la hay"""
+        return self._por_origen.get(url)
+
+    def nueva_pagina(self):
+        """Reiniciar el contador de conocidos seguidos al empezar otro listado"""
+        self._seguidos = 0
+
+    def debe_parar(self, conocido):
+        """Registrar si el enlace actual era conocido; True cuando hay parar_tras seguidos
+
+        Los listados muestran primero lo más reciente, así que una racha de
+        conocidos indica que el resto del listado ya se procesó antes.
+        """
+        self._seguidos = self._seguidos + 1 if conocido else 0
+        return self.parar_tras > 0 and self._seguidos >= self.parar_tras
+
+    def fusionar(self, nuevos):
+        """Cursos nuevos más los anteriores vigentes que no se repiten, del más reciente al más antiguo"""
+        ids_nuevos = {curso.get('course_id') for curso in nuevos}
+        fusionados = list(nuevos) + [curso for curso in self.anteriores if curso.get('course_id') not in ids_nuevos]
+        fusionados.sort(key=lambda curso: curso.get('extracted_at', ''), reverse=True)
+        return fusionados[:self.max_cursos] if self.max_cursos else fusionados
+
+
+def obtener_estado_incremental():
+    """Estado de la ejecución anterior según INCREMENTAL_CONFIG, o None si está deshabilitado"""
+    config = get_config('incremental')
+    if not config.get('enable_incremental', False):
+        return None
+    anteriores = cargar_cursos_anteriores(config.get('state_file', 'courses.json'))
+    estado = EstadoIncremental(
+        anteriores,
+        max_horas=config.get('max_entry_age_hours', 72),
+        parar_tras=config.get('stop_after_known', 3),
+        max_cursos=config.get('max_courses', 50),
+    )
+    print(f"📂 Modo incremental: {len(estado.anteriores)} cursos vigentes de la ejecución anterior")
+    return estado
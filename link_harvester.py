@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Recolección de enlaces en una sola llamada y clasificación en Python
+Sustituye las consultas XPath repetidas y los get_attribute("href") por enlace
+"""
+import re
+from urllib.parse import urljoin
+
+# Devuelve href, texto y contexto de todos los enlaces de la página en un solo viaje al navegador
+SCRIPT_RECOLECTAR_ENLACES = """
+const selectorArticulo = "article, div[class*='card'], div[class*='post'], div[class*='course'], div[class*='entry']";
+return Array.from(document.querySelectorAll('a[href]')).map(function (a) {
+    var propio = '';
+    for (var i = 0; i < a.childNodes.length; i++) {
+        if (a.childNodes[i].nodeType === 3) { propio += a.childNodes[i].nodeValue; }
+    }
+    return {
+        href: a.href,
+        texto: (a.innerText || '').trim().slice(0, 200),
+        texto_propio: propio,
+        en_titulo: !!a.closest('h1, h2, h3, h4, h5'),
+        en_articulo: !!a.closest(selectorArticulo),
+        en_lista: !!a.closest('ul, ol, li')
+    };
+});
+"""
+
+_PATRON_PALABRAS_CLAVE = re.compile(r'curso|course|udemy|cupón|coupon')
+_PATRON_CUPON = re.compile(r'cupón|coupon')
+_PATRON_OBTENER = re.compile(r'obtener|get')
+
+_SELECTOR_ARTICULO = re.compile(r'card|post|course|entry')
+
+
+# Reglas de clasificación en el mismo orden en que se hacían las consultas XPath
+REGLAS_ENLACES = [
+    ("udemy", lambda e: 'udemy.com' in e['href']),
+    ("coupons-udemy", lambda e: 'coupons-udemy' in e['href']),
+    ("titulo", lambda e: e['en_titulo']),
+    ("articulo", lambda e: e['en_articulo']),
+    ("palabra_clave", lambda e: _PATRON_PALABRAS_CLAVE.search(e['texto_propio']) is not None),
+    ("cupon", lambda e: _PATRON_CUPON.search(e['texto_propio']) is not None),
+    ("obtener", lambda e: _PATRON_OBTENER.search(e['texto_propio']) is not None),
+    ("lista", lambda e: e['en_lista']),
+]
+
+
+def es_url_de_curso(href):
+    """Filtrar solo URLs que parezcan ser de cursos individuales (no categorías)"""
+    return (('cursosdev.com' in href and ('coupons-udemy' in href or 'udemy.com' in href)) or
+            'udemy.com' in href or
+            # Excluir URLs de categorías como /courses/JavaScript, /courses/Angular, etc.
+            (href.startswith('https://cursosdev.com/') and
+             not href.startswith('https://cursosdev.com/courses/') and
+             not href.startswith('https://cursosdev.com/blog') and
+             not href.startswith('https://cursosdev.com/submit')))
+
+
+def filtrar_urls_de_cursos(hrefs):
+    """Quitar duplicados y enlaces que no son cursos, conservando el orden"""
+    urls = []
+    vistos = set()
+    for href in hrefs:
+        if href and href not in vistos and href.startswith('http') and es_url_de_curso(href):
+            vistos.add(href)
+            urls.append(href)
+    return urls
+
+
+def recolectar_enlaces(driver):
+    """Obtener todos los enlaces de la página actual con una sola llamada a execute_script"""
+    enlaces = driver.execute_script(SCRIPT_RECOLECTAR_ENLACES) or []
+    return [e for e in enlaces if e.get('href')]
+
+
+def recolectar_enlaces_html(documento, url_base):
+    """Obtener los mismos datos que recolectar_enlaces a partir de un documento lxml"""
+    enlaces = []
+    for a in documento.iter('a'):
+        href = a.get('href')
+        if not href:
+            continue
+        en_titulo = en_articulo = en_lista = False
+        for ancestro in a.iterancestors():
+            tag = ancestro.tag if isinstance(ancestro.tag, str) else ''
+            if tag in ('h1', 'h2', 'h3', 'h4', 'h5'):
+                en_titulo = True
+            elif tag in ('ul', 'ol', 'li'):
+                en_lista = True
+            elif tag == 'article' or (tag == 'div' and _SELECTOR_ARTICULO.search(ancestro.get('class') or '')):
+                en_articulo = True
+        enlaces.append({
+            'href': urljoin(url_base, href.strip()),
+            'texto': a.text_content().strip()[:200],
+            'texto_propio': (a.text or '') + ''.join(hijo.tail or '' for hijo in a),
+            'en_titulo': en_titulo,
+            'en_articulo': en_articulo,
+            'en_lista': en_lista,
+        })
+    return enlaces
+
+
+def clasificar_enlaces(enlaces):
+    """Agrupar los enlaces según las reglas precompiladas"""
+    grupos = {nombre: [] for nombre, _ in REGLAS_ENLACES}
+    for enlace in enlaces:
+        for nombre, regla in REGLAS_ENLACES:
+            if regla(enlace):
+                grupos[nombre].append(enlace['href'])
+    return grupos
+
+
+def urls_de_cursos(enlaces, nombres_grupos=None):
+    """Devolver las URLs de cursos únicas a partir de los enlaces recolectados
+
+    nombres_grupos limita las reglas usadas (por defecto todas, en su orden).
+    """
+    grupos = clasificar_enlaces(enlaces)
+    nombres = [nombre for nombre, _ in REGLAS_ENLACES if nombres_grupos is None or nombre in nombres_grupos]
+    for nombre in nombres:
+        print(f"🔍 Enlaces '{nombre}' encontrados: {len(grupos[nombre])}")
+    hrefs = [href for nombre in nombres for href in grupos[nombre]]
+    return filtrar_urls_de_cursos(hrefs)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Extracción rápida de listados de CursosDev por HTTP + lxml
+Si la página necesita JavaScript se devuelve None para usar Selenium
+"""
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml es opcional en requirements_bot_mejorado.txt
+    lxml_html = None
+
+from http_client import descargar, http_disponible
+from link_harvester import recolectar_enlaces_html, urls_de_cursos
+
+# Textos que indican una página de desafío o que depende de JavaScript
+MARCADORES_JAVASCRIPT = [
+    "cf-browser-verification",
+    "challenge-platform",
+    "just a moment...",
+    "verifique que usted es un ser humano",
+    "enable javascript",
+    "habilite javascript",
+]
+
+
+def necesita_javascript(contenido):
+    """Detectar páginas de desafío o que solo se renderizan con JavaScript"""
+    texto = contenido[:20000].lower()
+    return any(marcador in texto for marcador in MARCADORES_JAVASCRIPT)
+
+
+def obtener_enlaces_listado(url_listado):
+    """Descargar un listado por HTTP y devolver los enlaces de cursos, o None para usar Selenium"""
+    if lxml_html is None or not http_disponible():
+        return None
+
+    print(f"⚡ Descargando listado por HTTP: {url_listado}")
+    respuesta = descargar(url_listado)
+    if respuesta is None or respuesta.status_code != 200:
+        estado = respuesta.status_code if respuesta is not None else "sin respuesta"
+        print(f"⚠️ Descarga HTTP fallida ({estado}), se usará el navegador")
+        return None
+
+    contenido = respuesta.text
+    if necesita_javascript(contenido):
+        print("⚠️ La página requiere JavaScript, se usará el navegador")
+        return None
+
+    try:
+        documento = lxml_html.fromstring(contenido)
+        course_urls = urls_de_cursos(recolectar_enlaces_html(documento, respuesta.url))
+    except Exception as e:
+        print(f"⚠️ Error analizando el HTML del listado: {e}")
+        return None
+
+    if not course_urls:
+        print("⚠️ El HTML estático no contiene cursos, se usará el navegador")
+        return None
+
+    print(f"✅ {len(course_urls)} enlaces de cursos obtenidos sin navegador")
+    return course_urls
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Grabación y reproducción sin red de las páginas que visitan los bots
+Con FIXTURES_CONFIG['mode'] = "record" cada navegación (page_waits.navegar) y
+cada descarga HTTP (http_client.descargar) se guarda comprimida con gzip en el
+directorio de fixtures, con un índice URL → archivo (index.json).
+Con "replay" esas URLs se sirven desde un servidor local en
+http://127.0.0.1:<puerto>/<host>/<ruta>: navegar lleva allí al navegador y la
+sesión HTTP envía allí las peticiones sin cambiar las URLs que ve el código.
+
+Uso:
+    python page_fixtures.py grabar <modulo>[:<funcion>]      # ejecutar un bot grabando
+    python page_fixtures.py reproducir <modulo>[:<funcion>]  # ejecutar un bot sin red
+    python page_fixtures.py servir [puerto]                  # solo servir lo grabado
+    python page_fixtures.py listar                           # mostrar el índice
+"""
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlsplit
+
+from config_bot_mejorado import get_config, update_config
+
+TIPO_HTML = "text/html; charset=utf-8"
+
+# Atributos con URLs que se vuelven absolutas al grabar, para que los enlaces
+# relativos sigan apuntando al host real al reproducir
+_ATRIBUTO_URL = re.compile(r'''(\s(?:href|src|action)\s*=\s*)(["'])(.*?)\2''', re.IGNORECASE | re.DOTALL)
+_URL_SIN_RESOLVER = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', re.IGNORECASE)
+
+# Lo grabado no debe provocar peticiones a terceros al reproducirse en el navegador
+POLITICA_REPRODUCCION = "default-src 'self' 'unsafe-inline' data: blob:"
+
+
+def modo_fixtures():
+    """'record', 'replay' o None según FIXTURES_CONFIG"""
+    return get_config('fixtures').get('mode')
+
+
+def grabando():
+    return modo_fixtures() == "record"
+
+
+def reproduciendo():
+    return modo_fixtures() == "replay"
+
+
+def clave_fixture(url):
+    """Clave de una URL en el índice: host + ruta + consulta, sin esquema ni fragmento"""
+    partes = urlsplit(url)
+    clave = partes.netloc.lower() + (partes.path or "/")
+    return clave + ("?" + partes.query if partes.query else "")
+
+
+def absolutizar_enlaces(html, url_base):
+    """Resolver contra url_base las URLs relativas de href, src y action"""
+    def resolver(coincidencia):
+        valor = coincidencia.group(3)
+        if not valor.strip() or _URL_SIN_RESOLVER.match(valor.strip()):
+            return coincidencia.group(0)
+        comilla = coincidencia.group(2)
+        return f"{coincidencia.group(1)}{comilla}{urljoin(url_base, valor.strip())}{comilla}"
+    return _ATRIBUTO_URL.sub(resolver, html)
+
+
+class AlmacenFixtures:
+    """Respuestas grabadas (gzip) e índice URL → archivo en un directorio"""
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        self.ruta_indice = os.path.join(directorio, "index.json")
+        self.indice = {}
+        self._lock = threading.Lock()
+        self.cargar()
+
+    def cargar(self):
+        try:
+            with open(self.ruta_indice, 'r', encoding='utf-8') as f:
+                self.indice = json.load(f).get('urls', {})
+        except (OSError, ValueError):
+            self.indice = {}
+
+    def guardar_indice(self):
+        """Escribir el índice (en un temporal y luego reemplazando, para no dejarlo a medias)"""
+        with self._lock:
+            datos = {'urls': dict(self.indice)}
+        temporal = self.ruta_indice + ".tmp"
+        try:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, indent=2, ensure_ascii=False)
+            os.replace(temporal, self.ruta_indice)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el índice de fixtures: {e}")
+
+    def grabar(self, url, contenido=b"", estado=200, tipo=TIPO_HTML, location=None, guardar_indice=True):
+        """Guardar una respuesta bajo su URL (reemplaza la grabación anterior)
+
+        Al grabar muchas respuestas seguidas se puede pasar guardar_indice=False
+        y llamar a guardar_indice() una vez al final.
+        """
+        clave = clave_fixture(url)
+        archivo = hashlib.sha1(clave.encode('utf-8')).hexdigest()[:20] + ".gz"
+        os.makedirs(self.directorio, exist_ok=True)
+        with gzip.open(os.path.join(self.directorio, archivo), 'wb') as f:
+            f.write(contenido or b"")
+        entrada = {
+            'url': url,
+            'archivo': archivo,
+            'estado': estado,
+            'tipo': tipo,
+            'grabado': datetime.now().isoformat(),
+        }
+        if location:
+            entrada['location'] = urljoin(url, location)
+        with self._lock:
+            self.indice[clave] = entrada
+        if guardar_indice:
+            self.guardar_indice()
+            print(f"📼 Grabado ({estado}): {url}")
+        return entrada
+
+    def buscar(self, clave):
+        """Entrada de una clave; si no está, la de la misma URL sin la consulta"""
+        entrada = self.indice.get(clave)
+        if entrada is None and "?" in clave:
+            entrada = self.indice.get(clave.split("?", 1)[0])
+        return entrada
+
+    def leer(self, entrada):
+        with gzip.open(os.path.join(self.directorio, entrada['archivo']), 'rb') as f:
+            return f.read()
+
+    def url_original(self, clave):
+        entrada = self.buscar(clave)
+        return entrada['url'] if entrada else "https://" + clave
+
+
+_almacen = None
+_lock_almacen = threading.Lock()
+
+
+def obtener_almacen():
+    """Almacén compartido en FIXTURES_CONFIG['directory']"""
+    global _almacen
+    with _lock_almacen:
+        if _almacen is None:
+            _almacen = AlmacenFixtures(get_config('fixtures').get('directory', 'fixtures'))
+        return _almacen
+
+
+def grabar_pagina(driver, url):
+    """Grabar la página que el navegador muestra tras navegar a url
+
+    Si el navegador acabó en otra URL se graba también la redirección.
+    """
+    try:
+        url_final = driver.current_url
+        html = absolutizar_enlaces(driver.page_source, url_final)
+        almacen = obtener_almacen()
+        if clave_fixture(url_final) != clave_fixture(url):
+            almacen.grabar(url, estado=302, location=url_final)
+        almacen.grabar(url_final, html.encode('utf-8'))
+    except Exception as e:
+        print(f"⚠️ No se pudo grabar {url}: {e}")
+
+
+def grabar_respuesta(respuesta):
+    """Grabar una respuesta de requests y cada redirección que la precedió"""
+    try:
+        almacen = obtener_almacen()
+        for paso in list(respuesta.history) + [respuesta]:
+            tipo = paso.headers.get("Content-Type", "application/octet-stream")
+            contenido = paso.content
+            if "html" in tipo:
+                contenido = absolutizar_enlaces(paso.text, paso.url).encode('utf-8')
+                tipo = TIPO_HTML
+            almacen.grabar(paso.request.url, contenido, paso.status_code, tipo, paso.headers.get("Location"))
+    except Exception as e:
+        print(f"⚠️ No se pudo grabar {respuesta.url}: {e}")
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    almacen = None
+
+    def _responder(self, con_cuerpo):
+        clave = self.path.lstrip("/")
+        entrada = self.almacen.buscar(clave)
+        if entrada is None:
+            self.send_error(404, "Respuesta no grabada")
+            return
+        contenido = self.almacen.leer(entrada) if con_cuerpo else b""
+        self.send_response(entrada['estado'])
+        self.send_header("Content-Type", entrada['tipo'])
+        self.send_header("Content-Length", str(len(contenido)))
+        self.send_header("Content-Security-Policy", POLITICA_REPRODUCCION)
+        if entrada.get('location'):
+            # El navegador sigue la redirección dentro del servidor; la sesión HTTP la traduce de vuelta
+            self.send_header("Location", "/" + clave_fixture(entrada['location']))
+        self.end_headers()
+        if con_cuerpo:
+            self.wfile.write(contenido)
+
+    def do_GET(self):
+        self._responder(True)
+
+    def do_HEAD(self):
+        self._responder(False)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class ServidorFixtures:
+    """Servidor en un hilo en 127.0.0.1 que responde con lo grabado en un almacén"""
+
+    def __init__(self, almacen, puerto=0):
+        self.almacen = almacen
+        manejador = type("Manejador", (_Manejador,), {"almacen": almacen})
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+        self._servidor.daemon_threads = True
+        self._hilo = None
+        self.url_base = f"http://127.0.0.1:{self._servidor.server_address[1]}"
+
+    def url_local(self, url):
+        """URL del servidor que reproduce url"""
+        return f"{self.url_base}/{clave_fixture(url)}"
+
+    def url_original(self, url):
+        """URL real de una URL del servidor (las demás se devuelven tal cual)"""
+        if not url or not url.startswith(self.url_base + "/"):
+            return url
+        return self.almacen.url_original(url[len(self.url_base) + 1:])
+
+    def ejecutar(self):
+        """Servir en el hilo actual hasta Ctrl+C"""
+        try:
+            self._servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._servidor.server_close()
+
+    def iniciar(self):
+        """Servir en un hilo en segundo plano"""
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        if self._hilo is not None:
+            self._hilo.join()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *excepcion):
+        self.detener()
+
+
+_servidor = None
+_lock_servidor = threading.Lock()
+
+
+def obtener_servidor():
+    """Servidor de reproducción compartido (se arranca la primera vez)"""
+    global _servidor
+    with _lock_servidor:
+        if _servidor is None:
+            _servidor = ServidorFixtures(obtener_almacen(), get_config('fixtures').get('port', 0)).iniciar()
+            print(f"📼 Reproduciendo fixtures de {_servidor.almacen.directorio}/ en {_servidor.url_base}")
+        return _servidor
+
+
+def url_de_reproduccion(url):
+    """En modo replay, la URL del servidor local que sirve url; si no, url sin cambios"""
+    if not reproduciendo() or not url.lower().startswith(("http://", "https://")):
+        return url
+    servidor = obtener_servidor()
+    if url.startswith(servidor.url_base + "/"):
+        return url
+    return servidor.url_local(url)
+
+
+def url_original(url):
+    """Deshacer url_de_reproduccion (por ejemplo sobre driver.current_url)"""
+    if not reproduciendo() or _servidor is None:
+        return url
+    return _servidor.url_original(url)
+
+
+try:
+    from requests.adapters import HTTPAdapter
+except ImportError:  # requests es opcional en requirements_bot_mejorado.txt
+    HTTPAdapter = None
+
+if HTTPAdapter is not None:
+    class AdaptadorReproduccion(HTTPAdapter):
+        """Adaptador de requests que envía cada petición al servidor de reproducción
+
+        La respuesta conserva la URL real, así que las redirecciones y
+        respuesta.url se comportan igual que con red.
+        """
+
+        def send(self, request, **kwargs):
+            url = request.url
+            request.url = url_de_reproduccion(url)
+            try:
+                respuesta = super().send(request, **kwargs)
+            finally:
+                request.url = url
+            respuesta.url = url
+            if "Location" in respuesta.headers:
+                respuesta.headers["Location"] = url_original(urljoin(obtener_servidor().url_base, respuesta.headers["Location"]))
+            return respuesta
+
+
+def ejecutar_con_modo(modo, objetivo):
+    """Ejecutar modulo[:funcion] (main por defecto) con FIXTURES_CONFIG['mode'] = modo"""
+    nombre_modulo, _, nombre_funcion = objetivo.partition(":")
+    update_config('fixtures', 'mode', modo)
+    funcion = getattr(importlib.import_module(nombre_modulo), nombre_funcion or "main")
+    return funcion()
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] in ("grabar", "reproducir"):
+        ejecutar_con_modo("record" if sys.argv[1] == "grabar" else "replay", sys.argv[2])
+    elif len(sys.argv) > 1 and sys.argv[1] == "servir":
+        puerto = int(sys.argv[2]) if len(sys.argv) > 2 else 8766
+        servidor = ServidorFixtures(obtener_almacen(), puerto)
+        print(f"📼 Sirviendo {servidor.almacen.directorio}/ en {servidor.url_base} (Ctrl+C para detener)")
+        servidor.ejecutar()
+    elif len(sys.argv) > 1 and sys.argv[1] == "listar":
+        for clave, entrada in sorted(obtener_almacen().indice.items()):
+            print(f"{entrada['estado']} {entrada['tipo'].split(';')[0]:<24} {clave}")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
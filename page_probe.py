@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Sonda de una sola llamada para la ficha de un curso de Udemy
+Un único script evalúa en el navegador los selectores de la verificación y
+devuelve el HTML del documento, que el escáner de precios recorre una sola
+vez en Python, en lugar de leer page_source y lanzar una consulta XPath por
+selector.
+"""
+from course_identity import es_url_udemy, identificador_en_url, obtener_indice_identidades, url_canonica
+from page_fixtures import url_original
+from page_waits import MARCADORES_DESAFIO, esperar_sin_desafio, navegar
+from price_scanner import escaner_precios
+from config_bot_mejorado import get_config
+
+# Botones de inscripción gratuita
+SELECTORES_BOTON_GRATIS = [
+    "//button[contains(text(), 'Inscribirse gratis')]",
+    "//button[contains(text(), 'Enroll for free')]",
+    "//button[contains(text(), 'Inscribirse sin costo')]",
+    "//button[contains(text(), 'Enroll at no cost')]",
+    "//button[contains(text(), 'Inscribirse ahora')]",
+    "//button[contains(text(), 'Enroll now')]",
+    "//a[contains(text(), 'Inscribirse gratis')]",
+    "//a[contains(text(), 'Enroll for free')]",
+    "//button[contains(text(), 'Free')]",
+    "//button[contains(text(), 'Gratis')]",
+    "//a[contains(text(), 'Free')]",
+    "//a[contains(text(), 'Gratis')]",
+    "//span[contains(text(), 'Free')]",
+    "//span[contains(text(), 'Gratis')]"
+]
+
+# Elementos con precio $0 o 0€
+SELECTORES_PRECIO_CERO = [
+    "//span[contains(text(), '$0')]",
+    "//span[contains(text(), '0€')]",
+    "//span[contains(text(), '0.00')]",
+    "//div[contains(text(), '$0')]",
+    "//div[contains(text(), '0€')]",
+    "//div[contains(text(), '0.00')]"
+]
+
+# Botones de compra
+SELECTORES_COMPRA = [
+    "//button[contains(text(), 'Buy')]",
+    "//button[contains(text(), 'Comprar')]",
+    "//button[contains(text(), 'Purchase')]",
+    "//button[contains(text(), 'Add to cart')]",
+    "//button[contains(text(), 'Agregar al carrito')]",
+    "//button[contains(text(), 'Buy now')]",
+    "//button[contains(text(), 'Comprar ahora')]"
+]
+
+SCRIPT_SONDA = """
+var p = arguments[0];
+function primero(selectores) {
+    for (var i = 0; i < selectores.length; i++) {
+        try {
+            var r = document.evaluate(selectores[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null);
+            if (r.singleNodeValue) { return selectores[i]; }
+        } catch (e) {}
+    }
+    return null;
+}
+var s = {
+    url: location.href,
+    html: document.documentElement ? document.documentElement.outerHTML : "",
+    id_numerico: document.body ? document.body.getAttribute("data-clp-course-id") : null,
+    precio_elemento: null,
+    selector_gratis: primero(p.gratis),
+    selector_precio_cero: primero(p.cero),
+    selector_compra: primero(p.compra)
+};
+if (p.precio_css) {
+    var e = document.querySelector(p.precio_css);
+    s.precio_elemento = e ? e.innerText : null;
+}
+return s;
+"""
+
+# Solo se lanza si el escáner encontró algún indicador de gratis
+SCRIPT_EXISTE = """
+try {
+    return document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+} catch (e) {
+    return false;
+}
+"""
+
+
+def sondear(driver, escaner=escaner_precios):
+    """Ejecutar la sonda en la página abierta y devolver sus señales
+
+    El script recoge los selectores y el HTML del documento en una sola llamada;
+    precios e indicadores se buscan en Python con una pasada del escáner.
+
+    El dict devuelto tiene:
+        url: URL de la página (tras las redirecciones)
+        desafio: la página es una verificación de Cloudflare
+        id_numerico: data-clp-course-id de la ficha
+        precio_elemento: texto del elemento de precio (UDEMY_CONFIG['price_selectors'])
+        indicadores: indicadores de gratis del escáner encontrados, en orden de prioridad
+        precio / valor: el primer precio mayor a 0 del documento
+        selector_indicador: XPath del elemento con el indicador principal, si existe
+        selector_gratis / selector_precio_cero / selector_compra: primer XPath de cada grupo que existe
+    """
+    parametros = {
+        'precio_css': ", ".join(get_config('udemy').get('price_selectors', [])),
+        'gratis': SELECTORES_BOTON_GRATIS,
+        'cero': SELECTORES_PRECIO_CERO,
+        'compra': SELECTORES_COMPRA,
+    }
+    sonda = driver.execute_script(SCRIPT_SONDA, parametros) or {}
+    html = (sonda.pop('html', None) or "").lower()
+    veredicto = escaner.escanear(html)
+    sonda.update(
+        desafio=any(marcador in html for marcador in MARCADORES_DESAFIO),
+        indicadores=veredicto['indicadores'],
+        precio=veredicto['precio'],
+        valor=veredicto['valor'],
+        selector_indicador=None,
+    )
+    if veredicto['indicador']:
+        selector = f"//*[contains(text(), '{veredicto['indicador']}')]"
+        if driver.execute_script(SCRIPT_EXISTE, selector):
+            sonda['selector_indicador'] = selector
+    return sonda
+
+
+def aprender_de_sonda(sonda):
+    """Registrar la equivalencia slug ↔ ID numérico que trae la sonda de una ficha"""
+    url = url_original(sonda.get('url') or '')
+    slug = identificador_en_url(url)
+    if not slug or not es_url_udemy(url):
+        return False
+    try:
+        return obtener_indice_identidades().aprender(slug, sonda.get('id_numerico'))
+    except Exception as e:
+        print(f"⚠️ No se pudo registrar el ID numérico del curso: {e}")
+        return False
+
+
+def ficha_abierta(driver, udemy_url):
+    """True si el navegador ya muestra la ficha de udemy_url (por ejemplo, la abrió la cascada)"""
+    try:
+        return url_canonica(url_original(driver.current_url)) == url_canonica(udemy_url)
+    except Exception:
+        return False
+
+
+def abrir_y_sondear(driver, udemy_url, escaner=escaner_precios, timeout=15):
+    """Abrir la ficha y sondearla, esperando al desafío de Cloudflare si aparece
+
+    Devuelve las señales de sondear(), o None si no se pudo superar el desafío.
+    """
+    navegar(driver, udemy_url)
+    sonda = sondear(driver, escaner)
+    if sonda.get('desafio'):
+        print("⚠️ Detectada página de verificación Cloudflare, esperando...")
+        if not esperar_sin_desafio(driver, timeout=timeout):
+            print("❌ No se pudo completar la verificación Cloudflare")
+            return None
+        sonda = sondear(driver, escaner)
+    aprender_de_sonda(sonda)
+    return sonda
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Esperas basadas en eventos para Selenium (WebDriverWait + expected conditions)
+Sustituyen los time.sleep fijos después de driver.get, driver.back, clics y scroll
+"""
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from page_fixtures import grabando, grabar_pagina, reproduciendo, url_de_reproduccion
+from rate_limiter import esperar_turno, registrar_respuesta
+from run_metrics import tramo
+from config_bot_mejorado import get_config
+
+# Textos de las páginas de verificación de Cloudflare
+MARCADORES_DESAFIO = ["cloudflare", "verifique que usted es un ser humano"]
+
+# Títulos de las páginas de desafío (más barato que leer page_source tras cada navegación)
+TITULOS_DESAFIO = ["just a moment", "un momento", "attention required", "access denied"]
+
+
+def _timeout_carga(timeout):
+    return timeout if timeout is not None else get_config('error').get('page_load_timeout', 30)
+
+
+def _timeout_elemento(timeout):
+    return timeout if timeout is not None else get_config('error').get('element_wait_timeout', 10)
+
+
+def _esperar(driver, condicion, timeout, intervalo=0.2):
+    """Esperar una condición; devuelve su resultado o None si se agota el tiempo"""
+    try:
+        with tramo("espera"):
+            return WebDriverWait(driver, timeout, poll_frequency=intervalo).until(condicion)
+    except (TimeoutException, WebDriverException):
+        return None
+
+
+def esperar_condicion(driver, condicion, timeout=None):
+    """Esperar una condición arbitraria (callable o expected condition); su resultado o None"""
+    return _esperar(driver, condicion, _timeout_elemento(timeout))
+
+
+def pagina_lista(driver):
+    """Condición: el documento terminó de cargar"""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def esperar_pagina_lista(driver, timeout=None):
+    """Esperar a que document.readyState sea 'complete'"""
+    return bool(_esperar(driver, pagina_lista, _timeout_carga(timeout)))
+
+
+def titulo_de_desafio(driver):
+    """Indica si el título de la página es el de un desafío de Cloudflare"""
+    try:
+        titulo = (driver.title or "").lower()
+    except WebDriverException:
+        return False
+    return any(marcador in titulo for marcador in TITULOS_DESAFIO)
+
+
+def navegar(driver, url, timeout=None):
+    """driver.get seguido de la espera de carga del documento
+
+    Pide turno al limitador de velocidad del host e informa si la página es un desafío.
+    Con FIXTURES_CONFIG graba la página o la abre desde el servidor de fixtures.
+    """
+    if not reproduciendo():
+        esperar_turno(url)
+    with tramo("navegacion"):
+        driver.get(url_de_reproduccion(url))
+        lista = esperar_pagina_lista(driver, timeout)
+    if grabando():
+        grabar_pagina(driver, url)
+    registrar_respuesta(url, titulo_de_desafio(driver))
+    return lista
+
+
+def esperar_cambio_url(driver, url_anterior, timeout=None):
+    """Esperar a que la URL actual sea distinta de url_anterior"""
+    return bool(_esperar(driver, EC.url_changes(url_anterior), _timeout_elemento(timeout)))
+
+
+def volver(driver, timeout=None):
+    """driver.back esperando a que cambie la URL y cargue la página anterior"""
+    with tramo("navegacion"):
+        url_anterior = driver.current_url
+        driver.back()
+        esperar_cambio_url(driver, url_anterior, timeout)
+        return esperar_pagina_lista(driver, timeout)
+
+
+def clic_y_esperar(driver, elemento, timeout=None, espera_navegacion=3):
+    """Hacer clic en un elemento y esperar la navegación que provoque, si la hay
+
+    espera_navegacion limita cuánto se espera a que el clic cambie la URL,
+    para no pagar el timeout completo cuando el clic no navega.
+    """
+    url_anterior = driver.current_url
+    elemento.click()
+    if esperar_cambio_url(driver, url_anterior, espera_navegacion):
+        esperar_pagina_lista(driver, timeout)
+        return True
+    return False
+
+
+def esperar_elemento(driver, xpath, timeout=None, clicable=False):
+    """Esperar a que aparezca (o sea clicable) un elemento; devuelve el elemento o None"""
+    localizador = (By.XPATH, xpath)
+    condicion = EC.element_to_be_clickable(localizador) if clicable else EC.presence_of_element_located(localizador)
+    return _esperar(driver, condicion, _timeout_elemento(timeout))
+
+
+def esperar_alguno(driver, xpaths, timeout=None):
+    """Esperar al primero de varios selectores XPath; devuelve (xpath, elemento) o (None, None)"""
+    def alguno_presente(d):
+        for xpath in xpaths:
+            elementos = d.find_elements(By.XPATH, xpath)
+            if elementos:
+                return xpath, elementos[0]
+        return False
+
+    return _esperar(driver, alguno_presente, _timeout_elemento(timeout)) or (None, None)
+
+
+def hacer_scroll(driver, timeout=2):
+    """Ir al final de la página y esperar a que cargue más contenido
+
+    Devuelve False si la altura no cambió, para que el llamador deje de hacer scroll.
+    """
+    altura = driver.execute_script("return document.body.scrollHeight")
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    return bool(_esperar(
+        driver,
+        lambda d: d.execute_script("return document.body.scrollHeight") > altura,
+        timeout,
+    ))
+
+
+def hay_desafio(driver):
+    """Indica si la página actual es una verificación de Cloudflare"""
+    texto = driver.page_source.lower()
+    return any(marcador in texto for marcador in MARCADORES_DESAFIO)
+
+
+def esperar_sin_desafio(driver, timeout=None):
+    """Esperar a que desaparezca la verificación de Cloudflare; False si sigue presente"""
+    # page_source es grande: se consulta una vez por segundo
+    return bool(_esperar(driver, lambda d: not hay_desafio(d), _timeout_carga(timeout), intervalo=1))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Pipeline por etapas conectadas con colas acotadas
+El origen entrega cada curso en cuanto está listo, las etapas intermedias lo
+transforman en sus propios hilos y el sumidero lo publica sin esperar al resto.
+Las colas acotadas frenan al origen si el sumidero va más lento (backpressure).
+"""
+import queue
+import threading
+
+from config_bot_mejorado import get_config
+
+_FIN = object()
+
+
+class ColaAcotada:
+    """Cola con capacidad limitada que se puede cerrar y recorrer con for"""
+
+    def __init__(self, capacidad, productores=1):
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._productores = productores
+        self._lock = threading.Lock()
+        self.cancelada = threading.Event()
+
+    def poner(self, elemento):
+        """Encolar esperando si está llena; False si el consumidor ya terminó"""
+        while not self.cancelada.is_set():
+            try:
+                self._cola.put(elemento, timeout=0.5)
+                # cancelar() vacía la cola y puede dejar sitio a un productor que esperaba
+                return not self.cancelada.is_set()
+            except queue.Full:
+                continue
+        return False
+
+    def cerrar(self):
+        """Indicar que un productor terminó; con el último se marca el fin de la cola"""
+        with self._lock:
+            self._productores -= 1
+            if self._productores > 0:
+                return
+        self.poner(_FIN)
+
+    def cancelar(self):
+        """El consumidor no va a leer más: desbloquear a los productores"""
+        self.cancelada.set()
+        try:
+            while True:
+                self._cola.get_nowait()
+        except queue.Empty:
+            pass
+
+    def __iter__(self):
+        while True:
+            try:
+                elemento = self._cola.get(timeout=0.5)
+            except queue.Empty:
+                if self.cancelada.is_set():
+                    return
+                continue
+            if elemento is _FIN:
+                # Dejar el fin en la cola para los demás hilos que la consumen
+                self._cola.put_nowait(_FIN)
+                return
+            yield elemento
+
+
+class Pipeline:
+    """origen → etapas → sumidero, cada etapa en sus propios hilos"""
+
+    def __init__(self, capacidad=None):
+        self.capacidad = capacidad or get_config('pipeline').get('queue_size', 10)
+        self._etapas = []
+
+    def etapa(self, nombre, funcion, hilos=1):
+        """Añadir una etapa: funcion(elemento) devuelve el elemento transformado o None para descartarlo"""
+        self._etapas.append((nombre, funcion, hilos))
+        return self
+
+    def ejecutar(self, origen, sumidero):
+        """Ejecutar el pipeline y devolver (resultado del origen, resultado del sumidero)
+
+        origen(entregar) produce los elementos llamando a entregar(elemento).
+        sumidero(elementos) los consume a medida que llegan; si termina antes
+        de agotarlos, el resto del pipeline deja de esperar.
+        """
+        colas = [ColaAcotada(self.capacidad)]
+        for _, _, hilos in self._etapas:
+            colas.append(ColaAcotada(self.capacidad, productores=hilos))
+        resultado_origen = {}
+
+        def producir():
+            try:
+                resultado_origen['valor'] = origen(colas[0].poner)
+            except Exception as e:
+                print(f"❌ Error en el origen del pipeline: {e}")
+            finally:
+                colas[0].cerrar()
+
+        def transformar(nombre, funcion, entrada, salida):
+            try:
+                for elemento in entrada:
+                    try:
+                        resultado = funcion(elemento)
+                    except Exception as e:
+                        print(f"⚠️ Error en la etapa '{nombre}': {e}")
+                        continue
+                    if resultado is not None and not salida.poner(resultado):
+                        break
+            finally:
+                salida.cerrar()
+
+        hilos = [threading.Thread(target=producir, daemon=True)]
+        for i, (nombre, funcion, num_hilos) in enumerate(self._etapas):
+            for _ in range(num_hilos):
+                hilos.append(threading.Thread(
+                    target=transformar, args=(nombre, funcion, colas[i], colas[i + 1]), daemon=True
+                ))
+        for hilo in hilos:
+            hilo.start()
+
+        try:
+            resultado_sumidero = sumidero(iter(colas[-1]))
+        finally:
+            for cola in colas:
+                cola.cancelar()
+            for hilo in hilos:
+                hilo.join()
+        return resultado_origen.get('valor'), resultado_sumidero
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Escáner de precios e indicadores de gratis para páginas de Udemy
+Todos los patrones se compilan al importar en una sola expresión regular
+y el texto de la página se recorre una sola vez
+"""
+import re
+
+# Precios con símbolo de moneda antes o después: $19.99, €20, 19.99 $, 20 €
+PATRONES_PRECIO = [
+    r'[$€£]\d+\.?\d*',
+    r'\d+\.?\d*\s*[$€£]',
+]
+
+# Indicadores de gratis en orden de prioridad (el primero encontrado es la evidencia principal)
+INDICADORES_GRATIS = [
+    "100% gratis",
+    "100% free",
+    "gratis",
+    "free",
+    "$0",
+    "0.00",
+    "0,00",
+    "gratuito",
+    "sin costo",
+    "no cost",
+    "completamente gratis",
+    "completely free",
+    "inscribirse gratis",
+    "enroll for free",
+    "inscribirse sin costo",
+    "enroll at no cost",
+    "inscribirse ahora",
+    "enroll now",
+    "add to cart",
+    "agregar al carrito",
+    "free enrollment",
+    "inscripción gratuita",
+    "curso gratuito",
+    "free course",
+    "sin pagar",
+    "no payment",
+    "gratis para siempre",
+    "free forever"
+]
+
+# bot_mejorado_10_cursos no considera los botones de carrito como indicador de gratis
+INDICADORES_GRATIS_SIN_CARRITO = [
+    indicador for indicador in INDICADORES_GRATIS
+    if indicador not in ("add to cart", "agregar al carrito")
+]
+
+_NUMERO = re.compile(r'\d+\.?\d*')
+
+
+def _alternativa_trie(palabras):
+    """Construir una alternancia factorizada por prefijos comunes (más rápida que a|b|c)"""
+    raiz = {}
+    for palabra in palabras:
+        nodo = raiz
+        for caracter in palabra:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[''] = True
+
+    def construir(nodo):
+        ramas = [re.escape(c) + construir(hijo) for c, hijo in sorted(nodo.items()) if c]
+        if not ramas:
+            return ''
+        cuerpo = ramas[0] if len(ramas) == 1 else '(?:' + '|'.join(ramas) + ')'
+        # Las coincidencias más largas ganan; los prefijos se resuelven en escanear()
+        return '(?:' + cuerpo + ')?' if '' in nodo else cuerpo
+
+    return construir(raiz)
+
+
+class EscanerPrecios:
+    """Busca precios mayores a cero e indicadores de gratis en una sola pasada"""
+
+    def __init__(self, indicadores):
+        self.indicadores = [indicador.lower() for indicador in indicadores]
+        # Un indicador encontrado implica todos los indicadores que son prefijo suyo
+        # ("free forever" contiene "free")
+        self._prefijos = {
+            indicador: {i for i, otro in enumerate(self.indicadores) if indicador.startswith(otro)}
+            for indicador in self.indicadores
+        }
+        gratis = _alternativa_trie(self.indicadores)
+        precio = '|'.join(PATRONES_PRECIO)
+        iniciales = ''.join(sorted({re.escape(indicador[0]) for indicador in self.indicadores}))
+        # Coincidencias de ancho cero: un indicador y un precio que empiezan en la misma
+        # posición se capturan los dos. La clase de caracteres inicial descarta rápido
+        # las posiciones donde no puede empezar nada
+        self._patron = re.compile(
+            rf'(?=[{iniciales}$€£\d])(?:(?=(?P<gratis>{gratis}))|(?=(?:{precio})))(?=(?P<precio>{precio}))?'
+        )
+
+    def escanear(self, texto):
+        """Recorrer el texto una vez y devolver el veredicto con la evidencia encontrada
+
+        El resultado es un dict con:
+            tiene_precio: se encontró algún precio mayor a 0
+            precio / valor: el primer precio mayor a 0 y su valor numérico
+            es_gratis: se encontró algún indicador de gratis
+            indicador: el indicador de mayor prioridad encontrado
+            indicadores: todos los indicadores encontrados, en orden de prioridad
+        """
+        veredicto = {
+            'tiene_precio': False,
+            'precio': None,
+            'valor': None,
+            'es_gratis': False,
+            'indicador': None,
+            'indicadores': [],
+        }
+        encontrados = set()
+        for coincidencia in self._patron.finditer(texto.lower()):
+            indicador = coincidencia.group('gratis')
+            if indicador:
+                encontrados.add(indicador)
+            precio = coincidencia.group('precio')
+            if precio and not veredicto['tiene_precio']:
+                valor = float(_NUMERO.search(precio).group())
+                if valor > 0:
+                    veredicto.update(tiene_precio=True, precio=precio.strip(), valor=valor)
+
+        if encontrados:
+            prioridades = sorted(set().union(*(self._prefijos[indicador] for indicador in encontrados)))
+            veredicto.update(
+                es_gratis=True,
+                indicador=self.indicadores[prioridades[0]],
+                indicadores=[self.indicadores[i] for i in prioridades],
+            )
+        return veredicto
+
+
+escaner_precios = EscanerPrecios(INDICADORES_GRATIS)
+escaner_precios_sin_carrito = EscanerPrecios(INDICADORES_GRATIS_SIN_CARRITO)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Limitador de velocidad por host (token bucket con ráfaga) compartido por los bots
+Todas las navegaciones y descargas HTTP piden turno aquí; ante una página de
+Cloudflare o un HTTP 429 el host entra en backoff exponencial. Los servidores
+locales (el sustituto de Udemy, los fixtures) no se limitan.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+from config_bot_mejorado import get_config
+
+HOSTS_LOCALES = {"127.0.0.1", "localhost", "::1"}
+
+
+def host_de(url):
+    """Host de una URL sin el prefijo www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def es_local(url):
+    """Si la URL apunta a la propia máquina (sin importar el puerto)"""
+    try:
+        return urlparse(url).hostname in HOSTS_LOCALES
+    except ValueError:
+        return False
+
+
+class CubetaHost:
+    """Token bucket de un host más su estado de backoff"""
+
+    def __init__(self, por_segundo, rafaga):
+        self.por_segundo = por_segundo
+        self.rafaga = rafaga
+        self.tokens = float(rafaga)
+        self.actualizado = time.monotonic()
+        self.backoff_hasta = 0.0
+        self.bloqueos = 0
+
+    def reservar(self, ahora):
+        """Reservar un token; devuelve cuántos segundos hay que esperar para usarlo"""
+        self.tokens = min(self.rafaga, self.tokens + (ahora - self.actualizado) * self.por_segundo)
+        self.actualizado = ahora
+        # Los tokens pueden quedar en negativo: cada llamador espera su turno en orden
+        self.tokens -= 1
+        espera = -self.tokens / self.por_segundo if self.tokens < 0 else 0.0
+        return max(espera, self.backoff_hasta - ahora)
+
+
+class LimitadorVelocidad:
+    """Cubetas por host con backoff ante bloqueos"""
+
+    def __init__(self, peticiones_por_minuto=30, rafaga=5, retardo_base=2,
+                 backoff_exponencial=True, max_backoff=60):
+        self.por_segundo = peticiones_por_minuto / 60.0
+        self.rafaga = rafaga
+        self.retardo_base = retardo_base
+        self.backoff_exponencial = backoff_exponencial
+        self.max_backoff = max_backoff
+        self.esperado = 0.0
+        self._cubetas = {}
+        self._lock = threading.Lock()
+
+    def _cubeta(self, host):
+        cubeta = self._cubetas.get(host)
+        if cubeta is None:
+            cubeta = self._cubetas[host] = CubetaHost(self.por_segundo, self.rafaga)
+        return cubeta
+
+    def esperar_turno(self, url):
+        """Bloquear hasta que el host de la URL admita otra petición"""
+        host = host_de(url)
+        if not host or es_local(url):
+            return 0.0
+        with self._lock:
+            espera = self._cubeta(host).reservar(time.monotonic())
+            self.esperado += espera
+        if espera > 0:
+            if espera >= 1:
+                print(f"⏳ Limitando velocidad en {host}: esperando {espera:.1f}s")
+            time.sleep(espera)
+        return espera
+
+    def registrar_bloqueo(self, url, retry_after=None):
+        """El host respondió con un desafío o un 429: aplicar backoff"""
+        host = host_de(url)
+        with self._lock:
+            cubeta = self._cubeta(host)
+            cubeta.bloqueos += 1
+            if retry_after is not None:
+                espera = retry_after
+            elif self.backoff_exponencial:
+                espera = self.retardo_base * 2 ** (cubeta.bloqueos - 1)
+            else:
+                espera = self.retardo_base
+            espera = min(espera, self.max_backoff)
+            cubeta.backoff_hasta = max(cubeta.backoff_hasta, time.monotonic() + espera)
+            # Vaciar la cubeta para no salir del backoff con una ráfaga
+            cubeta.tokens = min(cubeta.tokens, 0.0)
+        print(f"🐢 {host} está limitando las peticiones (bloqueo {cubeta.bloqueos}): pausa de {espera:.1f}s")
+
+    def registrar_exito(self, url):
+        """Respuesta normal: se reinicia la escalada del backoff"""
+        with self._lock:
+            cubeta = self._cubetas.get(host_de(url))
+            if cubeta is not None:
+                cubeta.bloqueos = 0
+
+
+_limitador = None
+_lock_limitador = threading.Lock()
+
+
+def obtener_limitador():
+    """Limitador compartido según SECURITY_CONFIG y ERROR_CONFIG, o None si está deshabilitado"""
+    global _limitador
+    config = get_config('security')
+    if not config.get('rate_limiting', False):
+        return None
+    with _lock_limitador:
+        if _limitador is None:
+            config_error = get_config('error')
+            _limitador = LimitadorVelocidad(
+                peticiones_por_minuto=config.get('requests_per_minute', 30),
+                rafaga=config.get('burst', 5),
+                retardo_base=config_error.get('retry_delay', 2),
+                backoff_exponencial=config_error.get('exponential_backoff', True),
+                max_backoff=config_error.get('max_backoff_time', 60),
+            )
+        return _limitador
+
+
+def esperar_turno(url):
+    """Pedir turno para una petición a la URL (no hace nada si el limitador está deshabilitado)"""
+    limitador = obtener_limitador()
+    if limitador is not None:
+        limitador.esperar_turno(url)
+
+
+def registrar_respuesta(url, bloqueado, retry_after=None):
+    """Informar al limitador del resultado de una petición"""
+    limitador = obtener_limitador()
+    if limitador is None:
+        return
+    if bloqueado:
+        limitador.registrar_bloqueo(url, retry_after)
+    else:
+        limitador.registrar_exito(url)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Resolución de enlaces de afiliados y redirecciones sin abrir el navegador
+- linksynergy (parámetro murl) y proxies de Google Translate se resuelven sin red
+- Otros redireccionadores se siguen con peticiones HEAD de la sesión compartida
+"""
+import threading
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from http_client import descargar, http_disponible
+
+# Parámetros que contienen la URL de destino en redireccionadores conocidos
+PARAMETROS_DESTINO = {
+    "linksynergy.com": "murl",
+    "google.com": "q",
+}
+
+SUFIJO_TRADUCTOR = ".translate.goog"
+
+_resueltas = {}
+_lock_resueltas = threading.Lock()
+
+
+def _host_desde_traductor(host):
+    """couponscorpion-com.translate.goog -> couponscorpion.com ('--' es un guion literal)"""
+    etiqueta = host[:-len(SUFIJO_TRADUCTOR)]
+    return etiqueta.replace("--", "\0").replace("-", ".").replace("\0", "-")
+
+
+def desenvolver(url):
+    """Quitar sin red los envoltorios conocidos (linksynergy, Google Translate) de una URL"""
+    for _ in range(5):
+        partes = urlparse(url)
+        host = partes.netloc.lower()
+
+        if host.endswith(SUFIJO_TRADUCTOR):
+            consulta = [(k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True)
+                        if not k.startswith("_x_tr_")]
+            url = urlunparse(partes._replace(netloc=_host_desde_traductor(host), query=urlencode(consulta)))
+            continue
+
+        parametro = next((p for dominio, p in PARAMETROS_DESTINO.items()
+                          if host == dominio or host.endswith("." + dominio)), None)
+        if parametro:
+            # parse_qsl ya decodifica el valor: decodificarlo otra vez rompería los %25 del destino
+            destino = dict(parse_qsl(partes.query)).get(parametro)
+            if destino and destino.startswith("http"):
+                url = destino
+                continue
+        break
+    return url
+
+
+def es_destino_final(url):
+    """Indica si la URL ya apunta a un curso de Udemy"""
+    return "udemy.com/course/" in url
+
+
+def seguir_redirecciones(url, max_saltos=10):
+    """Seguir redirecciones HTTP con HEAD (GET sin cuerpo si HEAD no está permitido)"""
+    for _ in range(max_saltos):
+        url = desenvolver(url)
+        if es_destino_final(url):
+            return url
+        respuesta = descargar(url, metodo="HEAD", allow_redirects=False)
+        if respuesta is not None and respuesta.status_code in (405, 501):
+            respuesta = descargar(url, metodo="GET", allow_redirects=False, stream=True)
+            if respuesta is not None:
+                respuesta.close()
+        if respuesta is None or not respuesta.is_redirect:
+            return url
+        url = urljoin(url, respuesta.headers.get("Location", ""))
+    return url
+
+
+def resolver_redireccion(url):
+    """Devolver la URL de Udemy a la que lleva un enlace, o None si no se pudo resolver sin navegador"""
+    if not url:
+        return None
+
+    final = desenvolver(url)
+    if es_destino_final(final):
+        return final
+
+    with _lock_resueltas:
+        if url in _resueltas:
+            return _resueltas[url]
+
+    if not http_disponible():
+        return None
+
+    print(f"🔁 Siguiendo redirecciones por HTTP: {final}")
+    final = seguir_redirecciones(final)
+    if not es_destino_final(final):
+        return None
+    with _lock_resueltas:
+        _resueltas[url] = final
+    return final
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Perfil ligero de scraping: bloquea imágenes, multimedia, fuentes y rastreadores
+- Preferencias de Chrome para lo que el bot nunca necesita (notificaciones, ventanas emergentes...)
+- Network.setBlockedURLs (CDP) para lo que sí hace falta al tomar capturas,
+  de modo que se puede levantar el bloqueo solo durante la captura
+"""
+import weakref
+from contextlib import contextmanager
+
+from page_waits import navegar
+from config_bot_mejorado import get_config
+
+EXTENSIONES_BLOQUEADAS = [
+    # Imágenes
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp",
+    # Multimedia
+    "mp4", "webm", "m4s", "m3u8", "ts", "mp3", "ogg", "wav",
+    # Fuentes
+    "woff", "woff2", "ttf", "otf", "eot",
+]
+
+DOMINIOS_BLOQUEADOS = [
+    # Rastreadores y publicidad de terceros
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "facebook.com/tr",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "newrelic.com",
+    "nr-data.net",
+    "taboola.com",
+    "outbrain.com",
+    # Imágenes y vídeos de los cursos de Udemy
+    "img-c.udemycdn.com",
+    "mp4-c.udemycdn.com",
+]
+
+# Ajustes de contenido de Chrome: 2 = bloquear
+PREFERENCIAS_BLOQUEO = {
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.popups": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+    "profile.default_content_setting_values.automatic_downloads": 2,
+}
+
+_bloqueados = weakref.WeakSet()
+
+
+def bloqueo_activado():
+    """Indica si CHROME_CONFIG pide el perfil ligero"""
+    return get_config('chrome').get('block_resources', False)
+
+
+def patrones_bloqueados():
+    """Patrones de URL (comodín *) para Network.setBlockedURLs"""
+    patrones = []
+    for extension in EXTENSIONES_BLOQUEADAS:
+        # También con parámetros de consulta: imagen.png?v=3
+        patrones.append(f"*.{extension}")
+        patrones.append(f"*.{extension}?*")
+    patrones.extend(f"*{dominio}*" for dominio in DOMINIOS_BLOQUEADOS)
+    patrones.extend(get_config('chrome').get('extra_blocked_urls', []))
+    return patrones
+
+
+def aplicar_preferencias(chrome_options):
+    """Añadir las preferencias de bloqueo a unas opciones de Chrome"""
+    chrome_options.add_experimental_option("prefs", dict(PREFERENCIAS_BLOQUEO))
+
+
+def bloquear_recursos(driver):
+    """Activar el bloqueo por CDP en la pestaña del driver (persiste entre navegaciones)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patrones_bloqueados()})
+        _bloqueados.add(driver)
+        return True
+    except Exception as e:
+        print(f"⚠️ No se pudo activar el bloqueo de recursos: {e}")
+        return False
+
+
+def desbloquear_recursos(driver):
+    """Quitar el bloqueo por CDP"""
+    try:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+    except Exception:
+        pass
+    _bloqueados.discard(driver)
+
+
+@contextmanager
+def renderizado_completo(driver, recargar=True):
+    """Levantar el bloqueo durante una captura de pantalla y restaurarlo al salir
+
+    Si el bloqueo estaba activo y recargar es True, se recarga la página actual
+    para que aparezcan las imágenes y fuentes que no se descargaron.
+    """
+    estaba_bloqueado = driver in _bloqueados
+    if estaba_bloqueado:
+        desbloquear_recursos(driver)
+        if recargar:
+            navegar(driver, driver.current_url)
+    try:
+        yield driver
+    finally:
+        if estaba_bloqueado:
+            bloquear_recursos(driver)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Métricas de rendimiento de una ejecución de los bots
+Tramos medidos con un context manager (tramo) o un decorador (medido) y
+contadores (contar), acumulados por nombre. Al terminar la ejecución se añade
+un resumen a STATS_CONFIG['stats_file'] para ver en qué se va el tiempo.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from config_bot_mejorado import get_config
+
+
+class MetricasEjecucion:
+    """Tiempos por tramo y contadores de una ejecución"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.inicio = datetime.now()
+        self._inicio_reloj = time.perf_counter()
+        self.tramos = {}
+        self.contadores = Counter()
+        self._lock = threading.Lock()
+
+    def registrar_tramo(self, nombre, segundos, error=False):
+        with self._lock:
+            datos = self.tramos.get(nombre)
+            if datos is None:
+                datos = self.tramos[nombre] = {'veces': 0, 'total': 0.0, 'max': 0.0, 'errores': 0}
+            datos['veces'] += 1
+            datos['total'] += segundos
+            datos['max'] = max(datos['max'], segundos)
+            if error:
+                datos['errores'] += 1
+                self.contadores['error_count'] += 1
+
+    def contar(self, nombre, cantidad=1):
+        with self._lock:
+            self.contadores[nombre] += cantidad
+
+    def resumen(self):
+        """Resumen de la ejecución con las métricas de STATS_CONFIG['track_metrics']"""
+        duracion = time.perf_counter() - self._inicio_reloj
+        with self._lock:
+            tramos = {
+                nombre: {
+                    'veces': datos['veces'],
+                    'total': round(datos['total'], 3),
+                    'media': round(datos['total'] / datos['veces'], 4),
+                    'max': round(datos['max'], 3),
+                    'errores': datos['errores'],
+                }
+                for nombre, datos in sorted(self.tramos.items(), key=lambda item: -item[1]['total'])
+            }
+            contadores = dict(self.contadores)
+
+        procesados = contadores.get('courses_processed', 0)
+        metricas = {
+            'courses_found': contadores.get('courses_found', 0),
+            'courses_processed': procesados,
+            'screenshots_taken': contadores.get('screenshots_taken', 0),
+            'processing_time': round(duracion, 3),
+            'success_rate': round(contadores.get('courses_found', 0) / procesados, 3) if procesados else None,
+            'error_count': contadores.get('error_count', 0),
+        }
+        seguidas = get_config('stats').get('track_metrics', list(metricas))
+        return {
+            'bot': self.nombre,
+            'inicio': self.inicio.isoformat(),
+            'fin': datetime.now().isoformat(),
+            'metricas': {nombre: metricas[nombre] for nombre in seguidas if nombre in metricas},
+            'tramos': tramos,
+            'contadores': contadores,
+        }
+
+    def imprimir_resumen(self, resumen=None):
+        resumen = resumen or self.resumen()
+        print(f"⏱️ Tiempo total: {resumen['metricas'].get('processing_time', 0):.1f}s")
+        tramos = [(nombre, datos) for nombre, datos in resumen['tramos'].items() if nombre != "ejecucion"]
+        for nombre, datos in tramos[:8]:
+            print(f"   {nombre}: {datos['total']:.1f}s ({datos['veces']} veces, máx. {datos['max']:.1f}s)")
+
+
+def guardar_resumen(resumen, ruta):
+    """Añadir el resumen de una ejecución al archivo de estadísticas"""
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        datos = {}
+    if not isinstance(datos, dict) or not isinstance(datos.get('ejecuciones'), list):
+        datos = {'ejecuciones': []}
+    datos['ejecuciones'].append(resumen)
+    temporal = ruta + ".tmp"
+    try:
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, ruta)
+        print(f"📊 Estadísticas guardadas en {ruta}")
+    except OSError as e:
+        print(f"⚠️ No se pudieron guardar las estadísticas: {e}")
+
+
+_metricas = None
+_observadores = []
+
+
+def agregar_observador(observador):
+    """Registrar observador(nombre, inicio, fin, error, detalles), llamado al cerrar cada tramo
+
+    inicio y fin son de time.perf_counter(); detalles es el dict pasado a tramo
+    (o None). Los tramos se miden aunque no haya
+    una ejecución medida en curso si hay algún observador.
+    """
+    _observadores.append(observador)
+
+
+def quitar_observador(observador):
+    if observador in _observadores:
+        _observadores.remove(observador)
+
+
+def metricas_activas():
+    return get_config('stats').get('track_performance', False)
+
+
+def obtener_metricas():
+    """Métricas de la ejecución en curso, o None si no hay ninguna"""
+    return _metricas
+
+
+@contextmanager
+def tramo(nombre, detalles=None):
+    """Medir un bloque en la ejecución en curso (no hace nada fuera de una ejecución medida)
+
+    Una excepción cuenta como error del tramo y se propaga. detalles (p. ej. el
+    curso o la URL) solo llega a los observadores.
+    """
+    metricas = _metricas
+    if metricas is None and not _observadores:
+        yield
+        return
+    inicio = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        fin = time.perf_counter()
+        if metricas is not None:
+            metricas.registrar_tramo(nombre, fin - inicio, error)
+        for observador in list(_observadores):
+            observador(nombre, inicio, fin, error, detalles)
+
+
+def medido(nombre, contador=None):
+    """Decorador: medir cada llamada a la función como un tramo
+
+    Con contador, cada llamada que devuelve un valor verdadero suma 1 a ese contador.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with tramo(nombre):
+                resultado = funcion(*args, **kwargs)
+            if contador and resultado:
+                contar(contador)
+            return resultado
+        return envoltura
+    return decorador
+
+
+def contar(nombre, cantidad=1):
+    """Sumar a un contador de la ejecución en curso"""
+    metricas = _metricas
+    if metricas is not None:
+        metricas.contar(nombre, cantidad)
+
+
+@contextmanager
+def ejecucion_medida(nombre_bot):
+    """Medir una ejecución completa y añadir su resumen a STATS_CONFIG['stats_file']
+
+    Si ya hay una ejecución medida en curso (un bot que llama a otro) se reutiliza.
+    """
+    global _metricas
+    if not metricas_activas() or _metricas is not None:
+        yield _metricas
+        return
+    _metricas = MetricasEjecucion(nombre_bot)
+    try:
+        with tramo("ejecucion"):
+            yield _metricas
+    finally:
+        metricas, _metricas = _metricas, None
+        resumen = metricas.resumen()
+        metricas.imprimir_resumen(resumen)
+        config = get_config('stats')
+        if config.get('save_statistics', True):
+            guardar_resumen(resumen, config.get('stats_file', 'bot_stats.json'))
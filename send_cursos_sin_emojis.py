@@ -10,11 +10,24 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 
+from page_waits import esperar_alguno, esperar_condicion, esperar_elemento
+from run_metrics import medido, tramo
+from session_manager import liberar_driver, obtener_driver
+
+# Elementos que indican que el chat del grupo/contacto está abierto
+CHAT_INDICATORS = [
+    '//header[@data-testid="conversation-header"]',
+    '//div[@data-testid="conversation-compose-box-input"]',
+    '//div[@contenteditable="true"][@data-tab="6"]',
+    '//div[@contenteditable="true"][@data-tab="10"]'
+]
+
+@medido("whatsapp")
 def enviar_cursos_sin_emojis(cursos, destino="grupo"):
     """
     Enviar cursos sin emojis
+    cursos: lista o iterable (p. ej. la salida de un pipeline que aún está extrayendo)
     destino: "contacto" o "grupo"
     """
     # Configuración según el destino
@@ -25,31 +38,18 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
         target_name = "50662454685"  # Número de teléfono para contacto individual
         print(f"Enviando a contacto: {target_name}")
     
-    # Configuración básica
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    # Perfil único
-    user_data_dir = os.path.join(os.getcwd(), "whatsapp_profile")
-    if not os.path.exists(user_data_dir):
-        os.makedirs(user_data_dir)
-    
-    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-    chrome_options.add_argument("--no-first-run")
-    chrome_options.add_argument("--no-default-browser-check")
-    
     driver = None
     try:
+        # Navegador del perfil whatsapp_profile (se reutiliza si quedó abierto)
         print("Abriendo Chrome...")
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver = obtener_driver("whatsapp")
         
-        # Abrir WhatsApp Web
-        print("Navegando a WhatsApp Web...")
-        driver.get("https://web.whatsapp.com")
+        # Abrir WhatsApp Web (si el navegador reutilizado ya lo tiene abierto no se recarga)
+        if driver.current_url.startswith("https://web.whatsapp.com"):
+            print("WhatsApp Web ya abierto en el navegador")
+        else:
+            print("Navegando a WhatsApp Web...")
+            driver.get("https://web.whatsapp.com")
         
         # Esperar a que cargue
         wait = WebDriverWait(driver, 60)
@@ -62,9 +62,9 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
             print("Esperando escaneo del codigo QR...")
             print("Por favor, escanea el codigo QR con tu WhatsApp")
             print("Tienes 45 segundos para escanear...")
-            time.sleep(45)
             
-            search_box = wait.until(EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]')))
+            # El buscador aparece en cuanto se escanea el código; se espera el escaneo más la carga
+            search_box = WebDriverWait(driver, 45 + 60).until(EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]')))
             print("WhatsApp Web conectado exitosamente")
         
         # Buscar grupo o contacto
@@ -72,7 +72,7 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
         search_box = wait.until(EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]')))
         search_box.clear()
         search_box.send_keys(target_name)
-        time.sleep(8)  # Aumentado de 5 a 8 segundos para que aparezcan los resultados
+        esperar_elemento(driver, f'//span[contains(text(), "{target_name}")]', timeout=8)
         
         # Hacer clic en el grupo/contacto
         try:
@@ -89,7 +89,6 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
                     # SALIR DEL BUSCADOR ANTES DEL CLIC
                     print("🔍 Saliendo del buscador antes del clic...")
                     search_box.send_keys(Keys.ESCAPE)
-                    time.sleep(3)
                     
                     # RE-BUSCAR EL GRUPO DESPUÉS DEL ESCAPE
                     print("🔍 Re-buscando el grupo después del escape...")
@@ -99,28 +98,20 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
                     # Hacer clic y esperar más tiempo
                     grupo_element.click()
                     print("✅ Clic realizado en el grupo")
-                    time.sleep(15)  # Aumentado a 15 segundos para que cargue completamente el chat
+                    esperar_alguno(driver, CHAT_INDICATORS, timeout=15)
                     
                     # Limpiar el campo de búsqueda para asegurar que no esté activo
                     try:
                         search_box.clear()
                         print("✅ Campo de búsqueda limpiado")
-                        time.sleep(3)
                     except:
                         print("⚠️ No se pudo limpiar el campo de búsqueda")
                     
                     # Verificar si realmente estamos en el grupo usando indicadores más específicos
                     try:
                         # Buscar indicadores de que estamos en el chat del grupo
-                        chat_indicators = [
-                            '//header[@data-testid="conversation-header"]',
-                            '//div[@data-testid="conversation-compose-box-input"]',
-                            '//div[@contenteditable="true"][@data-tab="6"]',
-                            '//div[@contenteditable="true"][@data-tab="10"]'
-                        ]
-                        
                         chat_abierto = False
-                        for indicator in chat_indicators:
+                        for indicator in CHAT_INDICATORS:
                             try:
                                 element = driver.find_element(By.XPATH, indicator)
                                 print(f"✅ Indicador de chat encontrado: {indicator}")
@@ -151,22 +142,20 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
                         # Buscar de nuevo el grupo
                         search_box.clear()
                         search_box.send_keys(target_name)
-                        time.sleep(5)
+                        esperar_elemento(driver, '//div[@data-testid="cell-0-0"]', timeout=5)
                         
                         # Salir del buscador
                         search_box.send_keys(Keys.ESCAPE)
-                        time.sleep(2)
                         
                         first_result = driver.find_element(By.XPATH, '//div[@data-testid="cell-0-0"]')
                         first_result.click()
                         print("✅ Clic en primer resultado exitoso")
-                        time.sleep(10)  # Aumentado a 10 segundos
+                        esperar_alguno(driver, CHAT_INDICATORS, timeout=10)
                         
                         # Limpiar el campo de búsqueda
                         try:
                             search_box.clear()
                             print("✅ Campo de búsqueda limpiado (método 2)")
-                            time.sleep(3)
                         except:
                             print("⚠️ No se pudo limpiar el campo de búsqueda (método 2)")
                         
@@ -207,7 +196,7 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
         
         # Esperar a que se cargue el chat del grupo/contacto
         print("⏳ Esperando a que se cargue el chat...")
-        time.sleep(10)  # Aumentado de 5 a 10 segundos para asegurar que se cargue el chat
+        esperar_alguno(driver, CHAT_INDICATORS, timeout=10)
         
         # Verificar que estamos en el chat correcto (opcional)
         try:
@@ -267,16 +256,15 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
                     
                     # Limpiar búsqueda y buscar de nuevo
                     search_box.clear()
-                    time.sleep(2)
                     search_box.send_keys("Cursos 2025")
-                    time.sleep(5)
+                    esperar_elemento(driver, '//span[contains(text(), "Cursos 2025")]', timeout=5)
                     
                     # Intentar hacer clic en el primer resultado que contenga "Cursos 2025"
                     try:
                         grupo_element = driver.find_element(By.XPATH, '//span[contains(text(), "Cursos 2025")]')
                         grupo_element.click()
                         print("✅ Grupo 'Cursos 2025' seleccionado correctamente")
-                        time.sleep(5)
+                        esperar_alguno(driver, CHAT_INDICATORS, timeout=5)
                     except Exception as e:
                         print(f"❌ Error al seleccionar el grupo: {e}")
                         print("⚠️ Continuando de todas formas...")
@@ -287,43 +275,55 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
                 print(f"⚠️ Error verificando indicadores de grupo: {e}")
                 print("⚠️ Continuando de todas formas...")
         
-        # Enviar mensaje de inicio
+        # Mensaje de inicio; el total solo se conoce si se recibió una lista
         mensaje_inicio = f"CURSOS GRATUITOS ENCONTRADOS\n"
         mensaje_inicio += f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-        mensaje_inicio += f"Total: {len(cursos)} cursos\n"
+        total = len(cursos) if hasattr(cursos, '__len__') else None
+        if total is not None:
+            mensaje_inicio += f"Total: {total} cursos\n"
         mensaje_inicio += "=" * 40
         
-        print("Enviando mensaje de inicio...")
-        enviar_mensaje_simple(driver, mensaje_inicio)
-        time.sleep(2)
-        
-        # Enviar cada curso por separado (evitando duplicados)
+        # Enviar cada curso por separado (evitando duplicados). Los cursos pueden
+        # llegar de un generador mientras se siguen extrayendo: el mensaje de
+        # inicio se envía con el primero
         cursos_enviados = set()  # Para evitar duplicados
         
-        for i, curso in enumerate(cursos, 1):
-                        # Verificar si ya se envió este curso (por URL)
-                        if curso['url'] in cursos_enviados:
-                            print(f"⚠️ Curso duplicado ignorado: {curso['titulo']}")
-                            continue
+        with tramo("whatsapp.envio"):
+            for i, curso in enumerate(cursos, 1):
+                with tramo("whatsapp.curso", {'curso': i, 'url': curso.get('url')}):
+                    if i == 1:
+                        print("Enviando mensaje de inicio...")
+                        enviar_mensaje_simple(driver, mensaje_inicio)
+                        time.sleep(2)  # Pausa deliberada entre mensajes (anti-baneo), no es una espera de carga
+                        
+                    # Verificar si ya se envió este curso (por URL)
+                    if curso['url'] in cursos_enviados:
+                        print(f"⚠️ Curso duplicado ignorado: {curso['titulo']}")
+                        continue
                         
-                        cursos_enviados.add(curso['url'])
+                    cursos_enviados.add(curso['url'])
                         
-                        mensaje_curso = f"\nCURSO {i}:\n"
-                        mensaje_curso += f"Titulo: {curso['titulo']}\n"  # Título completo sin cortar
-                        mensaje_curso += f"URL: {curso['url']}\n"
-                        mensaje_curso += "Estado: 100% GRATUITO"
+                    mensaje_curso = f"\nCURSO {i}:\n"
+                    mensaje_curso += f"Titulo: {curso['titulo']}\n"  # Título completo sin cortar
+                    mensaje_curso += f"URL: {curso['url']}\n"
+                    mensaje_curso += "Estado: 100% GRATUITO"
                         
-                        print(f"Enviando curso {i}/{len(cursos)}...")
-                        enviar_mensaje_simple(driver, mensaje_curso)
+                    print(f"Enviando curso {i}/{total}..." if total is not None else f"Enviando curso {i}...")
+                    enviar_mensaje_simple(driver, mensaje_curso)
                         
-                        # Enviar captura si existe
-                        if curso.get('screenshot') and os.path.exists(curso['screenshot']):
-                            print(f"Enviando captura para curso {i}...")
-                            enviar_imagen(driver, curso['screenshot'])
+                    # Enviar captura si existe
+                    if curso.get('screenshot') and os.path.exists(curso['screenshot']):
+                        print(f"Enviando captura para curso {i}...")
+                        enviar_imagen(driver, curso['screenshot'])
                         
-                        # Delay más largo para evitar baneos
+                    # Delay más largo para evitar baneos (pausa deliberada, no es una espera de carga)
+                    with tramo("whatsapp.pausa"):
                         time.sleep(5)  # Aumentado de 2 a 5 segundos
         
+        if not cursos_enviados:
+            print("No llegó ningún curso para enviar")
+            return False
+        
         # Enviar mensaje final
         cursos_unicos_enviados = len(cursos_enviados)
         mensaje_final = f"Enviado por *FrostBot*"
@@ -340,26 +340,24 @@ def enviar_cursos_sin_emojis(cursos, destino="grupo"):
         
     finally:
         if driver:
-            print("Chrome mantenido abierto para futuras sesiones")
+            liberar_driver(driver, "whatsapp")
             print("Perfil guardado en: whatsapp_profile/")
 
+@medido("whatsapp.mensaje")
 def enviar_mensaje_simple(driver, mensaje):
     """Enviar un mensaje simple"""
     try:
         # Esperar a que aparezca el campo de mensaje
-        time.sleep(2)
-        
-        # Buscar el campo de mensaje
         message_box = None
         
         # Método 1: Buscar por data-tab específicos
-        for data_tab in ['6', '10', '9']:
-            try:
-                message_box = driver.find_element(By.XPATH, f'//div[@contenteditable="true"][@data-tab="{data_tab}"]')
-                print(f"✅ Campo de mensaje encontrado con data-tab='{data_tab}'")
-                break
-            except:
-                continue
+        selector, message_box = esperar_alguno(
+            driver,
+            [f'//div[@contenteditable="true"][@data-tab="{data_tab}"]' for data_tab in ['6', '10', '9']],
+            timeout=2,
+        )
+        if message_box:
+            print(f"✅ Campo de mensaje encontrado con selector: {selector}")
         
         # Método 2: Buscar por atributos específicos
         if not message_box:
@@ -404,18 +402,18 @@ def enviar_mensaje_simple(driver, mensaje):
             try:
                 # Hacer clic en el área inferior derecha donde normalmente está el campo de mensaje
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
                 
-                # Hacer clic en el área de mensaje
+                # Hacer clic en el área de mensaje y esperar a que un campo editable tenga el foco
                 action = webdriver.ActionChains(driver)
                 action.move_by_offset(800, 700).click().perform()
-                time.sleep(2)
+                esperar_condicion(driver, lambda d: d.execute_script(
+                    "return !!(document.activeElement && document.activeElement.isContentEditable)"), timeout=2)
                 
                 # Intentar escribir directamente
                 action.send_keys(mensaje).perform()
-                time.sleep(2)
                 action.send_keys(Keys.ENTER).perform()
-                time.sleep(2)
+                esperar_condicion(driver, lambda d: d.execute_script(
+                    "return !(document.activeElement && document.activeElement.innerText.trim())"), timeout=2)
                 
                 print("✅ Mensaje enviado por clic directo")
                 return True
@@ -430,15 +428,13 @@ def enviar_mensaje_simple(driver, mensaje):
                 
                 # Limpiar el campo
                 message_box.clear()
-                time.sleep(1)
                 
                 # Enviar texto
                 message_box.send_keys(mensaje)
-                time.sleep(2)
                 
-                # Enviar con Enter
+                # Enviar con Enter y esperar a que WhatsApp vacíe el campo
                 message_box.send_keys(Keys.ENTER)
-                time.sleep(2)
+                esperar_condicion(driver, lambda d: not message_box.text.strip(), timeout=2)
                 
                 print("✅ Mensaje enviado exitosamente")
                 return True
@@ -453,6 +449,7 @@ def enviar_mensaje_simple(driver, mensaje):
         print(f"❌ Error procesando mensaje: {e}")
         return False
 
+@medido("whatsapp.imagen")
 def enviar_imagen(driver, ruta_imagen):
     """Enviar una imagen por WhatsApp"""
     try:
@@ -479,21 +476,13 @@ def enviar_imagen(driver, ruta_imagen):
         
         # Hacer clic en el botón de adjuntar
         attach_button.click()
-        time.sleep(2)
         
-        # Buscar el input de archivo
-        file_input = None
+        # Esperar el input de archivo
         file_selectors = [
             '//input[@type="file"]',
             '//input[@accept="image/*"]'
         ]
-        
-        for selector in file_selectors:
-            try:
-                file_input = driver.find_element(By.XPATH, selector)
-                break
-            except:
-                continue
+        _, file_input = esperar_alguno(driver, file_selectors, timeout=2)
         
         if not file_input:
             print("No se pudo encontrar el input de archivo")
@@ -501,27 +490,20 @@ def enviar_imagen(driver, ruta_imagen):
         
         # Enviar la imagen
         file_input.send_keys(os.path.abspath(ruta_imagen))
-        time.sleep(3)
         
-        # Buscar y hacer clic en el botón de enviar
-        send_button = None
+        # Esperar a que aparezca la vista previa con el botón de enviar
         send_selectors = [
             '//span[@data-icon="send"]',
             '//div[@data-testid="send"]',
             '//button[@aria-label="Send"]',
             '//button[@aria-label="Enviar"]'
         ]
-        
-        for selector in send_selectors:
-            try:
-                send_button = driver.find_element(By.XPATH, selector)
-                break
-            except:
-                continue
+        _, send_button = esperar_alguno(driver, send_selectors, timeout=3)
         
         if send_button:
             send_button.click()
-            time.sleep(3)
+            # La vista previa se cierra cuando la imagen se envía
+            esperar_condicion(driver, EC.staleness_of(send_button), timeout=3)
             print(f"Imagen enviada: {ruta_imagen}")
             return True
         else:
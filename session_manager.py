@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Gestor de sesiones de navegador de larga duración
+Mantiene un Chrome abierto por perfil (scraping / whatsapp) entre ejecuciones
+programadas y lo reutiliza conectándose por su puerto de depuración
+"""
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from resource_blocking import aplicar_preferencias, bloqueo_activado, bloquear_recursos
+from webdriver_profiler import instrumentar_driver, perfilado_webdriver_activado
+from config_bot_mejorado import get_config
+
+# Perfiles de navegador: carpeta de datos de usuario, argumentos propios y si se
+# bloquean imágenes, multimedia, fuentes y rastreadores (WhatsApp necesita el QR)
+PERFILES = {
+    "scraping": {
+        "user_data_dir": "scraping_profile",
+        "puerto": 0,
+        "ligero": True,
+        "argumentos": [],
+    },
+    "whatsapp": {
+        "user_data_dir": "whatsapp_profile",
+        "puerto": 1,
+        "ligero": False,
+        "argumentos": [
+            "--start-maximized",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ],
+    },
+}
+
+_activos = {}
+_lock = threading.Lock()
+
+
+def crear_driver(perfil="scraping", headless=False, user_data_dir=None, puerto_depuracion=None):
+    """Crear una instancia nueva de Chrome con las opciones del bot para el perfil indicado"""
+    config_perfil = PERFILES[perfil]
+    config_chrome = get_config('chrome')
+    ligero = config_perfil["ligero"] and bloqueo_activado()
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    if headless or perfil == "scraping":
+        chrome_options.add_argument(f"--window-size={config_chrome.get('window_size', '1920,1080')}")
+    for argumento in config_perfil["argumentos"] + config_chrome.get('arguments', []):
+        chrome_options.add_argument(argumento)
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    if user_data_dir:
+        os.makedirs(user_data_dir, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+    if puerto_depuracion:
+        # El navegador sigue abierto cuando termina el proceso de Python
+        chrome_options.add_argument(f"--remote-debugging-port={puerto_depuracion}")
+        chrome_options.add_experimental_option("detach", True)
+    if ligero:
+        aplicar_preferencias(chrome_options)
+
+    driver = webdriver.Chrome(options=chrome_options)
+    if perfilado_webdriver_activado():
+        instrumentar_driver(driver)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    if ligero:
+        bloquear_recursos(driver)
+    return driver
+
+
+def _conectar(puerto):
+    """Conectarse a un Chrome que ya está abierto con el puerto de depuración"""
+    chrome_options = Options()
+    chrome_options.debugger_address = f"127.0.0.1:{puerto}"
+    driver = webdriver.Chrome(options=chrome_options)
+    if perfilado_webdriver_activado():
+        instrumentar_driver(driver)
+    return driver
+
+
+def esta_saludable(driver):
+    """Comprobar que el navegador responde y tiene al menos una ventana"""
+    try:
+        return driver.execute_script("return 1") == 1 and bool(driver.window_handles)
+    except Exception:
+        return False
+
+
+def _leer_estado(ruta):
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar_estado(ruta, estado):
+    try:
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ No se pudo guardar el estado de las sesiones: {e}")
+
+
+def _cerrar_navegador(driver):
+    """Cerrar de verdad un navegador (también si se abrió con detach)"""
+    try:
+        driver.execute_cdp_cmd("Browser.close", {})
+    except Exception:
+        pass
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def obtener_driver(perfil="scraping"):
+    """Entregar el navegador del perfil: reutiliza el de esta ejecución, el de una ejecución
+    anterior (si sigue sano) o abre uno nuevo"""
+    config = get_config('session')
+    if not config.get('keep_alive', False):
+        return crear_driver(perfil, user_data_dir=PERFILES[perfil]["user_data_dir"])
+
+    config_perfil = PERFILES[perfil]
+    ruta_estado = config.get('state_file', 'browser_sessions.json')
+    puerto = config.get('debug_port_base', 9230) + config_perfil["puerto"]
+
+    with _lock:
+        driver = _activos.get(perfil)
+        if driver is not None and esta_saludable(driver):
+            print(f"♻️ Reutilizando navegador '{perfil}' de esta ejecución")
+            return driver
+
+        estado = _leer_estado(ruta_estado)
+        if perfil in estado:
+            try:
+                driver = _conectar(estado[perfil]["puerto"])
+                if esta_saludable(driver):
+                    print(f"♻️ Reutilizando navegador '{perfil}' abierto (usos: {estado[perfil]['usos']})")
+                    # El bloqueo por CDP se pierde al desconectarse el chromedriver anterior
+                    if config_perfil["ligero"] and bloqueo_activado():
+                        bloquear_recursos(driver)
+                    _activos[perfil] = driver
+                    return driver
+                _cerrar_navegador(driver)
+            except Exception as e:
+                print(f"⚠️ El navegador '{perfil}' guardado no responde: {e}")
+            del estado[perfil]
+
+        print(f"🌐 Abriendo navegador nuevo para el perfil '{perfil}'...")
+        driver = crear_driver(perfil, user_data_dir=config_perfil["user_data_dir"], puerto_depuracion=puerto)
+        estado[perfil] = {"puerto": puerto, "usos": 0, "creado": datetime.now().isoformat()}
+        _guardar_estado(ruta_estado, estado)
+        _activos[perfil] = driver
+        return driver
+
+
+def liberar_driver(driver, perfil="scraping"):
+    """Devolver el navegador al gestor al terminar una ejecución
+
+    Se cuenta un uso; al llegar a max_uses o si no responde, se cierra para reciclarlo.
+    """
+    if driver is None:
+        return
+    config = get_config('session')
+    if not config.get('keep_alive', False):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        return
+
+    ruta_estado = config.get('state_file', 'browser_sessions.json')
+    with _lock:
+        estado = _leer_estado(ruta_estado)
+        sesion = estado.get(perfil, {})
+        sesion["usos"] = sesion.get("usos", 0) + 1
+
+        if sesion["usos"] >= config.get('max_uses', 20) or not esta_saludable(driver):
+            print(f"🔄 Reciclando navegador '{perfil}' tras {sesion['usos']} usos")
+            _cerrar_navegador(driver)
+            _activos.pop(perfil, None)
+            estado.pop(perfil, None)
+        else:
+            estado[perfil] = sesion
+            print(f"💤 Navegador '{perfil}' queda abierto para la próxima ejecución (usos: {sesion['usos']})")
+        _guardar_estado(ruta_estado, estado)
+
+
+@atexit.register
+def _desconectar_al_salir():
+    """Detener los chromedriver de esta ejecución sin cerrar los navegadores"""
+    for driver in _activos.values():
+        try:
+            driver.service.stop()
+        except Exception:
+            pass
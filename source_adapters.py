@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Fuentes de cupones intercambiables y su ejecución en paralelo
+Cada fuente descubre sus listados, extrae los enlaces candidatos y los resuelve
+a URLs de Udemy; todas deduplican contra un único índice de cursos procesados
+"""
+import threading
+
+from browser_pool import IndiceFuente, IndiceProcesados
+from link_harvester import recolectar_enlaces, urls_de_cursos
+from listing_fetcher import obtener_enlaces_listado
+from page_waits import hacer_scroll, navegar
+from config_bot_mejorado import get_config
+
+# Fuentes registradas por nombre, en orden de registro
+FUENTES = {}
+
+
+def registrar_fuente(clase):
+    """Decorador para registrar una clase de fuente por su nombre"""
+    FUENTES[clase.nombre] = clase
+    return clase
+
+
+class AdaptadorFuente:
+    """Interfaz de una fuente de cupones
+
+    Las subclases definen urls_listado() y resolver(); extraer_candidatos()
+    descarga el listado por HTTP y solo abre el navegador si hace falta JavaScript.
+    Las fuentes paginadas redefinen lotes_candidatos() para entregar los enlaces
+    página a página y no descargar más de lo necesario.
+    """
+
+    nombre = None
+    etiqueta = "Curso"            # Prefijo del texto de cada curso encontrado
+    fuente = None                 # Nombre visible en los mensajes
+    marcador_url = None           # Texto que debe contener la URL del listado cargado
+    scrolls = 3                   # Scrolls para cargar más contenido en el navegador
+    usar_http = True              # Intentar el listado sin navegador
+
+    def __init__(self, max_cursos=10):
+        self.max_cursos = max_cursos
+
+    def urls_listado(self, driver=None):
+        """URLs de los listados a recorrer"""
+        raise NotImplementedError
+
+    def cargar_listado(self, driver, url_listado):
+        """Navegar al listado y hacer scroll para cargar más cursos"""
+        print(f"🌐 Navegando a: {url_listado}")
+        driver.set_page_load_timeout(30)
+        navegar(driver, url_listado)
+
+        if self.marcador_url and self.marcador_url not in driver.current_url.lower():
+            print(f"❌ Error: No se pudo cargar el listado de {self.fuente}")
+            return False
+        print(f"✅ Listado de {self.fuente} cargado correctamente")
+
+        print("📜 Haciendo scroll para cargar cursos...")
+        for scroll in range(self.scrolls):
+            try:
+                if not hacer_scroll(driver):
+                    print("📜 No se cargó más contenido")
+                    break
+                print(f"Scroll {scroll+1}/{self.scrolls} completado")
+            except Exception as e:
+                print(f"⚠️ Error en scroll {scroll+1}: {e}")
+                break
+        return True
+
+    def filtrar_enlaces(self, enlaces):
+        """Quedarse con los enlaces del listado que apuntan a cursos"""
+        return urls_de_cursos(enlaces)
+
+    def extraer_candidatos(self, driver, url_listado):
+        """Enlaces candidatos de un listado (por HTTP o, si hace falta, con el navegador)"""
+        if self.usar_http:
+            candidatos = obtener_enlaces_listado(url_listado)
+            if candidatos is not None:
+                return candidatos
+        if not self.cargar_listado(driver, url_listado):
+            return []
+        candidatos = self.filtrar_enlaces(recolectar_enlaces(driver))
+        print(f"🔍 Encontrados {len(candidatos)} enlaces únicos de cursos...")
+        return candidatos
+
+    def lotes_candidatos(self, driver, url_listado):
+        """Generar los enlaces candidatos de un listado por lotes (por defecto, uno solo)"""
+        yield self.extraer_candidatos(driver, url_listado)
+
+    def resolver(self, driver, url_candidato):
+        """Convertir un candidato en (udemy_url, coupon_code), o (None, None)"""
+        raise NotImplementedError
+
+
+def fuentes_habilitadas():
+    """Instancias de las fuentes habilitadas en SOURCES_CONFIG, en el orden configurado"""
+    config = get_config('sources')
+    max_cursos = config.get('max_courses_per_source', 10)
+    nombres = config.get('enabled_sources', list(FUENTES))
+    adaptadores = []
+    for nombre in nombres:
+        if nombre not in FUENTES:
+            print(f"⚠️ Fuente desconocida en la configuración: {nombre}")
+            continue
+        adaptadores.append(FUENTES[nombre](max_cursos))
+    return adaptadores
+
+
+def ejecutar_fuentes(adaptadores, extraer, driver_principal, crear_driver, processed_courses=None):
+    """Ejecutar todas las fuentes a la vez, cada una con su navegador, y devolver {nombre: cursos}
+
+    extraer(driver, adaptador, indice) recorre una fuente y devuelve sus cursos.
+    La primera fuente usa driver_principal; las demás abren uno con crear_driver()
+    que se cierra al terminar. El tiempo total es el de la fuente más lenta.
+    """
+    compartido = IndiceProcesados(processed_courses)
+    resultados = {adaptador.nombre: [] for adaptador in adaptadores}
+
+    def trabajar(adaptador, driver_propio):
+        if compartido.detenido():
+            print(f"⏹️ Fuente {adaptador.fuente} omitida: ya no se aceptan más cursos")
+            return
+        driver = driver_propio
+        try:
+            if driver is None:
+                driver = crear_driver()
+            indice = IndiceFuente(compartido, adaptador.max_cursos)
+            resultados[adaptador.nombre] = extraer(driver, adaptador, indice)
+        except Exception as e:
+            print(f"❌ Error en la fuente {adaptador.fuente}: {e}")
+        finally:
+            if driver is not None and driver_propio is None:
+                try:
+                    driver.quit()
+                except:
+                    pass
+        print(f"📊 Cursos extraídos de {adaptador.fuente}: {len(resultados[adaptador.nombre])}")
+
+    if len(adaptadores) == 1 or not get_config('sources').get('concurrent', True):
+        for adaptador in adaptadores:
+            trabajar(adaptador, driver_principal)
+        return resultados
+
+    print(f"🚀 Recorriendo {len(adaptadores)} fuentes en paralelo...")
+    hilos = [
+        threading.Thread(target=trabajar, args=(adaptador, driver_principal if n == 0 else None), daemon=True)
+        for n, adaptador in enumerate(adaptadores)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return resultados
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Pruebas del índice de cursos procesados y del pool de navegadores
+"""
+from browser_pool import IndiceFuente, IndiceProcesados, PoolNavegadores
+from config_bot_mejorado import SOURCES_CONFIG
+from source_adapters import ejecutar_fuentes
+
+
+class AdaptadorFalso:
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.fuente = nombre
+        self.max_cursos = 10
+
+
+def test_detener_una_fuente_detiene_todas():
+    compartido = IndiceProcesados()
+    una, otra = IndiceFuente(compartido, 10), IndiceFuente(compartido, 10)
+    assert not una.limite_alcanzado() and not otra.limite_alcanzado()
+    una.detener()
+    assert compartido.detenido() and otra.detenido()
+    assert una.limite_alcanzado() and otra.limite_alcanzado()
+
+
+def test_el_pool_deja_de_tomar_enlaces_al_detenerse():
+    indice = IndiceProcesados()
+    procesados = []
+
+    def procesar(driver, url):
+        procesados.append(url)
+        if len(procesados) == 2:
+            indice.detener()
+        return url
+
+    urls = [f"https://cursosdev.com/coupons-udemy/{n}" for n in range(10)]
+    with PoolNavegadores(lambda: object(), 1) as pool:
+        assert pool.procesar(urls, procesar, indice) == urls[:2]
+        assert pool.procesar(urls, procesar, indice) == []
+    assert procesados == urls[:2]
+
+
+def test_fuentes_siguientes_se_omiten_tras_detener(monkeypatch):
+    monkeypatch.setitem(SOURCES_CONFIG, 'concurrent', False)
+    recorridas = []
+
+    def extraer(driver, adaptador, indice):
+        recorridas.append(adaptador.nombre)
+        indice.detener()
+        return ["curso"]
+
+    resultados = ejecutar_fuentes([AdaptadorFalso("a"), AdaptadorFalso("b")], extraer, object(), object)
+    assert recorridas == ["a"]
+    assert resultados == {"a": ["curso"], "b": []}
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Pruebas del barrido de cupones publicados: qué entradas se revisan y cuáles se eliminan
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import coupon_sweeper
+from coupon_sweeper import BarredorCupones, comprobar_cupon, cursos_por_revisar
+
+
+def hace(horas):
+    return (datetime.now() - timedelta(hours=horas)).isoformat()
+
+
+def entrada(course_id, **fechas):
+    return dict({'course_id': course_id, 'coupon_code': 'CUPON', 'url': f"https://www.udemy.com/course/{course_id}/"}, **fechas)
+
+
+class CacheFalsa:
+    """Caché que siempre responde 'gratis' y recuerda lo que se guarda"""
+
+    def __init__(self):
+        self.guardados = {}
+
+    def consultar(self, course_id, coupon_code):
+        return True, None
+
+    def guardar(self, course_id, coupon_code, es_gratis):
+        self.guardados[(course_id, coupon_code)] = es_gratis
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CacheFalsa()
+    monkeypatch.setattr(coupon_sweeper, "obtener_cache", lambda: cache)
+    return cache
+
+
+def test_cursos_por_revisar_respeta_edad_minima_y_orden():
+    cursos = [
+        entrada("reciente", checked_at=hace(1)),
+        entrada("viejo", checked_at=hace(30)),
+        entrada("sin_comprobar", extracted_at=hace(10)),
+        entrada("sin_fechas"),
+    ]
+    revisar = cursos_por_revisar(cursos, lote=10, edad_minima_horas=6)
+    assert [curso['course_id'] for curso in revisar] == ["sin_fechas", "viejo", "sin_comprobar"]
+    assert len(cursos_por_revisar(cursos, lote=2, edad_minima_horas=6)) == 2
+
+
+def test_checked_at_tiene_prioridad_sobre_extracted_at():
+    curso = entrada("a", extracted_at=hace(100), checked_at=hace(1))
+    assert cursos_por_revisar([curso], edad_minima_horas=6) == []
+
+
+def test_comprobar_cupon_no_usa_respuestas_de_la_cache(cache):
+    llamadas = []
+
+    def verificar(url):
+        llamadas.append(url)
+        return False
+
+    assert comprobar_cupon(entrada("caducado"), verificar) is False
+    assert len(llamadas) == 1
+    assert cache.guardados == {("caducado", "CUPON"): False}
+
+
+def test_barrer_elimina_caducados_y_actualiza_comprobados(tmp_path, cache):
+    ruta = tmp_path / "courses.json"
+    cursos = [
+        entrada("gratis", extracted_at=hace(20)),
+        entrada("caducado", extracted_at=hace(20)),
+        entrada("desconocido", extracted_at=hace(20)),
+        entrada("reciente", extracted_at=hace(1)),
+    ]
+    ruta.write_text(json.dumps({'courses': cursos}), encoding='utf-8')
+    respuestas = {"gratis": True, "caducado": False, "desconocido": None}
+    publicados = []
+
+    barredor = BarredorCupones(
+        lambda url: respuestas[url.rstrip('/').rsplit('/', 1)[-1]],
+        lambda vigentes, republicar: publicados.append((vigentes, republicar)),
+        ruta=str(ruta),
+    )
+    assert barredor.barrer() == 1
+
+    vigentes, republicar = publicados[0]
+    assert republicar is True
+    por_id = {curso['course_id']: curso for curso in vigentes}
+    assert set(por_id) == {"gratis", "desconocido", "reciente"}
+    assert datetime.fromisoformat(por_id["gratis"]['checked_at']) > datetime.now() - timedelta(minutes=1)
+    assert 'checked_at' not in por_id["desconocido"]
+    assert barredor.revisados == 3 and barredor.eliminados == 1
+
+
+def test_barrer_sin_cambios_solo_guarda_fechas(tmp_path, cache):
+    ruta = tmp_path / "courses.json"
+    ruta.write_text(json.dumps({'courses': [entrada("gratis", extracted_at=hace(20))]}), encoding='utf-8')
+    publicados = []
+    barredor = BarredorCupones(lambda url: True, lambda vigentes, republicar: publicados.append(republicar),
+                               ruta=str(ruta))
+    assert barredor.barrer() == 0
+    assert publicados == [False]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la identidad canónica de los cursos (URL canónica e índice slug ↔ ID)
+"""
+from urllib.parse import quote
+
+import pytest
+
+from course_identity import IndiceIdentidades, cupon_en_url, identificador_en_url, url_canonica
+
+
+@pytest.mark.parametrize("url, esperada", [
+    ("https://www.udemy.com/course/python-basico/?couponCode=ABC123&utm_source=x&ranMID=1",
+     "https://www.udemy.com/course/python-basico/?couponCode=ABC123"),
+    ("https://udemy.com/course/python-basico",
+     "https://www.udemy.com/course/python-basico/"),
+    ("https://www.udemy.com/course/python-basico/?discountCode=OFERTA",
+     "https://www.udemy.com/course/python-basico/?couponCode=OFERTA"),
+    ("https://www.udemy.com/payment/checkout/express/course/5123456/?discountCode=XYZ",
+     "https://www.udemy.com/course/5123456/?couponCode=XYZ"),
+    ("https://click.linksynergy.com/deeplink?id=a&mid=39197&murl="
+     + quote("https://www.udemy.com/course/flutter-gemini/?couponCode=GRATIS&ranEAID=1", safe=""),
+     "https://www.udemy.com/course/flutter-gemini/?couponCode=GRATIS"),
+    ("https://www-udemy-com.translate.goog/course/flutter-gemini/?couponCode=GRATIS&_x_tr_sl=en&_x_tr_tl=es",
+     "https://www.udemy.com/course/flutter-gemini/?couponCode=GRATIS"),
+    ("https://cursosdev.com/coupons-udemy/python", "https://cursosdev.com/coupons-udemy/python"),
+    ("", ""),
+])
+def test_url_canonica(url, esperada):
+    assert url_canonica(url) == esperada
+
+
+def test_identificador_y_cupon():
+    assert identificador_en_url("https://www.udemy.com/course/python-basico/") == "python-basico"
+    assert identificador_en_url("https://www.udemy.com/payment/checkout/express/course/42/") == "42"
+    assert identificador_en_url("https://cursosdev.com/") is None
+    assert cupon_en_url("https://www.udemy.com/course/a/?couponCode=&discountCode=D") == "D"
+    assert cupon_en_url("https://www.udemy.com/course/a/") is None
+
+
+def test_slug_e_id_numerico_son_el_mismo_curso(tmp_path):
+    ruta = str(tmp_path / "course_ids.json")
+    indice = IndiceIdentidades(ruta, resolver_por_http=False)
+    assert indice.clave("https://www.udemy.com/course/5123456/") == "5123456"
+
+    assert indice.aprender("flutter-gemini", 5123456)
+    assert not indice.aprender("flutter-gemini", "5123456")
+    assert not indice.aprender("5123456", "5123456")
+    assert indice.clave("https://www.udemy.com/course/5123456/?couponCode=X") == "flutter-gemini"
+    assert indice.clave("https://www.udemy.com/course/flutter-gemini/") == "flutter-gemini"
+    assert indice.clave("https://cursosdev.com/coupons-udemy/flutter") is None
+
+    # Las equivalencias se conservan entre ejecuciones
+    recargado = IndiceIdentidades(ruta, resolver_por_http=False)
+    assert recargado.slug_a_id == {"flutter-gemini": "5123456"}
+    assert recargado.clave("https://www.udemy.com/payment/checkout/express/course/5123456/") == "flutter-gemini"
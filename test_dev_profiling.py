@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Pruebas del perfilado de una ejecución completa según DEV_CONFIG
+"""
+import json
+
+import pytest
+
+import run_metrics
+from config_bot_mejorado import DEV_CONFIG
+from dev_profiling import SeguimientoMemoria, perfilado
+from run_metrics import tramo
+from trace_export import traza_en_curso
+from webdriver_profiler import instrumentar_driver
+
+
+class DriverFalso:
+    def execute(self, driver_command, params=None):
+        return {'value': None}
+
+
+@pytest.fixture
+def config_dev(tmp_path, monkeypatch):
+    monkeypatch.setitem(DEV_CONFIG, "profile_dir", str(tmp_path))
+    for opcion in ("profile_performance", "memory_tracking", "profile_webdriver", "trace_export"):
+        monkeypatch.setitem(DEV_CONFIG, opcion, True)
+    return tmp_path
+
+
+def test_perfilado_guarda_todos_los_informes(config_dev):
+    driver = instrumentar_driver(DriverFalso())
+    with perfilado("prueba"):
+        with tramo("extraccion.cursosdev"):
+            driver.execute("get")
+        with tramo("verificacion"):
+            # Anidado: el bot que llama a otro no vuelve a perfilar
+            with perfilado("anidado"):
+                driver.execute("findElements")
+
+    archivos = sorted(ruta.name for ruta in config_dev.iterdir())
+    sufijos = [".prof", "_top.txt", "_memoria.txt", "_webdriver.json", "_trace.json"]
+    assert all(any(archivo.startswith("prueba_") and archivo.endswith(sufijo) for archivo in archivos)
+               for sufijo in sufijos)
+    assert not any(archivo.startswith("anidado_") for archivo in archivos)
+
+    memoria = next(config_dev.glob("prueba_*_memoria.txt")).read_text(encoding='utf-8')
+    assert "extraccion.cursosdev:" in memoria and "verificacion:" not in memoria
+
+    comandos = json.loads(next(config_dev.glob("prueba_*_webdriver.json")).read_text(encoding='utf-8'))
+    assert comandos['total_comandos'] == 2
+
+    traza = json.loads(next(config_dev.glob("prueba_*_trace.json")).read_text(encoding='utf-8'))
+    nombres = [evento['name'] for evento in traza['traceEvents'] if evento['ph'] == "X"]
+    assert nombres == ["extraccion.cursosdev", "webdriver.get", "verificacion", "webdriver.findElements"]
+
+    # Al terminar no queda nada enganchado a los tramos
+    assert run_metrics._observadores == [] and traza_en_curso() is None
+
+
+def test_sin_opciones_no_hace_nada(tmp_path, monkeypatch):
+    monkeypatch.setitem(DEV_CONFIG, "profile_dir", str(tmp_path / "perfiles"))
+    with perfilado("prueba"):
+        assert traza_en_curso() is None and run_metrics._observadores == []
+    assert not (tmp_path / "perfiles").exists()
+
+
+def test_etapas_de_memoria():
+    seguimiento = SeguimientoMemoria(["extraccion", "whatsapp"])
+    assert seguimiento.es_etapa("extraccion") and seguimiento.es_etapa("whatsapp.envio")
+    assert not seguimiento.es_etapa("extraccion_extra") and not seguimiento.es_etapa("verificacion")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pruebas del modo incremental: entradas vigentes, parada anticipada y fusión
+"""
+import json
+from datetime import datetime, timedelta
+
+from incremental_state import EstadoIncremental, cargar_cursos_anteriores, fecha_comprobacion
+
+
+def hace(horas):
+    return (datetime.now() - timedelta(hours=horas)).isoformat()
+
+
+def curso(course_id, horas=1, **extra):
+    return dict({'course_id': course_id, 'coupon_code': 'CUPON', 'extracted_at': hace(horas)}, **extra)
+
+
+def test_cargar_cursos_anteriores(tmp_path):
+    ruta = tmp_path / "courses.json"
+    assert cargar_cursos_anteriores(str(ruta)) == []
+    ruta.write_text("no es json", encoding='utf-8')
+    assert cargar_cursos_anteriores(str(ruta)) == []
+    ruta.write_text(json.dumps({'courses': [curso("a"), {'title': "sin id"}, "basura"]}), encoding='utf-8')
+    assert [c['course_id'] for c in cargar_cursos_anteriores(str(ruta))] == ["a"]
+    ruta.write_text(json.dumps([curso("b")]), encoding='utf-8')
+    assert [c['course_id'] for c in cargar_cursos_anteriores(str(ruta))] == ["b"]
+
+
+def test_fecha_comprobacion_prefiere_checked_at():
+    assert fecha_comprobacion({'extracted_at': "2026-01-01T00:00:00"}) == datetime(2026, 1, 1)
+    assert fecha_comprobacion({'extracted_at': "2026-01-01T00:00:00",
+                               'checked_at': "2026-02-01T00:00:00"}) == datetime(2026, 2, 1)
+    assert fecha_comprobacion({'extracted_at': "ayer"}) is None
+
+
+def test_entradas_caducadas_no_son_conocidas():
+    estado = EstadoIncremental([
+        curso("vigente", 10, source_url="https://cursosdev.com/coupons-udemy/vigente"),
+        curso("caducado", 100, source_url="https://cursosdev.com/coupons-udemy/caducado"),
+        curso("revisado", 100, checked_at=hace(1)),
+    ], max_horas=72)
+    assert estado.es_conocido("vigente", "CUPON")
+    assert not estado.es_conocido("vigente", "OTRO")
+    assert not estado.es_conocido("caducado", "CUPON")
+    assert estado.es_conocido("revisado", "CUPON")
+    assert estado.curso_de_origen("https://cursosdev.com/coupons-udemy/vigente")['course_id'] == "vigente"
+    assert estado.curso_de_origen("https://cursosdev.com/coupons-udemy/caducado") is None
+
+
+def test_parada_tras_conocidos_seguidos():
+    estado = EstadoIncremental([], parar_tras=3)
+    assert [estado.debe_parar(conocido) for conocido in (True, True, False, True, True)] == [False] * 5
+    assert estado.debe_parar(True)
+    estado.nueva_pagina()
+    assert not estado.debe_parar(True)
+    assert not any(EstadoIncremental([], parar_tras=0).debe_parar(True) for _ in range(5))
+
+
+def test_fusionar_sin_duplicados_del_mas_reciente_al_mas_antiguo():
+    estado = EstadoIncremental([curso("viejo", 30), curso("repetido", 20), curso("medio", 5)], max_cursos=3)
+    fusionados = estado.fusionar([curso("nuevo", 0), curso("repetido", 0.5, coupon_code="NUEVO")])
+    assert [c['course_id'] for c in fusionados] == ["nuevo", "repetido", "medio"]
+    assert fusionados[1]['coupon_code'] == "NUEVO"
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la sonda de fichas: una llamada al navegador y el escaneo del HTML en Python
+"""
+from page_probe import SCRIPT_EXISTE, SCRIPT_SONDA, sondear
+from price_scanner import escaner_precios_sin_carrito
+
+
+class DriverFalso:
+    """Responde a la sonda con un HTML fijo y registra los scripts ejecutados"""
+
+    def __init__(self, html, existe=True):
+        self.html = html
+        self.existe = existe
+        self.scripts = []
+
+    def execute_script(self, script, argumento):
+        self.scripts.append(script)
+        if script == SCRIPT_SONDA:
+            return {
+                'url': "https://www.udemy.com/course/python-basico/",
+                'html': self.html,
+                'id_numerico': "42",
+                'precio_elemento': None,
+                'selector_gratis': None,
+                'selector_precio_cero': None,
+                'selector_compra': None,
+            }
+        assert script == SCRIPT_EXISTE
+        return self.existe
+
+
+def test_sonda_escanea_el_html_en_python():
+    driver = DriverFalso("<html><body><h1>Curso</h1><span>100% GRATIS</span> antes $19.99</body></html>")
+    sonda = sondear(driver)
+    assert 'html' not in sonda
+    assert sonda['indicadores'][:2] == ["100% gratis", "gratis"]
+    assert sonda['precio'] == "$19.99" and sonda['valor'] == 19.99
+    assert sonda['selector_indicador'] == "//*[contains(text(), '100% gratis')]"
+    assert not sonda['desafio']
+    assert driver.scripts == [SCRIPT_SONDA, SCRIPT_EXISTE]
+
+
+def test_sin_indicadores_no_busca_selector():
+    driver = DriverFalso("<html><body>Comprar por 84.99 € · Add to cart</body></html>")
+    sonda = sondear(driver, escaner_precios_sin_carrito)
+    assert sonda['indicadores'] == []
+    assert sonda['precio'] == "84.99 €"
+    assert sonda['selector_indicador'] is None
+    assert driver.scripts == [SCRIPT_SONDA]
+
+
+def test_desafio_de_cloudflare():
+    sonda = sondear(DriverFalso("<html><title>Just a moment</title>Cloudflare</html>", existe=False))
+    assert sonda['desafio']
+    assert sonda['selector_indicador'] is None
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las colas acotadas y del pipeline origen → etapas → sumidero
+"""
+import threading
+import time
+
+from pipeline import ColaAcotada, Pipeline
+
+
+def test_cola_acotada_frena_al_productor():
+    cola = ColaAcotada(2)
+    puestos = []
+
+    def producir():
+        for i in range(5):
+            cola.poner(i)
+            puestos.append(i)
+        cola.cerrar()
+
+    hilo = threading.Thread(target=producir, daemon=True)
+    hilo.start()
+    time.sleep(0.2)
+    # Con la cola llena el productor espera al consumidor
+    assert puestos == [0, 1]
+    assert list(cola) == [0, 1, 2, 3, 4]
+    hilo.join(1)
+    assert not hilo.is_alive()
+
+
+def test_cola_termina_cuando_cierra_el_ultimo_productor():
+    cola = ColaAcotada(10, productores=2)
+    cola.poner("a")
+    cola.cerrar()
+    cola.poner("b")
+    leidos = []
+    lector = threading.Thread(target=lambda: leidos.extend(cola), daemon=True)
+    lector.start()
+    time.sleep(0.2)
+    assert lector.is_alive()
+    cola.cerrar()
+    lector.join(1)
+    assert leidos == ["a", "b"]
+    # El fin se queda en la cola para otros consumidores
+    assert list(cola) == []
+
+
+def test_cancelar_desbloquea_al_productor():
+    cola = ColaAcotada(1)
+    cola.poner(1)
+    resultado = []
+    productor = threading.Thread(target=lambda: resultado.append(cola.poner(2)), daemon=True)
+    productor.start()
+    time.sleep(0.1)
+    cola.cancelar()
+    productor.join(2)
+    assert resultado == [False]
+    assert not cola.poner(3)
+
+
+def test_pipeline_transforma_descarta_y_conserva_el_orden():
+    def origen(entregar):
+        for i in range(10):
+            entregar(i)
+        return "extraidos"
+
+    def doblar(i):
+        if i == 3:
+            raise ValueError("fallo")
+        return None if i % 2 else i * 2
+
+    pipeline = Pipeline(capacidad=2).etapa("doblar", doblar)
+    resultado_origen, resultado_sumidero = pipeline.ejecutar(origen, list)
+    assert resultado_origen == "extraidos"
+    assert resultado_sumidero == [0, 4, 8, 12, 16]
+
+
+def test_pipeline_con_varios_hilos_por_etapa():
+    pipeline = Pipeline(capacidad=3).etapa("mas uno", lambda i: i + 1, hilos=3)
+    _, resultado = pipeline.ejecutar(lambda entregar: [entregar(i) for i in range(50)], list)
+    assert sorted(resultado) == list(range(1, 51))
+
+
+def test_sumidero_que_para_antes_detiene_al_origen():
+    entregados = []
+
+    def origen(entregar):
+        for i in range(1000):
+            if not entregar(i):
+                return "detenido"
+            entregados.append(i)
+        return "completo"
+
+    def sumidero(elementos):
+        return [elemento for elemento, _ in zip(elementos, range(3))]
+
+    inicio = time.monotonic()
+    resultado_origen, resultado_sumidero = Pipeline(capacidad=2).ejecutar(origen, sumidero)
+    assert resultado_sumidero == [0, 1, 2]
+    assert resultado_origen == "detenido"
+    assert len(entregados) < 20
+    assert time.monotonic() - inicio < 3
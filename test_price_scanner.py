@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Pruebas del escáner de precios frente a la búsqueda original (un findall por
+patrón y una búsqueda de subcadena por indicador)
+"""
+import random
+import re
+
+import pytest
+
+from price_scanner import (
+    INDICADORES_GRATIS,
+    INDICADORES_GRATIS_SIN_CARRITO,
+    EscanerPrecios,
+    escaner_precios,
+    escaner_precios_sin_carrito,
+)
+
+PATRONES_ORIGINALES = [
+    r'\$\d+\.?\d*',
+    r'€\d+\.?\d*',
+    r'£\d+\.?\d*',
+    r'\d+\.?\d*\s*\$',
+    r'\d+\.?\d*\s*€',
+    r'\d+\.?\d*\s*£',
+]
+
+TEXTOS = [
+    "",
+    "Inscribirse gratis - 100% GRATIS hoy",
+    "Precio original: $19.99 ahora $0",
+    "Price: 84,99 € Add to cart",
+    "Enroll now for FREE forever",
+    "Cost 0.00 $ - sin costo",
+    "Este curso cuesta 20 £ y no es gratuito",
+    "free course, completely free, no payment",
+    "$0 $0.00 0,00 €",
+    "Sin indicadores ni precios en este texto",
+]
+
+FRAGMENTOS = [
+    "$", "€", "£", "0", "1", "9.99", "19", ".", ",", " ", "\n", "free", "gratis", "100%", "FREE",
+    "forever", "enroll", "now", "add to cart", "agregar al carrito", "sin costo", "precio", "x",
+]
+
+
+def escanear_original(texto, indicadores):
+    """Veredicto como lo calculaban las funciones de verificación antes del escáner"""
+    texto = texto.lower()
+    tiene_precio = any(
+        float(re.search(r'\d+\.?\d*', coincidencia).group()) > 0
+        for patron in PATRONES_ORIGINALES
+        for coincidencia in re.findall(patron, texto)
+    )
+    encontrados = [indicador for indicador in indicadores if indicador.lower() in texto]
+    return tiene_precio, encontrados
+
+
+def textos_aleatorios(cantidad=300):
+    azar = random.Random(1234)
+    return ["".join(azar.choice(FRAGMENTOS) for _ in range(azar.randint(1, 25))) for _ in range(cantidad)]
+
+
+@pytest.mark.parametrize("escaner, indicadores", [
+    (escaner_precios, INDICADORES_GRATIS),
+    (escaner_precios_sin_carrito, INDICADORES_GRATIS_SIN_CARRITO),
+])
+def test_mismo_veredicto_que_la_busqueda_original(escaner, indicadores):
+    for texto in TEXTOS + textos_aleatorios():
+        tiene_precio, encontrados = escanear_original(texto, indicadores)
+        veredicto = escaner.escanear(texto)
+        assert veredicto['tiene_precio'] == tiene_precio, texto
+        assert veredicto['es_gratis'] == bool(encontrados), texto
+        assert veredicto['indicadores'] == encontrados, texto
+        assert veredicto['indicador'] == (encontrados[0] if encontrados else None), texto
+
+
+def test_primer_precio_mayor_que_cero():
+    veredicto = escaner_precios.escanear("Antes $0, ahora 12.50 € y luego $30")
+    assert veredicto['precio'] == "12.50 €"
+    assert veredicto['valor'] == 12.5
+
+
+def test_indicadores_que_son_prefijo_de_otro():
+    veredicto = EscanerPrecios(["free", "free forever"]).escanear("Free forever")
+    assert veredicto['indicadores'] == ["free", "free forever"]
+    assert veredicto['indicador'] == "free"
+
+
+def test_sin_carrito_ignora_los_botones_de_compra():
+    assert escaner_precios.escanear("Add to cart")['es_gratis']
+    assert not escaner_precios_sin_carrito.escanear("Add to cart")['es_gratis']
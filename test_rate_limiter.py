@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Pruebas del limitador de velocidad por host (token bucket y backoff)
+"""
+import time
+
+import pytest
+
+from rate_limiter import CubetaHost, LimitadorVelocidad, es_local, host_de
+
+
+def test_host_de_y_es_local():
+    assert host_de("https://www.udemy.com/course/a/") == "udemy.com"
+    assert host_de("https://cursosdev.com/") == "cursosdev.com"
+    assert es_local("http://127.0.0.1:8765/x") and es_local("http://[::1]:80/") and es_local("http://localhost/")
+    assert not es_local("https://udemy.com/")
+
+
+def test_cubeta_permite_rafaga_y_luego_marca_el_ritmo():
+    cubeta = CubetaHost(por_segundo=2.0, rafaga=3)
+    ahora = cubeta.actualizado
+    assert [cubeta.reservar(ahora) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Sin tokens, cada llamador espera su turno en orden: 0.5s, 1s, 1.5s
+    assert [cubeta.reservar(ahora) for _ in range(3)] == pytest.approx([0.5, 1.0, 1.5])
+
+
+def test_cubeta_se_rellena_sin_pasar_de_la_rafaga():
+    cubeta = CubetaHost(por_segundo=2.0, rafaga=2)
+    ahora = cubeta.actualizado
+    cubeta.reservar(ahora)
+    cubeta.reservar(ahora)
+    assert cubeta.reservar(ahora + 0.5) == 0.0
+    # Tras mucho tiempo solo se acumula la ráfaga
+    ahora += 100
+    assert [cubeta.reservar(ahora) for _ in range(3)] == pytest.approx([0.0, 0.0, 0.5])
+
+
+def test_esperar_turno_respeta_el_ritmo():
+    limitador = LimitadorVelocidad(peticiones_por_minuto=600, rafaga=2)
+    inicio = time.monotonic()
+    for _ in range(5):
+        limitador.esperar_turno("https://udemy.com/api")
+    duracion = time.monotonic() - inicio
+    # 2 de ráfaga y 3 a 10 por segundo
+    assert 0.25 <= duracion < 1.0
+    assert limitador.esperado == pytest.approx(0.3, abs=0.05)
+    # Otro host tiene su propia cubeta
+    assert limitador.esperar_turno("https://cursosdev.com/") == 0.0
+
+
+def test_backoff_exponencial_con_tope_y_reinicio():
+    limitador = LimitadorVelocidad(peticiones_por_minuto=6000, rafaga=1, retardo_base=2, max_backoff=5)
+    url = "https://udemy.com/"
+    esperas = []
+    for _ in range(3):
+        limitador.registrar_bloqueo(url)
+        cubeta = limitador._cubetas["udemy.com"]
+        esperas.append(round(cubeta.backoff_hasta - time.monotonic()))
+        cubeta.backoff_hasta = 0.0
+    assert esperas == [2, 4, 5]
+
+    limitador.registrar_exito(url)
+    limitador.registrar_bloqueo(url)
+    assert round(limitador._cubetas["udemy.com"].backoff_hasta - time.monotonic()) == 2
+
+
+def test_retry_after_y_backoff_lineal():
+    limitador = LimitadorVelocidad(retardo_base=3, backoff_exponencial=False, max_backoff=60)
+    limitador.registrar_bloqueo("https://udemy.com/", retry_after=7)
+    cubeta = limitador._cubetas["udemy.com"]
+    assert round(cubeta.backoff_hasta - time.monotonic()) == 7
+    assert cubeta.tokens <= 0
+    cubeta.backoff_hasta = 0.0
+    limitador.registrar_bloqueo("https://udemy.com/")
+    limitador.registrar_bloqueo("https://udemy.com/")
+    assert round(cubeta.backoff_hasta - time.monotonic()) == 3
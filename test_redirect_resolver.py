@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Pruebas de desenvolver(): enlaces de afiliados y del traductor de Google, sin red
+"""
+from urllib.parse import quote
+
+from redirect_resolver import desenvolver
+
+
+def test_linksynergy_decodifica_el_destino_una_sola_vez():
+    destino = "https://www.udemy.com/course/python/?couponCode=100%25OFF&ref=a%2Fb"
+    envuelto = "https://click.linksynergy.com/deeplink?id=x&murl=" + quote(destino, safe="")
+    assert desenvolver(envuelto) == destino
+
+
+def test_traductor_y_afiliado_anidados():
+    destino = "https://www.udemy.com/course/python/?couponCode=GRATIS"
+    envuelto = ("https://click-linksynergy-com.translate.goog/deeplink?murl=" + quote(destino, safe="")
+                + "&_x_tr_sl=en&_x_tr_tl=es")
+    assert desenvolver(envuelto) == destino
+
+
+def test_urls_sin_envoltorio_no_cambian():
+    url = "https://cursosdev.com/coupons-udemy/python?page=2"
+    assert desenvolver(url) == url
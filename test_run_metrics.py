@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las métricas de ejecución: tramos, contadores y el archivo de estadísticas
+"""
+import json
+
+import pytest
+
+import run_metrics
+from run_metrics import MetricasEjecucion, agregar_observador, contar, guardar_resumen, medido, quitar_observador, tramo
+
+
+@pytest.fixture
+def metricas(monkeypatch):
+    metricas = MetricasEjecucion("prueba")
+    monkeypatch.setattr(run_metrics, "_metricas", metricas)
+    return metricas
+
+
+def test_tramo_cuenta_errores_y_propaga_la_excepcion(metricas):
+    with tramo("navegacion"):
+        pass
+    with pytest.raises(ValueError):
+        with tramo("navegacion"):
+            raise ValueError("fallo")
+
+    datos = metricas.tramos["navegacion"]
+    assert datos['veces'] == 2
+    assert datos['errores'] == 1
+    assert metricas.contadores['error_count'] == 1
+
+
+def test_medido_cuenta_solo_resultados_verdaderos(metricas):
+    @medido("captura", contador="screenshots_taken")
+    def capturar(ruta):
+        if ruta == "error":
+            raise OSError("disco lleno")
+        return ruta
+
+    capturar("a.png")
+    capturar(None)
+    with pytest.raises(OSError):
+        capturar("error")
+
+    assert metricas.tramos["captura"]['veces'] == 3
+    assert metricas.tramos["captura"]['errores'] == 1
+    assert metricas.contadores['screenshots_taken'] == 1
+    assert capturar.__name__ == "capturar"
+
+
+def test_resumen_calcula_la_tasa_de_exito(metricas):
+    contar("courses_processed", 4)
+    contar("courses_found")
+    resumen = metricas.resumen()
+    assert resumen['bot'] == "prueba"
+    assert resumen['metricas']['success_rate'] == 0.25
+    assert resumen['contadores'] == {'courses_processed': 4, 'courses_found': 1}
+
+
+def test_observadores_reciben_el_tramo_con_sus_detalles(monkeypatch):
+    monkeypatch.setattr(run_metrics, "_metricas", None)
+    recibidos = []
+
+    def observador(nombre, inicio, fin, error, detalles):
+        recibidos.append((nombre, fin >= inicio, error, detalles))
+
+    agregar_observador(observador)
+    try:
+        with tramo("verificacion", {'course_id': "python-basico"}):
+            pass
+        with pytest.raises(RuntimeError):
+            with tramo("whatsapp.envio"):
+                raise RuntimeError
+    finally:
+        quitar_observador(observador)
+
+    assert recibidos == [
+        ("verificacion", True, False, {'course_id': "python-basico"}),
+        ("whatsapp.envio", True, True, None),
+    ]
+
+
+def test_guardar_resumen_agrega_al_archivo_existente(tmp_path):
+    ruta = tmp_path / "bot_stats.json"
+    guardar_resumen({'bot': "primero"}, str(ruta))
+    guardar_resumen({'bot': "segundo"}, str(ruta))
+    datos = json.loads(ruta.read_text(encoding='utf-8'))
+    assert [ejecucion['bot'] for ejecucion in datos['ejecuciones']] == ["primero", "segundo"]
+    assert not (tmp_path / "bot_stats.json.tmp").exists()
+
+
+@pytest.mark.parametrize("contenido", ["{no es json", "[1, 2]", '{"ejecuciones": "x"}'])
+def test_guardar_resumen_reemplaza_un_archivo_corrupto(tmp_path, contenido):
+    ruta = tmp_path / "bot_stats.json"
+    ruta.write_text(contenido, encoding='utf-8')
+    guardar_resumen({'bot': "prueba"}, str(ruta))
+    assert json.loads(ruta.read_text(encoding='utf-8')) == {'ejecuciones': [{'bot': "prueba"}]}
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la exportación de la ejecución al formato Trace Event de Chrome
+"""
+import json
+import threading
+
+from trace_export import TrazaChrome
+
+
+def test_eventos_ordenados_y_anidados():
+    traza = TrazaChrome("bot")
+    base = traza._origen
+    traza.completo("verificacion.http", base + 2.0, base + 2.5)
+    traza.completo("extraccion.cursosdev", base + 1.0, base + 5.0)
+    traza.completo("verificacion", base + 2.0, base + 3.0, detalles={'course_id': "python-basico", 'intento': 1})
+
+    eventos = [evento for evento in traza.como_dict()['traceEvents'] if evento['ph'] == "X"]
+    # Por inicio y, a igual inicio, el más largo primero (el que contiene al otro)
+    assert [evento['name'] for evento in eventos] == ["extraccion.cursosdev", "verificacion", "verificacion.http"]
+    assert eventos[0]['ts'] == 1_000_000.0 and eventos[0]['dur'] == 4_000_000.0
+    assert eventos[0]['cat'] == "extraccion"
+    assert eventos[1]['args'] == {'course_id': "python-basico", 'intento': "1"}
+    assert 'args' not in eventos[2]
+
+
+def test_metadatos_de_proceso_e_hilos():
+    traza = TrazaChrome("bot_principal")
+    traza.completo("pipeline", traza._origen, traza._origen + 1)
+    hilo = threading.Thread(target=lambda: traza.completo("worker", traza._origen, traza._origen + 0.5),
+                            name="fuente-cursosdev")
+    hilo.start()
+    hilo.join()
+
+    documento = traza.como_dict()
+    metadatos = [evento for evento in documento['traceEvents'] if evento['ph'] == "M"]
+    assert documento['traceEvents'][:len(metadatos)] == metadatos
+    assert metadatos[0]['name'] == "process_name" and metadatos[0]['args'] == {'name': "bot_principal"}
+    hilos = {evento['tid']: evento['args']['name'] for evento in metadatos[1:]}
+    assert hilos == {threading.main_thread().ident: "MainThread", hilo.ident: "fuente-cursosdev"}
+    tids = {evento['name']: evento['tid'] for evento in documento['traceEvents'] if evento['ph'] == "X"}
+    assert tids == {'pipeline': threading.main_thread().ident, 'worker': hilo.ident}
+
+
+def test_observar_marca_los_errores_y_guardar_escribe_json(tmp_path):
+    traza = TrazaChrome("bot")
+    traza.observar("whatsapp.envio", traza._origen, traza._origen + 1, True, {'curso': "a"})
+    traza.observar("whatsapp.pausa", traza._origen + 1, traza._origen + 2, False)
+    ruta = tmp_path / "traza.json"
+    traza.guardar(str(ruta))
+
+    documento = json.loads(ruta.read_text(encoding='utf-8'))
+    eventos = [evento for evento in documento['traceEvents'] if evento['ph'] == "X"]
+    assert eventos[0]['args'] == {'curso': "a", 'error': "True"}
+    assert 'args' not in eventos[1]
+    assert documento['displayTimeUnit'] == "ms"
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la verificación por HTTP contra el sustituto local de Udemy
+"""
+import json
+import time
+
+import pytest
+
+import rate_limiter
+from config_bot_mejorado import SECURITY_CONFIG, UDEMY_CONFIG
+from udemy_http import RUTA_API_PRECIOS, verificar_por_http
+from udemy_standin import ServidorUdemyLocal, guardar_respuesta
+
+
+def respuesta_precio(importe):
+    return json.dumps({
+        "price_text": {"data": {"pricing_result": {"price": {"amount": importe, "price_string": f"${importe}"}}}},
+        "redeem_coupon": {"discount_attempts": []},
+    }).encode()
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    """Sustituto de Udemy con 8 cursos (los impares de pago) y un limitador estricto"""
+    for id_numerico in range(1, 9):
+        url = RUTA_API_PRECIOS.format(id=id_numerico) + "?couponCode=GRATIS"
+        guardar_respuesta(str(tmp_path), url, respuesta_precio(id_numerico % 2 * 9.99), es_json=True)
+    monkeypatch.setitem(SECURITY_CONFIG, "rate_limiting", True)
+    monkeypatch.setitem(SECURITY_CONFIG, "requests_per_minute", 30)
+    monkeypatch.setitem(SECURITY_CONFIG, "burst", 1)
+    monkeypatch.setattr(rate_limiter, "_limitador", None)
+    with ServidorUdemyLocal(str(tmp_path)) as local:
+        monkeypatch.setitem(UDEMY_CONFIG, "base_url", local.url_base)
+        yield local
+
+
+def test_verificacion_local_sin_limite_de_velocidad(servidor):
+    inicio = time.perf_counter()
+    resultados = [
+        verificar_por_http(f"https://www.udemy.com/course/{id_numerico}/?couponCode=GRATIS")
+        for id_numerico in range(1, 9)
+    ]
+    duracion = time.perf_counter() - inicio
+
+    assert resultados == [False, True] * 4
+    # Con el limitador aplicado serían 2s por petición a partir de la segunda
+    assert duracion < 1.0
+    assert rate_limiter.obtener_limitador().esperado == 0.0
+
+
+def test_hosts_remotos_siguen_limitados():
+    limitador = rate_limiter.LimitadorVelocidad(peticiones_por_minuto=600, rafaga=1)
+    assert limitador.esperar_turno("http://127.0.0.1:8765/api") == 0.0
+    assert limitador.esperar_turno("http://localhost/api") == 0.0
+    assert limitador.esperar_turno("https://www.udemy.com/course/a/") == 0.0
+    assert limitador.esperar_turno("https://www.udemy.com/course/b/") > 0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la caché de verificaciones: vigencia (TTL) y desalojo
+"""
+import pytest
+
+import verification_cache
+from verification_cache import CacheVerificaciones
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1_000_000.0
+
+    def __call__(self):
+        return self.ahora
+
+    def avanzar(self, horas):
+        self.ahora += horas * 3600
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = Reloj()
+    monkeypatch.setattr(verification_cache.time, "time", reloj)
+    return reloj
+
+
+@pytest.fixture
+def cache(tmp_path, reloj):
+    cache = CacheVerificaciones(str(tmp_path / "cache.db"), ttl_horas=12, ttl_negativo_horas=6, max_entradas=3)
+    yield cache
+    cache.cerrar()
+
+
+def test_guardar_y_consultar(cache):
+    assert cache.consultar("python", "CUPON") is None
+    cache.guardar("python", "CUPON", True, {'nivel': "http"})
+    cache.guardar("java", None, False)
+    assert cache.consultar("python", "CUPON") == (True, {'nivel': "http"})
+    assert cache.consultar("python", "OTRO") is None
+    assert cache.consultar("java", None) == (False, {})
+    assert cache.consultar("java", "") == (False, {})
+    assert (cache.aciertos, cache.fallos) == (3, 2)
+
+
+def test_sin_course_id_no_se_guarda_ni_se_consulta(cache):
+    cache.guardar("", "CUPON", True)
+    assert cache.consultar("", "CUPON") is None
+    assert cache.fallos == 0
+
+
+def test_ttl_distinto_para_gratis_y_de_pago(cache, reloj):
+    cache.guardar("gratis", "C", True)
+    cache.guardar("de_pago", "C", False)
+    reloj.avanzar(7)
+    assert cache.consultar("gratis", "C") == (True, {})
+    assert cache.consultar("de_pago", "C") is None
+    reloj.avanzar(6)
+    assert cache.consultar("gratis", "C") is None
+
+
+def test_desalojo_de_vencidas_y_de_las_mas_antiguas(cache, reloj):
+    for curso in ["a", "b", "c", "d", "e"]:
+        cache.guardar(curso, "C", True)
+        reloj.avanzar(1)
+    cache.guardar("pago", "C", False)
+    reloj.avanzar(7)
+    cache.desalojar()
+    filas = cache._conexion.execute("SELECT course_id FROM verificaciones ORDER BY verificado_en").fetchall()
+    # Sobra la de pago (vencida) y quedan las max_entradas más recientes
+    assert [fila[0] for fila in filas] == ["c", "d", "e"]
+
+
+def test_los_resultados_persisten_entre_ejecuciones(tmp_path, reloj):
+    ruta = str(tmp_path / "cache.db")
+    cache = CacheVerificaciones(ruta)
+    cache.guardar("python", "CUPON", True)
+    cache.cerrar()
+    reabierta = CacheVerificaciones(ruta)
+    assert reabierta.consultar("python", "CUPON") == (True, {})
+    reabierta.cerrar()
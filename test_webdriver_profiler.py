@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Pruebas del registro de comandos WebDriver por tipo y por punto de llamada
+"""
+import pytest
+
+import trace_export
+import webdriver_profiler
+from run_metrics import medido
+from webdriver_profiler import detener_registro, iniciar_registro, instrumentar_driver
+
+
+class DriverFalso:
+    """Solo tiene execute, que es lo que instrumentar_driver envuelve"""
+
+    def __init__(self):
+        self.comandos = []
+
+    def execute(self, driver_command, params=None):
+        self.comandos.append(driver_command)
+        if driver_command == "fallar":
+            raise RuntimeError("chromedriver caído")
+        return {'value': None}
+
+
+@pytest.fixture
+def registro(monkeypatch):
+    monkeypatch.setattr(trace_export, "_traza", None)
+    registro = iniciar_registro()
+    yield registro
+    detener_registro()
+
+
+def buscar_enlaces(driver):
+    for _ in range(3):
+        driver.execute("findElements")
+
+
+@medido("sonda")
+def sondear(driver):
+    driver.execute("executeScript")
+
+
+def test_cuenta_por_comando_y_por_sitio(registro):
+    driver = instrumentar_driver(DriverFalso())
+    buscar_enlaces(driver)
+    sondear(driver)
+
+    datos = registro.como_dict()
+    assert {comando['comando']: comando['veces'] for comando in datos['comandos']} == {
+        'findElements': 3, 'executeScript': 1,
+    }
+    sitios = {sitio['sitio']: sitio['comandos'] for sitio in datos['sitios']}
+    assert len(sitios) == 2
+    enlaces = next(sitio for sitio in sitios if sitio.startswith("test_webdriver_profiler.py:"))
+    assert "(buscar_enlaces) ← test_webdriver_profiler.py:" in enlaces
+    assert sitios[enlaces] == {'findElements': 3}
+    # El decorador de run_metrics no cuenta como punto de llamada
+    sonda = next(sitio for sitio in sitios if "(sondear)" in sitio)
+    assert "run_metrics" not in sonda and "(test_cuenta_por_comando_y_por_sitio)" in sonda
+    assert registro.totales()[0] == 4
+
+
+def test_los_comandos_que_fallan_tambien_se_registran(registro):
+    driver = instrumentar_driver(DriverFalso())
+    with pytest.raises(RuntimeError):
+        driver.execute("fallar")
+    assert registro.como_dict()['comandos'][0]['comando'] == "fallar"
+
+
+def test_sin_registro_ni_traza_solo_llama_al_original(monkeypatch):
+    monkeypatch.setattr(trace_export, "_traza", None)
+    monkeypatch.setattr(webdriver_profiler, "_registro", None)
+    driver = DriverFalso()
+    assert instrumentar_driver(instrumentar_driver(driver)) is driver
+    driver.execute("get")
+    assert driver.comandos == ["get"]
+
+
+def test_los_comandos_van_a_la_traza(monkeypatch):
+    monkeypatch.setattr(webdriver_profiler, "_registro", None)
+    traza = trace_export.iniciar_traza("prueba")
+    try:
+        instrumentar_driver(DriverFalso()).execute("get")
+    finally:
+        trace_export.detener_traza()
+    assert [evento['name'] for evento in traza.eventos] == ["webdriver.get"]
+    assert traza.eventos[0]['cat'] == "webdriver"
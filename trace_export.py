@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Exportación de una ejecución al formato Trace Event de Chrome
+Con DEV_CONFIG['trace_export'] cada tramo de run_metrics (etapas,
+extracción por fuente, verificación por curso, navegación, esperas, envío
+por WhatsApp) y cada comando WebDriver se guarda como un evento completo
+("ph": "X") con su hilo. El JSON resultante se abre en chrome://tracing o en
+https://ui.perfetto.dev y muestra la línea de tiempo de la ejecución, con los
+tramos anidados y las esperas secuenciales que podrían solaparse.
+"""
+import json
+import os
+import threading
+import time
+
+from config_bot_mejorado import get_config
+
+
+def exportacion_traza_activada():
+    return get_config('dev').get('trace_export', False)
+
+
+class TrazaChrome:
+    """Eventos Trace Event de Chrome de una ejecución"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.pid = os.getpid()
+        self.eventos = []
+        self._hilos = {}
+        self._origen = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _microsegundos(self, instante):
+        return round((instante - self._origen) * 1_000_000, 1)
+
+    def completo(self, nombre, inicio, fin, categoria=None, detalles=None):
+        """Añadir un evento completo; inicio y fin son de time.perf_counter()"""
+        hilo = threading.current_thread()
+        evento = {
+            'name': nombre,
+            'cat': categoria or nombre.split(".")[0],
+            'ph': "X",
+            'ts': self._microsegundos(inicio),
+            'dur': round((fin - inicio) * 1_000_000, 1),
+            'pid': self.pid,
+            'tid': hilo.ident,
+        }
+        if detalles:
+            evento['args'] = {clave: str(valor) for clave, valor in detalles.items()}
+        with self._lock:
+            self._hilos.setdefault(hilo.ident, hilo.name)
+            self.eventos.append(evento)
+
+    def observar(self, nombre, inicio, fin, error, detalles=None):
+        if error:
+            detalles = dict(detalles or {}, error=True)
+        self.completo(nombre, inicio, fin, detalles=detalles)
+
+    def como_dict(self):
+        """Documento JSON Object Format: metadatos de proceso e hilos y eventos por instante"""
+        with self._lock:
+            metadatos = [{'name': "process_name", 'ph': "M", 'pid': self.pid, 'tid': 0,
+                          'args': {'name': self.nombre}}]
+            metadatos.extend({'name': "thread_name", 'ph': "M", 'pid': self.pid, 'tid': tid,
+                              'args': {'name': nombre}} for tid, nombre in self._hilos.items())
+            # A igual inicio, el tramo más largo primero para que los anidados queden dentro
+            eventos = sorted(self.eventos, key=lambda evento: (evento['ts'], -evento['dur']))
+        return {'traceEvents': metadatos + eventos, 'displayTimeUnit': "ms"}
+
+    def guardar(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.como_dict(), f, ensure_ascii=False)
+        print(f"🧭 Traza de la ejecución guardada: {ruta} ({len(self.eventos)} eventos; "
+              f"ábrela en chrome://tracing o https://ui.perfetto.dev)")
+
+
+_traza = None
+
+
+def iniciar_traza(nombre):
+    """Empezar a registrar los eventos de la ejecución"""
+    global _traza
+    _traza = TrazaChrome(nombre)
+    return _traza
+
+
+def detener_traza():
+    """Dejar de registrar; devuelve la traza de la ejecución"""
+    global _traza
+    traza, _traza = _traza, None
+    return traza
+
+
+def traza_en_curso():
+    """Traza de la ejecución en curso, o None si no hay ninguna"""
+    return _traza
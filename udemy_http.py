@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Verificación de cursos de Udemy por HTTP, sin abrir el navegador
+Se consulta la API de precios que usa la propia ficha del curso
+(course-landing-components) con la sesión HTTP compartida y solo se lee
+el precio y el estado del cupón. Si la respuesta no es concluyente se
+devuelve None para que el llamador recurra al navegador.
+"""
+import re
+
+from course_identity import cupon_en_url, identificador_en_url, obtener_indice_identidades
+from http_client import descargar, http_disponible
+from config_bot_mejorado import get_config
+
+RUTA_API_PRECIOS = "/api-2.0/course-landing-components/{id}/me/"
+COMPONENTES_PRECIO = "price_text,deal_badge,discount_expiration,redeem_coupon"
+
+# El ID numérico aparece en el <body> de la ficha, al principio del documento
+PATRON_ID_NUMERICO = re.compile(rb'data-clp-course-id="(\d+)"')
+MAX_BYTES_FICHA = 256 * 1024
+
+# Estados de redeem_coupon con los que el cupón no se aplica
+ESTADOS_CUPON_INVALIDO = {"invalid", "expired", "not_found", "disabled"}
+
+
+def url_base_udemy():
+    return get_config('udemy').get('base_url', 'https://www.udemy.com').rstrip('/')
+
+
+def verificacion_http_activada():
+    return http_disponible() and get_config('udemy').get('http_verification', True)
+
+
+def leer_id_de_ficha(url_curso):
+    """Descargar la ficha hasta encontrar data-clp-course-id, sin leer el resto del documento"""
+    respuesta = descargar(url_curso, stream=True)
+    if respuesta is None:
+        return None
+    try:
+        if respuesta.status_code != 200:
+            return None
+        leido = b""
+        for bloque in respuesta.iter_content(chunk_size=16 * 1024):
+            leido += bloque
+            coincidencia = PATRON_ID_NUMERICO.search(leido)
+            if coincidencia:
+                return coincidencia.group(1).decode()
+            if len(leido) >= MAX_BYTES_FICHA:
+                break
+        return None
+    finally:
+        respuesta.close()
+
+
+def id_numerico_de(udemy_url):
+    """ID numérico del curso: de la URL, del índice de identidades o de la ficha"""
+    identificador = identificador_en_url(udemy_url)
+    if not identificador:
+        return None
+    if identificador.isdigit():
+        return identificador
+    indice = obtener_indice_identidades()
+    if identificador in indice.slug_a_id:
+        return indice.slug_a_id[identificador]
+    id_numerico = leer_id_de_ficha(f"{url_base_udemy()}/course/{identificador}/")
+    if id_numerico:
+        indice.aprender(identificador, id_numerico)
+    return id_numerico
+
+
+def consultar_precio(id_numerico, coupon_code=None):
+    """JSON de la API de precios del curso, o None si no se pudo obtener"""
+    parametros = {"components": COMPONENTES_PRECIO}
+    if coupon_code:
+        parametros["couponCode"] = coupon_code
+    respuesta = descargar(
+        url_base_udemy() + RUTA_API_PRECIOS.format(id=id_numerico),
+        params=parametros,
+        headers={"Accept": "application/json"},
+    )
+    if respuesta is None or respuesta.status_code != 200:
+        return None
+    try:
+        return respuesta.json()
+    except ValueError:
+        return None
+
+
+def interpretar_precio(datos, coupon_code=None):
+    """True si el precio con el cupón es 0, False si tiene precio o el cupón no vale, None si no se sabe"""
+    if not isinstance(datos, dict):
+        return None
+
+    intentos = (datos.get("redeem_coupon") or {}).get("discount_attempts") or []
+    for intento in intentos:
+        if coupon_code and intento.get("code", "").upper() != coupon_code.upper():
+            continue
+        if intento.get("status") in ESTADOS_CUPON_INVALIDO:
+            print(f"❌ Cupón {intento.get('code')} no válido ({intento.get('status')})")
+            return False
+
+    precio = (((datos.get("price_text") or {}).get("data") or {}).get("pricing_result") or {}).get("price")
+    if not isinstance(precio, dict) or precio.get("amount") is None:
+        return None
+    try:
+        importe = float(precio["amount"])
+    except (TypeError, ValueError):
+        return None
+    if importe > 0:
+        print(f"❌ Precio por HTTP: {precio.get('price_string') or importe}")
+        return False
+    return True
+
+
+def verificar_por_http(udemy_url, coupon_code=None):
+    """Verificar por HTTP si el curso es gratis con el cupón: True/False, o None si no es concluyente"""
+    if not verificacion_http_activada():
+        return None
+    if coupon_code is None:
+        coupon_code = cupon_en_url(udemy_url)
+    try:
+        id_numerico = id_numerico_de(udemy_url)
+        if not id_numerico:
+            return None
+        es_gratis = interpretar_precio(consultar_precio(id_numerico, coupon_code), coupon_code)
+    except Exception as e:
+        print(f"⚠️ Error verificando por HTTP: {e}")
+        return None
+    if es_gratis is not None:
+        print(f"⚡ Verificado por HTTP: {'gratis' if es_gratis else 'de pago'} ({udemy_url})")
+    return es_gratis
+
+
+def verificar_con_respaldo(udemy_url, verificar_en_navegador, coupon_code=None):
+    """Verificar por HTTP y, si no es concluyente, con verificar_en_navegador()"""
+    es_gratis = verificar_por_http(udemy_url, coupon_code)
+    if es_gratis is not None:
+        return es_gratis
+    return verificar_en_navegador()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local que sustituye a Udemy con respuestas grabadas
+Sirve fichas de cursos y respuestas de la API de precios guardadas en un
+directorio, para probar y medir la verificación por HTTP sin red.
+Cada respuesta se guarda en <directorio>/<ruta de la URL>/, como
+cupon-<CÓDIGO>.json (precio con ese cupón), index.json o index.html.
+
+Uso:
+    python udemy_standin.py grabar <url> [<url> ...]   # guardar respuestas reales
+    python udemy_standin.py servir [puerto]            # servir lo grabado
+"""
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+from http_client import descargar
+
+DIRECTORIO_POR_DEFECTO = "udemy_grabaciones"
+
+TIPOS_CONTENIDO = {
+    ".json": "application/json; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+}
+
+
+def _carpeta(directorio, ruta_url):
+    """Carpeta de una ruta de URL dentro del directorio (sin salir de él)"""
+    partes = [parte for parte in ruta_url.split('/') if parte and parte not in ('.', '..')]
+    return os.path.join(directorio, *partes)
+
+
+def _nombre_cupon(cupon):
+    return "cupon-" + re.sub(r'[^A-Za-z0-9_-]', '_', cupon) + ".json"
+
+
+def archivo_grabado(directorio, url):
+    """Archivo con la respuesta grabada para una URL, o None si no hay"""
+    partes = urlparse(url)
+    carpeta = _carpeta(directorio, partes.path)
+    cupon = dict(parse_qsl(partes.query)).get("couponCode")
+    candidatos = ([_nombre_cupon(cupon)] if cupon else []) + ["index.json", "index.html"]
+    for nombre in candidatos:
+        ruta = os.path.join(carpeta, nombre)
+        if os.path.isfile(ruta):
+            return ruta
+    return None
+
+
+def guardar_respuesta(directorio, url, contenido, es_json):
+    """Guardar el cuerpo de una respuesta donde el servidor la buscará"""
+    partes = urlparse(url)
+    cupon = dict(parse_qsl(partes.query)).get("couponCode")
+    if es_json:
+        nombre = _nombre_cupon(cupon) if cupon else "index.json"
+    else:
+        nombre = "index.html"
+    carpeta = _carpeta(directorio, partes.path)
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, nombre)
+    with open(ruta, "wb") as f:
+        f.write(contenido)
+    return ruta
+
+
+def grabar(url, directorio=DIRECTORIO_POR_DEFECTO):
+    """Descargar una URL real de Udemy (ficha o API de precios) y guardarla"""
+    respuesta = descargar(url)
+    if respuesta is None or respuesta.status_code != 200:
+        print(f"❌ No se pudo grabar {url}")
+        return None
+    es_json = "json" in respuesta.headers.get("Content-Type", "")
+    ruta = guardar_respuesta(directorio, url, respuesta.content, es_json)
+    print(f"💾 Grabado: {url} -> {ruta}")
+    return ruta
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    directorio = DIRECTORIO_POR_DEFECTO
+
+    def _responder(self, con_cuerpo):
+        ruta = archivo_grabado(self.directorio, self.path)
+        if ruta is None:
+            self.send_error(404, "Respuesta no grabada")
+            return
+        with open(ruta, "rb") as f:
+            contenido = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", TIPOS_CONTENIDO.get(os.path.splitext(ruta)[1], "application/octet-stream"))
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        if con_cuerpo:
+            self.wfile.write(contenido)
+
+    def do_GET(self):
+        self._responder(True)
+
+    def do_HEAD(self):
+        self._responder(False)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class ServidorUdemyLocal:
+    """Servidor en un hilo en 127.0.0.1; url_base sustituye a UDEMY_CONFIG['base_url']"""
+
+    def __init__(self, directorio=DIRECTORIO_POR_DEFECTO, puerto=0):
+        manejador = type("Manejador", (_Manejador,), {"directorio": directorio})
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+        self._servidor.daemon_threads = True
+        self._hilo = None
+        self.url_base = f"http://127.0.0.1:{self._servidor.server_address[1]}"
+
+    def ejecutar(self):
+        """Servir en el hilo actual hasta Ctrl+C"""
+        try:
+            self._servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._servidor.server_close()
+
+    def iniciar(self):
+        """Servir en un hilo en segundo plano"""
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        if self._hilo is not None:
+            self._hilo.join()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *excepcion):
+        self.detener()
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "grabar":
+        for url in sys.argv[2:]:
+            grabar(url)
+    elif len(sys.argv) > 1 and sys.argv[1] == "servir":
+        puerto = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+        servidor = ServidorUdemyLocal(puerto=puerto)
+        print(f"🧪 Sirviendo {DIRECTORIO_POR_DEFECTO}/ en {servidor.url_base} (Ctrl+C para detener)")
+        servidor.ejecutar()
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
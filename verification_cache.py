@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Caché persistente (SQLite) de cursos ya verificados
+La clave es el ID del curso más el código de cupón, con vigencia configurable
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from config_bot_mejorado import get_config
+
+
+class CacheVerificaciones:
+    """Resultados de verificación guardados en disco con TTL y desalojo de las entradas más antiguas"""
+
+    def __init__(self, ruta, ttl_horas=12, ttl_negativo_horas=6, max_entradas=5000):
+        self.ruta = ruta
+        self.ttl = ttl_horas * 3600
+        self.ttl_negativo = ttl_negativo_horas * 3600
+        self.max_entradas = max_entradas
+        self.aciertos = 0
+        self.fallos = 0
+        # La conexión se comparte entre los workers del pool, protegida por el lock
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS verificaciones ("
+            " course_id TEXT NOT NULL,"
+            " coupon_code TEXT NOT NULL,"
+            " es_gratis INTEGER NOT NULL,"
+            " detalles TEXT,"
+            " verificado_en REAL NOT NULL,"
+            " PRIMARY KEY (course_id, coupon_code))"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_verificado_en ON verificaciones (verificado_en)"
+        )
+        self._conexion.commit()
+        self.desalojar()
+
+    def _vigencia(self, es_gratis):
+        return self.ttl if es_gratis else self.ttl_negativo
+
+    def consultar(self, course_id, coupon_code):
+        """Devolver (es_gratis, detalles) si hay una verificación vigente, o None"""
+        if not course_id:
+            return None
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT es_gratis, detalles, verificado_en FROM verificaciones"
+                " WHERE course_id = ? AND coupon_code = ?",
+                (course_id, coupon_code or ""),
+            ).fetchone()
+        if fila is None:
+            self.fallos += 1
+            return None
+        es_gratis, detalles, verificado_en = bool(fila[0]), fila[1], fila[2]
+        if time.time() - verificado_en > self._vigencia(es_gratis):
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return es_gratis, json.loads(detalles) if detalles else {}
+
+    def guardar(self, course_id, coupon_code, es_gratis, detalles=None):
+        """Guardar el resultado de una verificación"""
+        if not course_id:
+            return
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO verificaciones"
+                " (course_id, coupon_code, es_gratis, detalles, verificado_en) VALUES (?, ?, ?, ?, ?)",
+                (course_id, coupon_code or "", int(bool(es_gratis)),
+                 json.dumps(detalles) if detalles else None, time.time()),
+            )
+            self._conexion.commit()
+
+    def desalojar(self):
+        """Eliminar entradas vencidas y, si sobran, las verificadas hace más tiempo"""
+        ahora = time.time()
+        with self._lock:
+            self._conexion.execute(
+                "DELETE FROM verificaciones WHERE"
+                " (es_gratis = 1 AND verificado_en < ?) OR (es_gratis = 0 AND verificado_en < ?)",
+                (ahora - self.ttl, ahora - self.ttl_negativo),
+            )
+            if self.max_entradas:
+                self._conexion.execute(
+                    "DELETE FROM verificaciones WHERE rowid IN ("
+                    " SELECT rowid FROM verificaciones ORDER BY verificado_en DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entradas,),
+                )
+            self._conexion.commit()
+
+    def cerrar(self):
+        """Desalojar y cerrar la base de datos"""
+        self.desalojar()
+        with self._lock:
+            self._conexion.close()
+
+
+_cache = None
+_lock_cache = threading.Lock()
+
+
+def obtener_cache():
+    """Caché compartida según CACHE_CONFIG, o None si está deshabilitada"""
+    global _cache
+    config = get_config('cache')
+    if not config.get('enable_cache', False):
+        return None
+    with _lock_cache:
+        if _cache is None:
+            try:
+                _cache = CacheVerificaciones(
+                    config.get('cache_file', 'verification_cache.db'),
+                    ttl_horas=config.get('ttl_hours', 12),
+                    ttl_negativo_horas=config.get('negative_ttl_hours', 6),
+                    max_entradas=config.get('max_entries', 5000),
+                )
+            except sqlite3.Error as e:
+                print(f"⚠️ No se pudo abrir la caché de verificaciones: {e}")
+                return None
+        return _cache
+
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Verificación de cursos en cascada, de la comprobación más barata a la más cara
+1. cache:      verificación reciente guardada en disco
+2. url:        la URL no es la ficha de un curso de Udemy
+3. http:       API de precios de Udemy por HTTP (udemy_http)
+4. precio_dom: elemento de precio de la ficha abierta
+5. pagina:     indicadores, precios y botones de toda la ficha
+Los dos últimos niveles leen la misma sonda de page_probe: una sola llamada
+al navegador recoge todas las señales de la ficha.
+La cascada se detiene en el primer nivel con un resultado definitivo y
+registra qué nivel decidió cada curso.
+"""
+import re
+import threading
+from collections import Counter
+
+from course_identity import es_url_udemy, identificador_en_url
+from page_probe import abrir_y_sondear
+from price_scanner import PATRONES_PRECIO, escaner_precios
+from run_metrics import tramo
+from udemy_http import verificar_por_http
+from verification_cache import obtener_cache
+
+NIVELES = ("cache", "url", "http", "precio_dom", "pagina")
+
+PALABRAS_GRATIS = ("gratis", "free", "gratuito")
+_PATRON_PRECIO = re.compile('|'.join(PATRONES_PRECIO))
+_NUMERO = re.compile(r'\d+(?:[.,]\d+)?')
+
+
+def interpretar_texto_precio(texto):
+    """True si el texto del precio indica gratis, False si hay un importe mayor a 0, None si no se sabe"""
+    if not texto:
+        return None
+    texto = texto.lower()
+    if any(palabra in texto for palabra in PALABRAS_GRATIS):
+        return True
+    precios = _PATRON_PRECIO.findall(texto)
+    if not precios:
+        return None
+    valores = [float(_NUMERO.search(precio).group().replace(',', '.')) for precio in precios]
+    # El primer importe es el precio actual; los siguientes suelen ser el precio original tachado
+    return valores[0] == 0
+
+
+def decidir_por_precio(sonda):
+    """Veredicto del elemento de precio de la sonda; None si no es concluyente"""
+    es_gratis = interpretar_texto_precio(sonda.get('precio_elemento'))
+    if es_gratis is not None:
+        print(f"🏷️ Elemento de precio: {'gratis' if es_gratis else 'con precio'}")
+    return es_gratis
+
+
+def decidir_por_sonda(sonda, udemy_url):
+    """Decidir con todas las señales de la sonda, en orden de evidencia"""
+    if sonda.get('indicadores'):
+        print(f"✅ Indicador de gratis encontrado: {sonda['indicadores'][0]}")
+        return True
+    if sonda.get('precio'):
+        print(f"❌ Precio detectado: {sonda['precio']} (valor: {sonda['valor']})")
+
+    if sonda.get('selector_gratis') or sonda.get('selector_precio_cero'):
+        print("✅ Botón de inscripción gratuita o precio $0 encontrado")
+        return True
+    if sonda.get('precio'):
+        print("❌ El curso tiene precio, no es gratis")
+        return False
+
+    if sonda.get('selector_compra'):
+        print("❌ Botón de compra encontrado")
+        return False
+
+    # Si no encontramos indicadores claros, se decide por el cupón
+    if 'couponcode=' in udemy_url.lower():
+        print("✅ Cupón detectado en URL, asumiendo que puede hacer el curso gratis")
+        return True
+    print("❌ No se encontraron indicadores claros de que sea gratis")
+    return False
+
+
+def verificar_en_navegador(driver, udemy_url, escaner=escaner_precios):
+    """Abrir la ficha y decidir con todas sus señales; None si la verificación no pudo completarse"""
+    try:
+        print(f"🔍 Verificando si el curso es gratis: {udemy_url}")
+        sonda = abrir_y_sondear(driver, udemy_url, escaner)
+        if sonda is None:
+            return None
+        return decidir_por_sonda(sonda, udemy_url)
+    except Exception as e:
+        print(f"⚠️ Error verificando si el curso es gratis: {e}")
+        return None
+
+
+class CascadaVerificacion:
+    """Niveles de verificación ordenados por coste y registro del nivel que decidió cada curso"""
+
+    def __init__(self):
+        self.decisiones = {}
+        self.conteo = Counter()
+        self._lock = threading.Lock()
+
+    def registrar(self, course_id, nivel):
+        """Anotar qué nivel decidió un curso (None si ninguno pudo)"""
+        with self._lock:
+            self.decisiones[course_id] = nivel
+            self.conteo[nivel] += 1
+
+    def _niveles(self, contexto):
+        yield "cache", self._nivel_cache
+        yield "url", self._nivel_url
+        yield "http", self._nivel_http
+        if contexto['driver'] is not None:
+            yield "precio_dom", self._nivel_precio_dom
+            yield "pagina", self._nivel_pagina
+
+    def _nivel_cache(self, contexto):
+        cache = obtener_cache()
+        if cache is None:
+            return None
+        resultado = cache.consultar(contexto['course_id'], contexto['coupon_code'])
+        if resultado is None:
+            return None
+        print(f"💾 Verificación en caché: {contexto['course_id']} ({'gratis' if resultado[0] else 'de pago'})")
+        return resultado[0]
+
+    def _nivel_url(self, contexto):
+        url = contexto['url']
+        if not es_url_udemy(url) or not identificador_en_url(url):
+            print(f"❌ No es la ficha de un curso de Udemy: {url}")
+            return False
+        return None
+
+    def _nivel_http(self, contexto):
+        return verificar_por_http(contexto['url'], contexto['coupon_code'])
+
+    def _nivel_precio_dom(self, contexto):
+        print(f"🔍 Verificando si el curso es gratis: {contexto['url']}")
+        contexto['sonda'] = abrir_y_sondear(contexto['driver'], contexto['url'], contexto['escaner'])
+        if contexto['sonda'] is None:
+            return None
+        return decidir_por_precio(contexto['sonda'])
+
+    def _nivel_pagina(self, contexto):
+        if not contexto.get('sonda'):
+            return None
+        return decidir_por_sonda(contexto['sonda'], contexto['url'])
+
+    def verificar(self, udemy_url, course_id, coupon_code, driver=None, escaner=escaner_precios):
+        """Recorrer los niveles hasta el primero decisivo; devuelve (es_gratis, nivel)
+
+        Si ningún nivel decide, devuelve (None, None) y no se guarda nada en caché.
+        """
+        contexto = {
+            'url': udemy_url,
+            'course_id': course_id,
+            'coupon_code': coupon_code,
+            'driver': driver,
+            'escaner': escaner,
+        }
+        with tramo("verificacion", {'course_id': course_id, 'url': udemy_url}):
+            for nivel, comprobar in self._niveles(contexto):
+                try:
+                    with tramo(f"verificacion.{nivel}"):
+                        es_gratis = comprobar(contexto)
+                except Exception as e:
+                    print(f"⚠️ Error en el nivel '{nivel}' de la verificación: {e}")
+                    continue
+                if es_gratis is None:
+                    continue
+                self.registrar(course_id, nivel)
+                cache = obtener_cache()
+                if nivel != "cache" and cache is not None:
+                    cache.guardar(course_id, coupon_code, es_gratis)
+                return es_gratis, nivel
+        self.registrar(course_id, None)
+        return None, None
+
+    def imprimir_resumen(self):
+        """Mostrar cuántos cursos decidió cada nivel"""
+        if not self.decisiones:
+            return
+        partes = [f"{nivel}: {self.conteo[nivel]}" for nivel in NIVELES if self.conteo[nivel]]
+        if self.conteo[None]:
+            partes.append(f"sin decidir: {self.conteo[None]}")
+        print(f"🪜 Verificaciones por nivel de la cascada: {', '.join(partes)}")
+
+
+_cascada = CascadaVerificacion()
+
+
+def obtener_cascada():
+    """Cascada compartida (y su registro de decisiones) del proceso"""
+    return _cascada
+
+
+def verificar_en_cascada(driver, udemy_url, course_id, coupon_code, escaner=escaner_precios):
+    """Verificar un curso con la cascada compartida; False si ningún nivel pudo decidir"""
+    es_gratis, _ = _cascada.verificar(udemy_url, course_id, coupon_code, driver, escaner)
+    return bool(es_gratis)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Contador y cronómetro de los comandos WebDriver
+Cada comando que el bot envía al chromedriver (find_elements, get_attribute,
+.text, .location, execute_script...) es un viaje HTTP. Con
+DEV_CONFIG['profile_webdriver'] los navegadores de session_manager se
+instrumentan y, durante una ejecución perfilada (dev_profiling.perfilado),
+cada comando se cuenta y se cronometra por tipo y por punto de llamada.
+El informe señala los bucles que conviene agrupar en una sola llamada.
+Con DEV_CONFIG['trace_export'] cada comando se añade además a la traza de
+la ejecución (trace_export).
+"""
+import contextlib
+import os
+import sys
+import threading
+import time
+
+import selenium
+
+import run_metrics
+from config_bot_mejorado import get_config
+from trace_export import exportacion_traza_activada, traza_en_curso
+
+_DIRECTORIO_SELENIUM = os.path.dirname(selenium.__file__)
+
+# Envolturas (decoradores y context managers) que no cuentan como punto de llamada
+_ARCHIVOS_ENVOLTURA = {__file__, contextlib.__file__, run_metrics.__file__}
+
+# Marcos de llamada que se muestran por cada punto de llamada (el más cercano primero)
+PROFUNDIDAD_SITIO = 2
+
+
+def perfilado_webdriver_activado():
+    """Si los navegadores deben instrumentarse (para el informe de comandos o para la traza)"""
+    return get_config('dev').get('profile_webdriver', False) or exportacion_traza_activada()
+
+
+def _es_interno(nombre_archivo):
+    return nombre_archivo.startswith(_DIRECTORIO_SELENIUM) or nombre_archivo in _ARCHIVOS_ENVOLTURA
+
+
+def sitio_de_llamada(profundidad=PROFUNDIDAD_SITIO):
+    """Los marcos más cercanos fuera de selenium: 'archivo.py:línea (función) ← ...'"""
+    marco = sys._getframe(1)
+    partes = []
+    while marco is not None and len(partes) < profundidad:
+        codigo = marco.f_code
+        if not _es_interno(codigo.co_filename):
+            partes.append(f"{os.path.basename(codigo.co_filename)}:{marco.f_lineno} ({codigo.co_name})")
+        marco = marco.f_back
+    return " ← ".join(partes) or "?"
+
+
+class RegistroComandos:
+    """Veces y tiempo de los comandos WebDriver por tipo y por punto de llamada"""
+
+    def __init__(self):
+        self.por_comando = {}
+        self.por_sitio = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, comando, segundos, sitio):
+        with self._lock:
+            datos = self.por_comando.setdefault(comando, {'veces': 0, 'total': 0.0})
+            datos['veces'] += 1
+            datos['total'] += segundos
+            datos = self.por_sitio.setdefault(sitio, {'veces': 0, 'total': 0.0, 'comandos': {}})
+            datos['veces'] += 1
+            datos['total'] += segundos
+            datos['comandos'][comando] = datos['comandos'].get(comando, 0) + 1
+
+    def totales(self):
+        with self._lock:
+            return (sum(datos['veces'] for datos in self.por_comando.values()),
+                    sum(datos['total'] for datos in self.por_comando.values()))
+
+    def como_dict(self, top_n=None):
+        """Comandos y puntos de llamada ordenados por tiempo total"""
+        with self._lock:
+            comandos = sorted(self.por_comando.items(), key=lambda item: -item[1]['total'])
+            sitios = sorted(self.por_sitio.items(), key=lambda item: -item[1]['total'])
+            return {
+                'comandos': [{'comando': comando, 'veces': datos['veces'], 'total': round(datos['total'], 4)}
+                             for comando, datos in comandos],
+                'sitios': [{'sitio': sitio, 'veces': datos['veces'], 'total': round(datos['total'], 4),
+                            'comandos': dict(datos['comandos'])}
+                           for sitio, datos in sitios[:top_n]],
+            }
+
+    def informe(self, top_n=15):
+        veces, total = self.totales()
+        datos = self.como_dict(top_n)
+        lineas = [f"🔌 Comandos WebDriver: {veces} en {total:.1f}s"]
+        for comando in datos['comandos'][:top_n]:
+            lineas.append(f"   {comando['comando']}: {comando['veces']} veces, {comando['total']:.2f}s")
+        lineas.append(f"📍 Puntos de llamada más costosos (top {top_n}):")
+        for sitio in datos['sitios']:
+            comandos = ", ".join(f"{comando} ×{veces}" for comando, veces in
+                                 sorted(sitio['comandos'].items(), key=lambda item: -item[1]))
+            lineas.append(f"   {sitio['total']:.2f}s en {sitio['veces']} comandos: {sitio['sitio']}")
+            lineas.append(f"      {comandos}")
+        return "\n".join(lineas)
+
+
+_registro = None
+
+
+def iniciar_registro():
+    """Empezar a contar los comandos de los navegadores instrumentados"""
+    global _registro
+    _registro = RegistroComandos()
+    return _registro
+
+
+def detener_registro():
+    """Dejar de contar; devuelve el registro de la ejecución"""
+    global _registro
+    registro, _registro = _registro, None
+    return registro
+
+
+def instrumentar_driver(driver):
+    """Envolver driver.execute para contar sus comandos (también los de sus WebElement)
+
+    Fuera de una ejecución con registro o traza activos la envoltura solo llama al original.
+    """
+    if getattr(driver, '_comandos_instrumentados', False):
+        return driver
+    ejecutar = driver.execute
+
+    def execute(driver_command, params=None):
+        registro = _registro
+        traza = traza_en_curso()
+        if registro is None and traza is None:
+            return ejecutar(driver_command, params)
+        inicio = time.perf_counter()
+        try:
+            return ejecutar(driver_command, params)
+        finally:
+            fin = time.perf_counter()
+            if registro is not None:
+                registro.registrar(driver_command, fin - inicio, sitio_de_llamada())
+            if traza is not None:
+                traza.completo(f"webdriver.{driver_command}", inicio, fin)
+
+    driver.execute = execute
+    driver._comandos_instrumentados = True
+    return driver